@@ -1,10 +1,12 @@
 from flask import Flask, jsonify
-from extensions import db, login_manager, jwt, migrate, cors
+from extensions import db, login_manager, jwt, migrate, cors, Request
 from config import Config
 
 def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
+    # Permite que rutas como las importaciones fijen su propio límite de tamaño
+    app.request_class = Request
     
     # Initialize extensions with app
     db.init_app(app)
@@ -20,6 +22,30 @@ def create_app(config_class=Config):
     # Import models for migrations
     from models import Usuario, Vacante, Candidato, Documento, Entrevista, CandidatosPositions, Cliente
     
+    # Listeners de sesión que mantienen los contadores de cada vacante
+    from services.contadores_service import register_contadores_events
+    register_contadores_events()
+    
+    # Tablas FTS5 de búsqueda cuando la base es SQLite (pruebas)
+    from services.search_service import register_search_ddl
+    register_search_ddl()
+    
+    # Versión de datos por tabla (invalidación de cachés en memoria)
+    from services.version_service import register_version_events
+    register_version_events()
+    
+    # Invalidación de los snapshots del dashboard por alcance
+    from services.dashboard_snapshot_service import register_dashboard_events
+    register_dashboard_events()
+    
+    # Versión de cuenta de usuarios (revocación de JWT)
+    from services.revocacion_service import register_revocacion_events
+    register_revocacion_events()
+    
+    # Actualización incremental del índice de búsqueda de talento
+    from services.talento_service import register_talento_events
+    register_talento_events()
+    
     # Register blueprints
     from routes.auth_routes import auth_bp
     from routes.usuario_routes import usuario_bp
@@ -30,6 +56,9 @@ def create_app(config_class=Config):
     from routes.candidatos_posiciones_routes import candidatos_posiciones_bp
     from routes.reports_routes import reports_bp
     from routes.cliente_routes import cliente_bp  # ⭐ NUEVO
+    from routes.trabajo_routes import trabajo_bp
+    from routes.importacion_routes import importacion_bp
+    from routes.exportacion_routes import exportacion_bp
     
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(usuario_bp, url_prefix='/api/usuarios')
@@ -40,6 +69,13 @@ def create_app(config_class=Config):
     app.register_blueprint(candidatos_posiciones_bp, url_prefix='/api/candidatos-posiciones')
     app.register_blueprint(reports_bp, url_prefix='/api/reports')
     app.register_blueprint(cliente_bp, url_prefix='/api/clientes')  # ⭐ NUEVO
+    app.register_blueprint(trabajo_bp, url_prefix='/api/trabajos')
+    app.register_blueprint(importacion_bp, url_prefix='/api/importaciones')
+    app.register_blueprint(exportacion_bp, url_prefix='/api/exports')
+    
+    # Comandos CLI (jobs de mantenimiento)
+    from commands import register_commands
+    register_commands(app)
     
     # Health check endpoint
     @app.route('/api/health', methods=['GET'])
@@ -50,6 +86,15 @@ def create_app(config_class=Config):
             'version': '1.0.0'
         }), 200
     
+    # Métricas en memoria de este worker (caché de usuarios, tiempos, etc.)
+    from services.auth_service import role_required
+    from utils.metrics import metricas
+    
+    @app.route('/api/metrics', methods=['GET'])
+    @role_required('administrador')
+    def get_metrics(current_user):
+        return jsonify(metricas.reporte()), 200
+    
     # Error handlers
     @app.errorhandler(404)
     def not_found(error):
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Benchmark de /api/reports/dashboard (services/dashboard_service.py).
+
+Por defecto crea una base SQLite temporal con 100k candidatos (y vacantes,
+asignaciones y entrevistas proporcionales) y mide la latencia y el número de
+consultas del cálculo para cada alcance de rol.
+
+Uso:
+    python benchmark_dashboard.py
+    python benchmark_dashboard.py --candidatos 200000 --repeticiones 10
+    python benchmark_dashboard.py --database-url mysql+pymysql://...   # datos existentes, no inserta nada
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from config import Config
+from app import create_app
+from extensions import db
+from models import Usuario, Vacante, Candidato, CandidatosPositions, Entrevista
+from services.dashboard_service import calcular_dashboard
+from utils.query_counter import count_queries
+
+LOTE = 5000
+
+def poblar(candidatos):
+    """Inserta datos sintéticos con executemany en lotes (sin pasar por el ORM)"""
+    random.seed(42)
+    ahora = datetime.utcnow()
+    n_vacantes = max(1, candidatos // 50)
+    n_reclutadores = 20
+    n_ejecutivos = 10
+
+    usuarios = [
+        {'id': i + 1, 'nombre': f'Usuario {i + 1}', 'email': f'bench{i + 1}@example.com', 'password_hash': 'x',
+         'rol': 'ejecutivo' if i < n_ejecutivos else 'reclutador', 'activo': True, 'fecha_creacion': ahora}
+        for i in range(n_ejecutivos + n_reclutadores)
+    ]
+    db.session.execute(Usuario.__table__.insert(), usuarios)
+    reclutadores = [u['id'] for u in usuarios if u['rol'] == 'reclutador']
+    ejecutivos = [u['id'] for u in usuarios if u['rol'] == 'ejecutivo']
+
+    vacantes = []
+    for i in range(n_vacantes):
+        solicitud = ahora - timedelta(days=random.randint(0, 365))
+        estado = random.choice(['abierta', 'abierta', 'pausada', 'cerrada', 'cancelada'])
+        vacantes.append({
+            'id': i + 1, 'nombre': f'Vacante {i + 1}', 'ejecutivo_id': random.choice(ejecutivos),
+            'reclutador_id': random.choice(reclutadores), 'fecha_solicitud': solicitud,
+            'fecha_cierre': solicitud + timedelta(days=random.randint(1, 90)) if estado == 'cerrada' else None,
+            'estado': estado, 'prioridad': random.choice(['baja', 'media', 'alta', 'critica']),
+            'modalidad': random.choice(['presencial', 'remoto', 'hibrido', None]),
+            'status_final': 'cubierta' if estado == 'cerrada' else 'abierta',
+            'fecha_creacion': solicitud, 'fecha_actualizacion': solicitud,
+        })
+    db.session.execute(Vacante.__table__.insert(), vacantes)
+
+    def en_lotes(tabla, filas):
+        for inicio in range(0, len(filas), LOTE):
+            db.session.execute(tabla.insert(), filas[inicio:inicio + LOTE])
+
+    en_lotes(Candidato.__table__, [
+        {'id': i + 1, 'nombre': f'Candidato {i + 1}', 'email': f'cand{i + 1}@example.com',
+         'estado': random.choice(['activo', 'activo', 'activo', 'inactivo', 'blacklist']),
+         'reclutador_id': random.choice(reclutadores),
+         'fecha_creacion': ahora - timedelta(days=random.randint(0, 365))}
+        for i in range(candidatos)
+    ])
+
+    posiciones = []
+    entrevistas = []
+    for candidato_id in range(1, candidatos + 1):
+        for vacante_id in random.sample(range(1, n_vacantes + 1), k=min(n_vacantes, random.randint(1, 2))):
+            fecha = ahora - timedelta(days=random.randint(0, 365))
+            posiciones.append({
+                'candidato_id': candidato_id, 'vacante_id': vacante_id, 'fecha_asignacion': fecha,
+                'status': random.choice(['postulado', 'en_proceso', 'rechazado', 'aceptado', 'contratado']),
+                'aceptado': random.random() < 0.3,
+                'contratado_status': random.choice(['pendiente', 'rechazado', 'contratado', 'no_contratable']),
+            })
+            if random.random() < 0.5:
+                entrevistas.append({
+                    'candidato_id': candidato_id, 'vacante_id': vacante_id, 'fecha': fecha,
+                    'tipo': random.choice(['telefonica', 'video', 'presencial', 'tecnica']),
+                    'resultado': random.choice(['pendiente', 'aprobada', 'rechazada', 'reprogramar']),
+                    'fecha_creacion': fecha,
+                })
+    en_lotes(CandidatosPositions.__table__, posiciones)
+    en_lotes(Entrevista.__table__, entrevistas)
+    db.session.commit()
+    return len(posiciones), len(entrevistas)
+
+def medir(alcance, repeticiones):
+    tiempos = []
+    consultas = 0
+    for _ in range(repeticiones):
+        db.session.expire_all()
+        with count_queries() as counter:
+            inicio = time.perf_counter()
+            calcular_dashboard(alcance)
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+        consultas = counter.count
+    return tiempos, consultas
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark del dashboard de reportes')
+    parser.add_argument('--candidatos', type=int, default=100000)
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--database-url', help='Medir sobre una base existente (no inserta datos)')
+    args = parser.parse_args()
+
+    print("⏱️ Benchmark de /api/reports/dashboard")
+    print("=" * 60)
+
+    archivo = None
+    if args.database_url:
+        url = args.database_url
+    else:
+        archivo = os.path.join(tempfile.mkdtemp(), 'benchmark_dashboard.db')
+        url = f'sqlite:///{archivo}'
+
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = url
+        SQLALCHEMY_ENGINE_OPTIONS = {} if url.startswith('sqlite') else Config.SQLALCHEMY_ENGINE_OPTIONS
+
+    app = create_app(BenchmarkConfig)
+
+    with app.app_context():
+        if archivo:
+            db.create_all()
+            inicio = time.perf_counter()
+            n_posiciones, n_entrevistas = poblar(args.candidatos)
+            print(f"📦 {args.candidatos} candidatos, {n_posiciones} asignaciones, "
+                  f"{n_entrevistas} entrevistas en {time.perf_counter() - inicio:.1f}s")
+
+        ejecutivo = Usuario.query.filter_by(rol='ejecutivo').first()
+        reclutador = Usuario.query.filter_by(rol='reclutador').first()
+        alcances = [('global', None)]
+        if ejecutivo:
+            alcances.append(('ejecutivo', ejecutivo.id))
+        if reclutador:
+            alcances.append(('reclutador', reclutador.id))
+
+        for alcance in alcances:
+            calcular_dashboard(alcance)  # calentar caché de páginas
+            tiempos, consultas = medir(alcance, args.repeticiones)
+            print(f"✅ {alcance[0]:<11} mediana {statistics.median(tiempos):8.1f} ms | "
+                  f"máx {max(tiempos):8.1f} ms | {consultas} consultas")
+
+    if archivo:
+        os.remove(archivo)
+
+    print("=" * 60)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Benchmark de /api/candidatos/talent-search (services/talento_service.py).
+
+Por defecto crea una base SQLite temporal con 200k candidatos con CV
+sintéticos (texto ya extraído en documento_texto), construye el índice de
+talento y mide la latencia de consultas con términos comunes y raros, para
+todos los candidatos y para el alcance de un reclutador.
+
+Uso:
+    python benchmark_talent_search.py
+    python benchmark_talent_search.py --candidatos 50000 --repeticiones 20
+    python benchmark_talent_search.py --database-url mysql+pymysql://...   # índice existente, no inserta nada
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from config import Config
+from app import create_app
+from extensions import db
+from models import Usuario, Candidato, Documento, DocumentoTexto
+from services.talento_service import buscar_talento, reconstruir_indice
+from utils.query_counter import count_queries
+
+LOTE = 5000
+
+HABILIDADES = (
+    'python java javascript sql excel sap ventas contabilidad auditoría nómina logística almacén '
+    'inventarios compras ingeniero ingeniera industrial sistemas software desarrollador analista '
+    'gerente supervisor coordinador recepcionista cajero vendedora atención clientes inglés avanzado '
+    'intermedio básico liderazgo negociación lean manufacturing six sigma calidad mantenimiento '
+    'electricista soldador chofer montacargas recursos humanos reclutamiento marketing digital redes '
+    'sociales diseño gráfico photoshop autocad aws docker kubernetes microservicios react angular '
+    'django flask contador público finanzas tesorería crédito cobranza hotelería turismo cocina chef '
+    'mesero bartender enfermería farmacia laboratorio química administración proyectos scrum'
+).split()
+
+CONSULTAS = (
+    'python',
+    'ventas excel',
+    'ingeniero industrial lean six sigma',
+    'java microservicios aws docker',
+    'contador público sap inglés avanzado',
+    'experiencia6123',
+)
+
+def poblar(candidatos):
+    """Candidatos con un CV sintético cada uno (executemany en lotes, sin pasar por el ORM)"""
+    random.seed(42)
+    ahora = datetime.utcnow()
+    # Vocabulario con distribución de Zipf: pocas palabras muy comunes y una cola larga
+    vocabulario = HABILIDADES + [f'experiencia{i}' for i in range(20000)]
+    pesos = [1 / (rango + 1) for rango in range(len(vocabulario))]
+
+    usuarios = [
+        {'id': i + 1, 'nombre': f'Reclutador {i + 1}', 'email': f'bench{i + 1}@example.com',
+         'password_hash': 'x', 'rol': 'reclutador', 'activo': True, 'fecha_creacion': ahora}
+        for i in range(20)
+    ]
+    db.session.execute(Usuario.__table__.insert(), usuarios)
+
+    for inicio in range(0, candidatos, LOTE):
+        ids = range(inicio + 1, min(inicio + LOTE, candidatos) + 1)
+        db.session.execute(Candidato.__table__.insert(), [
+            {'id': i, 'nombre': f'Candidato {i}', 'email': f'cand{i}@example.com', 'estado': 'activo',
+             'reclutador_id': random.randint(1, len(usuarios)), 'fecha_creacion': ahora,
+             'ubicacion': random.choice(['Cancún', 'Mérida', 'Monterrey', 'Guadalajara', 'CDMX']),
+             'nivel_ingles': random.choice(['basico', 'intermedio', 'avanzado', None])}
+            for i in ids
+        ])
+        db.session.execute(Documento.__table__.insert(), [
+            {'id': i, 'nombre_original': f'cv{i}.pdf', 'url_s3': f'https://bench/cv{i}.pdf',
+             'key_s3': f'cv{i}.pdf', 'tipo': 'cv', 'candidato_id': i, 'sha256': f'{i:064x}', 'fecha_subida': ahora}
+            for i in ids
+        ])
+        db.session.execute(DocumentoTexto.__table__.insert(), [
+            {'documento_id': i, 'sha256': f'{i:064x}', 'estado': 'completado', 'fecha_extraccion': ahora,
+             'texto': ' '.join(random.choices(vocabulario, weights=pesos, k=random.randint(80, 300)))}
+            for i in ids
+        ])
+        db.session.commit()
+
+def medir(consulta, reclutador_id, repeticiones):
+    tiempos = []
+    resultados = []
+    consultas = 0
+    for _ in range(repeticiones):
+        with count_queries() as counter:
+            inicio = time.perf_counter()
+            resultados, _ = buscar_talento(consulta, reclutador_id=reclutador_id)
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+        consultas = counter.count
+    return tiempos, len(resultados), consultas
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de la búsqueda de talento')
+    parser.add_argument('--candidatos', type=int, default=200000)
+    parser.add_argument('--repeticiones', type=int, default=10)
+    parser.add_argument('--database-url', help='Medir sobre una base existente (no inserta datos)')
+    args = parser.parse_args()
+
+    print("⏱️ Benchmark de /api/candidatos/talent-search")
+    print("=" * 60)
+
+    archivo = None
+    if args.database_url:
+        url = args.database_url
+    else:
+        archivo = os.path.join(tempfile.mkdtemp(), 'benchmark_talento.db')
+        url = f'sqlite:///{archivo}'
+
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = url
+        SQLALCHEMY_ENGINE_OPTIONS = {} if url.startswith('sqlite') else Config.SQLALCHEMY_ENGINE_OPTIONS
+
+    app = create_app(BenchmarkConfig)
+
+    with app.app_context():
+        if archivo:
+            db.create_all()
+            inicio = time.perf_counter()
+            poblar(args.candidatos)
+            print(f"📦 {args.candidatos} candidatos con CV en {time.perf_counter() - inicio:.1f}s")
+
+            inicio = time.perf_counter()
+            reconstruir_indice(lote=2000)
+            segundos = time.perf_counter() - inicio
+            print(f"📚 Índice construido en {segundos:.1f}s ({args.candidatos / segundos:.0f} candidatos/s)")
+
+        reclutador = Usuario.query.filter_by(rol='reclutador').first()
+        for alcance, reclutador_id in (('todos', None), ('reclutador', reclutador.id if reclutador else None)):
+            if alcance == 'reclutador' and reclutador_id is None:
+                continue
+            for consulta in CONSULTAS:
+                buscar_talento(consulta, reclutador_id=reclutador_id)  # calentar caché de páginas
+                tiempos, encontrados, consultas = medir(consulta, reclutador_id, args.repeticiones)
+                print(f"✅ {alcance:<10} {consulta[:36]:<36} mediana {statistics.median(tiempos):7.1f} ms | "
+                      f"máx {max(tiempos):7.1f} ms | {encontrados:5} resultados | {consultas} consultas")
+
+    if archivo:
+        os.remove(archivo)
+
+    print("=" * 60)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""
+Comandos CLI del sistema (flask <comando>)
+"""
+import time
+import click
+from flask.cli import with_appcontext
+
+@click.command('actualizar-dias-transcurridos')
+@with_appcontext
+def actualizar_dias_transcurridos_command():
+    """Persistir dias_transcurridos de todas las vacantes (job nocturno)"""
+    from services.mantenimiento_service import actualizar_dias_transcurridos
+    
+    inicio = time.perf_counter()
+    actualizadas = actualizar_dias_transcurridos()
+    click.echo(f'✅ {actualizadas} vacantes actualizadas en {time.perf_counter() - inicio:.2f}s')
+
+@click.command('reconciliar-contadores')
+@click.option('--vacante-id', 'vacante_ids', type=int, multiple=True, help='Solo estas vacantes (repetible)')
+@with_appcontext
+def reconciliar_contadores_command(vacante_ids):
+    """Reconstruir vacante_contadores desde candidatos_posiciones"""
+    from extensions import db
+    from services.contadores_service import reconciliar_contadores
+    
+    inicio = time.perf_counter()
+    filas = reconciliar_contadores(list(vacante_ids) if vacante_ids else None)
+    db.session.commit()
+    click.echo(f'✅ Contadores reconstruidos para {filas} vacantes en {time.perf_counter() - inicio:.2f}s')
+
+@click.command('reconstruir-indices-busqueda')
+@with_appcontext
+def reconstruir_indices_busqueda_command():
+    """Crear/reconstruir los índices de búsqueda de texto completo"""
+    from services.search_service import reconstruir_indices
+    
+    inicio = time.perf_counter()
+    tablas = reconstruir_indices()
+    click.echo(f'✅ Índices de búsqueda reconstruidos ({", ".join(tablas) or "ninguno"}) en {time.perf_counter() - inicio:.2f}s')
+
+@click.command('reconstruir-dashboard')
+@click.option('--solo-obsoletos', is_flag=True, help='Solo los alcances con cambios pendientes')
+@with_appcontext
+def reconstruir_dashboard_command(solo_obsoletos):
+    """Recalcular los snapshots del dashboard (job periódico)"""
+    from services.dashboard_snapshot_service import reconstruir_snapshots
+    
+    inicio = time.perf_counter()
+    alcances = reconstruir_snapshots(solo_obsoletos=solo_obsoletos)
+    click.echo(f'✅ {alcances} snapshots del dashboard recalculados en {time.perf_counter() - inicio:.2f}s')
+
+@click.command('migrar-almacenamiento')
+@click.option('--origen', type=click.Choice(['s3', 'local']), required=True)
+@click.option('--destino', type=click.Choice(['s3', 'local']), required=True)
+@click.option('--eliminar-origen', is_flag=True, help='Borrar cada archivo del origen una vez migrado')
+@with_appcontext
+def migrar_almacenamiento_command(origen, destino, eliminar_origen):
+    """Copiar los archivos de documentos entre almacenamientos (después cambiar STORAGE_BACKEND)"""
+    from services.almacenamiento_service import migrar_almacenamiento
+    
+    inicio = time.perf_counter()
+    copiados, errores = migrar_almacenamiento(
+        origen, destino, eliminar_origen=eliminar_origen,
+        progreso=lambda hechos, total: click.echo(f'   {hechos}/{total} archivos')
+    )
+    for key, error in errores:
+        click.echo(f'❌ {key}: {error}')
+    click.echo(f'✅ {copiados} archivos migrados de {origen} a {destino} en {time.perf_counter() - inicio:.2f}s'
+               + (f' ({len(errores)} con error)' if errores else ''))
+
+@click.command('worker')
+@click.option('--hilos', default=1, show_default=True, help='Trabajos en paralelo en este proceso')
+@click.option('--tipo', 'tipos', multiple=True, help='Solo estos tipos de trabajo (repetible)')
+@click.option('--una-vez', is_flag=True, help='Terminar cuando no queden trabajos disponibles')
+@with_appcontext
+def worker_command(hilos, tipos, una_vez):
+    """Procesar la cola de trabajos en segundo plano (tabla trabajo)"""
+    from flask import current_app
+    from services.trabajo_service import ejecutar_worker, cargar_tareas
+    
+    tareas = cargar_tareas()
+    click.echo(f'👷 Worker con {hilos} hilo(s) para: {", ".join(tipos or sorted(tareas))}')
+    ejecutar_worker(current_app._get_current_object(), hilos=hilos, tipos=list(tipos) or None, una_vez=una_vez)
+    click.echo('✅ Worker detenido')
+
+@click.command('extraer-texto-cv')
+@click.option('--lote', default=100, show_default=True, help='Documentos por commit')
+@click.option('--procesos', type=int, help='Procesos de extracción (por defecto CV_EXTRACCION_PROCESOS)')
+@click.option('--tipo', 'tipos', multiple=True, default=('cv',), show_default=True, help='Tipos de documento (repetible)')
+@click.option('--reprocesar', is_flag=True, help='Extraer de nuevo aunque ya tengan texto')
+@with_appcontext
+def extraer_texto_cv_command(lote, procesos, tipos, reprocesar):
+    """Extraer el texto de los documentos existentes (backfill de documento_texto, reanudable)"""
+    from flask import current_app
+    from services.cv_texto_service import extraer_pendientes
+    
+    if procesos:
+        current_app.config['CV_EXTRACCION_PROCESOS'] = procesos
+    
+    def progreso(totales, segundos):
+        megas = totales['bytes'] / (1024 * 1024)
+        click.echo(f'   {totales["documentos"]} documentos ({totales["extraidos"]} extraídos, '
+                   f'{totales["copiados"]} copiados) · {totales["documentos"] / segundos:.1f} docs/s · '
+                   f'{megas / segundos:.2f} MB/s')
+    
+    inicio = time.perf_counter()
+    totales = extraer_pendientes(lote=lote, tipos=tipos, reprocesar=reprocesar, progreso=progreso)
+    for error in totales['errores']:
+        click.echo(f'❌ Documento {error["documento_id"]}: {error["error"]}')
+    click.echo(f'✅ {totales["extraidos"]} documentos extraídos y {totales["copiados"]} copiados '
+               f'en {time.perf_counter() - inicio:.2f}s' + (f' ({len(totales["errores"])} con error)' if totales['errores'] else ''))
+
+@click.command('reconstruir-indice-talento')
+@click.option('--lote', default=500, show_default=True, help='Candidatos por commit')
+@click.option('--solo-pesos', is_flag=True, help='Solo recalcular los pesos BM25 con el largo promedio actual')
+@with_appcontext
+def reconstruir_indice_talento_command(lote, solo_pesos):
+    """Crear/reconstruir el índice de búsqueda de talento (CV, comentarios, ubicación, inglés)"""
+    from services.talento_service import reconstruir_indice, recalcular_pesos
+    
+    inicio = time.perf_counter()
+    if solo_pesos:
+        promedio = recalcular_pesos()
+        click.echo(f'✅ Pesos recalculados (largo promedio {promedio:.1f}) en {time.perf_counter() - inicio:.2f}s')
+        return
+    
+    candidatos = reconstruir_indice(
+        lote=lote,
+        progreso=lambda total, segundos: click.echo(f'   {total} candidatos · {total / segundos:.0f} candidatos/s')
+    )
+    click.echo(f'✅ Índice de talento reconstruido con {candidatos} candidatos en {time.perf_counter() - inicio:.2f}s')
+
+@click.command('importar-datos')
+@click.argument('entidad', type=click.Choice(['vacantes', 'candidatos']))
+@click.argument('archivo', type=click.Path(exists=True, dir_okay=False))
+@click.option('--usuario', 'email', required=True, help='Email del usuario a nombre de quien se importa')
+@click.option('--codificacion', default='utf-8-sig', show_default=True, help='Codificación del CSV')
+@click.option('--lote', type=int, help='Filas por commit (por defecto IMPORTACION_LOTE)')
+@with_appcontext
+def importar_datos_command(entidad, archivo, email, codificacion, lote):
+    """Importar vacantes o candidatos desde un CSV o XLSX (igual que POST /api/importaciones/<entidad>)"""
+    from flask import current_app
+    from models import Usuario
+    from services.importacion_service import importar, ImportacionInvalida
+    
+    usuario = Usuario.query.filter_by(email=email).first()
+    if usuario is None:
+        raise click.ClickException(f'No existe el usuario {email}')
+    if lote:
+        current_app.config['IMPORTACION_LOTE'] = lote
+    
+    def progreso(totales):
+        click.echo(f'   {totales["filas"]} filas ({totales["importadas"]} importadas, {totales["con_errores"]} con error) · '
+                   f'{totales["filas"] / max(totales["segundos"], 0.01):.0f} filas/s')
+    
+    try:
+        with open(archivo, 'rb') as contenido:
+            totales = importar(entidad, contenido, archivo, usuario.id, codificacion, progreso=progreso)
+    except ImportacionInvalida as e:
+        raise click.ClickException(str(e))
+    
+    for error in totales['errores']:
+        click.echo(f'❌ Fila {error["fila"]}: {"; ".join(error["errores"])}')
+    if totales['columnas_ignoradas']:
+        click.echo(f'⚠️ Columnas ignoradas: {", ".join(totales["columnas_ignoradas"])}')
+    click.echo(f'✅ {totales["importadas"]} de {totales["filas"]} filas importadas como {entidad} en {totales["segundos"]:.2f}s'
+               + (f' ({totales["con_errores"]} con error)' if totales['con_errores'] else ''))
+
+def register_commands(app):
+    app.cli.add_command(actualizar_dias_transcurridos_command)
+    app.cli.add_command(reconciliar_contadores_command)
+    app.cli.add_command(reconstruir_indices_busqueda_command)
+    app.cli.add_command(reconstruir_dashboard_command)
+    app.cli.add_command(migrar_almacenamiento_command)
+    app.cli.add_command(worker_command)
+    app.cli.add_command(extraer_texto_cv_command)
+    app.cli.add_command(reconstruir_indice_talento_command)
+    app.cli.add_command(importar_datos_command)
@@ -1,4 +1,5 @@
 import os
+from datetime import timedelta
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -26,11 +27,79 @@ class Config:
         }
     }
     
+    # Índice en memoria de clientes (autocomplete): segundos entre verificaciones
+    # de la versión en la base de datos
+    CLIENTES_INDICE_INTERVALO = float(os.environ.get('CLIENTES_INDICE_INTERVALO') or 2)
+    
+    # Snapshots del dashboard: segundos mínimos entre recálculos de un alcance con
+    # cambios, y antigüedad máxima aunque no haya cambios (actividad reciente)
+    DASHBOARD_SNAPSHOT_INTERVALO = int(os.environ.get('DASHBOARD_SNAPSHOT_INTERVALO') or 60)
+    DASHBOARD_SNAPSHOT_EDAD_MAXIMA = int(os.environ.get('DASHBOARD_SNAPSHOT_EDAD_MAXIMA') or 3600)
+    
     # AWS S3 Configuration
     AWS_ACCESS_KEY_ID = os.environ.get('AWS_ACCESS_KEY_ID')
     AWS_SECRET_ACCESS_KEY = os.environ.get('AWS_SECRET_ACCESS_KEY')
     AWS_S3_BUCKET = os.environ.get('AWS_S3_BUCKET')
     AWS_S3_REGION = os.environ.get('AWS_S3_REGION') or 'us-east-1'
+    # Endpoint alternativo compatible con S3 (MinIO, moto server) para pruebas y benchmarks
+    AWS_S3_ENDPOINT_URL = os.environ.get('AWS_S3_ENDPOINT_URL') or None
+    # Cliente S3 compartido por proceso: conexiones del pool, timeouts (segundos) y reintentos
+    AWS_S3_MAX_POOL_CONNECTIONS = int(os.environ.get('AWS_S3_MAX_POOL_CONNECTIONS') or 50)
+    AWS_S3_CONNECT_TIMEOUT = float(os.environ.get('AWS_S3_CONNECT_TIMEOUT') or 5)
+    AWS_S3_READ_TIMEOUT = float(os.environ.get('AWS_S3_READ_TIMEOUT') or 60)
+    AWS_S3_MAX_ATTEMPTS = int(os.environ.get('AWS_S3_MAX_ATTEMPTS') or 5)
+    # Subida en streaming: tamaño de cada parte multipart (mínimo 5MB en S3), partes
+    # en vuelo por subida e hilos compartidos por todas las subidas del proceso
+    S3_MULTIPART_CHUNK = int(os.environ.get('S3_MULTIPART_CHUNK') or 8 * 1024 * 1024)
+    S3_MULTIPART_CONCURRENCIA = int(os.environ.get('S3_MULTIPART_CONCURRENCIA') or 4)
+    S3_MULTIPART_HILOS = int(os.environ.get('S3_MULTIPART_HILOS') or 16)
+    # URLs de descarga firmadas: vigencia, margen mínimo que le queda a una URL
+    # reutilizada de la caché del worker y número máximo de URLs en caché
+    S3_PRESIGN_EXPIRACION = int(os.environ.get('S3_PRESIGN_EXPIRACION') or 3600)
+    S3_PRESIGN_MARGEN = int(os.environ.get('S3_PRESIGN_MARGEN') or 300)
+    S3_PRESIGN_CACHE_MAX = int(os.environ.get('S3_PRESIGN_CACHE_MAX') or 4096)
+    # Subida de documentos en lote: archivos por petición e hilos de subida a S3 por petición
+    DOCUMENTOS_LOTE_MAX = int(os.environ.get('DOCUMENTOS_LOTE_MAX') or 50)
+    DOCUMENTOS_LOTE_HILOS = int(os.environ.get('DOCUMENTOS_LOTE_HILOS') or 8)
+    
+    # Trabajos en segundo plano (flask worker): segundos entre consultas de la cola
+    # sin trabajos y espera base / máxima entre reintentos (se duplica en cada intento)
+    TRABAJOS_INTERVALO = float(os.environ.get('TRABAJOS_INTERVALO') or 1)
+    TRABAJOS_ESPERA_BASE = float(os.environ.get('TRABAJOS_ESPERA_BASE') or 5)
+    TRABAJOS_ESPERA_MAXIMA = float(os.environ.get('TRABAJOS_ESPERA_MAXIMA') or 600)
+    
+    # Extracción de texto de CVs: procesos del pool por worker (vacío = núcleos de CPU), archivos
+    # que analiza cada proceso antes de reemplazarse (antes de Python 3.11 se reemplaza el pool
+    # completo tras procesos x tareas), descargas simultáneas y caracteres guardados
+    CV_EXTRACCION_PROCESOS = int(os.environ.get('CV_EXTRACCION_PROCESOS') or 0) or None
+    CV_EXTRACCION_TAREAS_POR_PROCESO = int(os.environ.get('CV_EXTRACCION_TAREAS_POR_PROCESO') or 100)
+    CV_EXTRACCION_HILOS = int(os.environ.get('CV_EXTRACCION_HILOS') or 8)
+    CV_TEXTO_MAX_CARACTERES = int(os.environ.get('CV_TEXTO_MAX_CARACTERES') or 200000)
+    
+    # Búsqueda de talento: postings leídos por término (los de mayor peso), resultados
+    # máximos por consulta y segundos entre lecturas del largo promedio del índice
+    TALENTO_POSTINGS_POR_TERMINO = int(os.environ.get('TALENTO_POSTINGS_POR_TERMINO') or 2000)
+    TALENTO_MAX_RESULTADOS = int(os.environ.get('TALENTO_MAX_RESULTADOS') or 1000)
+    TALENTO_ESTADISTICAS_INTERVALO = int(os.environ.get('TALENTO_ESTADISTICAS_INTERVALO') or 60)
+    
+    # Importación CSV/XLSX de vacantes y candidatos: filas por lote (un INSERT y un commit
+    # por lote) y errores por fila que se guardan en el resultado del trabajo
+    IMPORTACION_LOTE = int(os.environ.get('IMPORTACION_LOTE') or 1000)
+    IMPORTACION_MAX_ERRORES = int(os.environ.get('IMPORTACION_MAX_ERRORES') or 1000)
+    # Tamaño máximo del archivo a importar (no aplica MAX_CONTENT_LENGTH), bytes
+    IMPORTACION_MAX_BYTES = int(os.environ.get('IMPORTACION_MAX_BYTES') or 200 * 1024 * 1024)
+    
+    # Exportaciones (/api/exports): filas por bloque leído del cursor y escrito a la respuesta
+    EXPORTACION_FILAS_POR_LOTE = int(os.environ.get('EXPORTACION_FILAS_POR_LOTE') or 1000)
+    
+    # GET condicional: las respuestas con días transcurridos cambian de ETag cada ventana
+    ETAG_VENTANA_SEGUNDOS = int(os.environ.get('ETAG_VENTANA_SEGUNDOS') or 3600)
+    
+    # Almacenamiento de documentos: 's3' o 'local' (disco del servidor en STORAGE_LOCAL_DIR)
+    STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND') or 's3'
+    STORAGE_LOCAL_DIR = os.environ.get('STORAGE_LOCAL_DIR') or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'almacenamiento'
+    )
     
     # File Upload Configuration
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
@@ -38,4 +107,8 @@ class Config:
     
     # JWT Configuration
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-string'
-    JWT_ACCESS_TOKEN_EXPIRES = False
+    JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=int(os.environ.get('JWT_ACCESS_TOKEN_MINUTES') or 15))
+    JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=int(os.environ.get('JWT_REFRESH_TOKEN_DAYS') or 7))
+    
+    # Revocación de tokens por worker: segundos entre verificaciones de la versión de usuarios
+    AUTH_REVOCACION_INTERVALO = float(os.environ.get('AUTH_REVOCACION_INTERVALO') or 5)
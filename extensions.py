@@ -1,6 +1,7 @@
 """
 Extensions module - Inicializa las extensiones de Flask
 """
+from flask import Request as FlaskRequest
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 from flask_jwt_extended import JWTManager
@@ -13,6 +14,23 @@ login_manager = LoginManager()
 jwt = JWTManager()
 migrate = Migrate()
 
+class Request(FlaskRequest):
+    """
+    Request con límite de tamaño por ruta: `request.max_content_length = n`
+    (antes de leer el cuerpo) reemplaza MAX_CONTENT_LENGTH en esa petición.
+    """
+    _max_content_length = None
+
+    @property
+    def max_content_length(self):
+        if self._max_content_length is not None:
+            return self._max_content_length
+        return super().max_content_length
+
+    @max_content_length.setter
+    def max_content_length(self, valor):
+        self._max_content_length = valor
+
 # Configuración mejorada de CORS
 cors = CORS(
     resources={
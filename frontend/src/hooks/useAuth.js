@@ -61,6 +61,7 @@ export const AuthProvider = ({ children }) => {
         } catch (error) {
           console.error('❌ Error restaurando sesión:', error);
           localStorage.removeItem('authToken');
+          localStorage.removeItem('refreshToken');
           localStorage.removeItem('userInfo');
           setUser(null);
         }
@@ -85,11 +86,12 @@ export const AuthProvider = ({ children }) => {
       console.log('🔑 Intentando login para:', credentials.email);
       
       const response = await authService.login(credentials);
-      const { access_token, user: userData } = response.data;
+      const { access_token, refresh_token, user: userData } = response.data;
       
       console.log('✅ Login exitoso:', userData);
       
       localStorage.setItem('authToken', access_token);
+      localStorage.setItem('refreshToken', refresh_token);
       localStorage.setItem('userInfo', JSON.stringify(userData));
       setUser(userData);
       
@@ -41,7 +41,26 @@ api.interceptors.response.use(
     console.log(`✅ ${response.config.method?.toUpperCase()} ${response.config.url} - ${response.status}`, response.data);
     return response;
   },
-  (error) => {
+  async (error) => {
+    const originalRequest = error.config;
+    const refreshToken = localStorage.getItem('refreshToken');
+    
+    // Access token vencido: renovarlo una vez con el refresh token y reintentar
+    if (error.response?.status === 401 && refreshToken && originalRequest && !originalRequest._retry
+        && !originalRequest.url?.includes('/auth/')) {
+      originalRequest._retry = true;
+      try {
+        const response = await axios.post(`${API_BASE_URL}/auth/refresh`, null, {
+          headers: { Authorization: `Bearer ${refreshToken}` }
+        });
+        localStorage.setItem('authToken', response.data.access_token);
+        originalRequest.headers.Authorization = `Bearer ${response.data.access_token}`;
+        return api(originalRequest);
+      } catch (refreshError) {
+        console.log('🔐 No se pudo renovar el token');
+      }
+    }
+    
     console.error('❌ Response error:', {
       url: error.config?.url,
       method: error.config?.method,
@@ -53,6 +72,7 @@ api.interceptors.response.use(
     if (error.response?.status === 401) {
       console.log('🔐 Token inválido, redirigiendo a login...');
       localStorage.removeItem('authToken');
+      localStorage.removeItem('refreshToken');
       localStorage.removeItem('userInfo');
       window.location.href = '/login';
     }
@@ -82,6 +102,7 @@ export const authService = {
   register: (userData) => api.post('/auth/register', userData),
   logout: () => {
     localStorage.removeItem('authToken');
+    localStorage.removeItem('refreshToken');
     localStorage.removeItem('userInfo');
   },
   // Nuevo: verificar si el token es válido
@@ -147,7 +168,21 @@ export const documentService = {
       'Content-Type': 'multipart/form-data',
     },
   }),
+  // El archivo va como cuerpo de la petición (sin form-data) y se sube a S3 en streaming
+  uploadDocumentStream: (file, candidatoId, tipo = 'otro') => api.post(
+    `/documentos/upload/stream?candidato_id=${candidatoId}&tipo=${tipo}&nombre=${encodeURIComponent(file.name)}`,
+    file,
+    { headers: { 'Content-Type': file.type || 'application/octet-stream' } }
+  ),
+  // formData con 'files' repetido y 'candidato_id' / 'tipo' una vez o uno por archivo
+  uploadDocumentsBatch: (formData) => api.post('/documentos/upload/lote', formData, {
+    headers: {
+      'Content-Type': 'multipart/form-data',
+    },
+  }),
   getDocument: (id) => api.get(`/documentos/${id}`),
+  getCandidateDownloadUrls: (candidatoId) => api.get(`/documentos/download-urls?candidato_id=${candidatoId}`),
+  getDownloadUrls: (ids) => api.get(`/documentos/download-urls?ids=${ids.join(',')}`),
   deleteDocument: (id) => api.delete(`/documentos/${id}`)
 };
 
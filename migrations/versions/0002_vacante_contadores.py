@@ -0,0 +1,55 @@
+"""tabla vacante_contadores
+
+Contadores desnormalizados del pipeline por vacante. Se llenan aquí con los
+datos existentes; después los mantiene services/contadores_service.py.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 20:05:12.418903
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('vacante_contadores',
+    sa.Column('vacante_id', sa.Integer(), nullable=False),
+    sa.Column('total_candidatos', sa.Integer(), nullable=False),
+    sa.Column('candidatos_aceptados', sa.Integer(), nullable=False),
+    sa.Column('candidatos_contratados', sa.Integer(), nullable=False),
+    sa.Column('candidatos_rechazados', sa.Integer(), nullable=False),
+    sa.Column('candidatos_no_contratables', sa.Integer(), nullable=False),
+    sa.Column('fecha_actualizacion', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['vacante_id'], ['vacante.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('vacante_id')
+    )
+
+    op.execute("""
+        INSERT INTO vacante_contadores (
+            vacante_id, total_candidatos, candidatos_aceptados, candidatos_contratados,
+            candidatos_rechazados, candidatos_no_contratables, fecha_actualizacion
+        )
+        SELECT
+            v.id,
+            COUNT(cp.id),
+            COALESCE(SUM(CASE WHEN cp.aceptado = 1 THEN 1 ELSE 0 END), 0),
+            COALESCE(SUM(CASE WHEN cp.contratado_status = 'contratado' THEN 1 ELSE 0 END), 0),
+            COALESCE(SUM(CASE WHEN cp.contratado_status = 'rechazado' THEN 1 ELSE 0 END), 0),
+            COALESCE(SUM(CASE WHEN cp.contratado_status = 'no_contratable' THEN 1 ELSE 0 END), 0),
+            CURRENT_TIMESTAMP
+        FROM vacante v
+        LEFT JOIN candidatos_posiciones cp ON cp.vacante_id = v.id
+        GROUP BY v.id
+    """)
+
+
+def downgrade():
+    op.drop_table('vacante_contadores')
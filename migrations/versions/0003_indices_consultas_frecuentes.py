@@ -0,0 +1,96 @@
+"""índices para filtros y ordenamientos frecuentes
+
+Cada índice corresponde a un WHERE/ORDER BY de las rutas:
+
+- vacante: listado ordenado por fecha_creacion, filtrado por estado y por
+  reclutador_id/ejecutivo_id según el rol; cliente_id + estado para las
+  estadísticas por cliente.
+- candidato: listado por fecha_creacion, filtrado por estado y reclutador_id.
+- candidatos_posiciones: índice único (candidato_id, vacante_id) que
+  convierte la verificación de duplicados en una búsqueda por índice;
+  filtros por vacante_id, status y contratado_status ordenados por
+  fecha_asignacion.
+- entrevista: rango de fechas, resultado y vacante_id.
+- cliente: activos ordenados por fecha_creacion y por nombre.
+
+Verificar los planes con `python verify_indexes.py`.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 20:11:37.902114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+INDICES = [
+    ('ix_vacante_fecha_creacion', 'vacante', ['fecha_creacion']),
+    ('ix_vacante_estado_fecha_creacion', 'vacante', ['estado', 'fecha_creacion']),
+    ('ix_vacante_reclutador_fecha_creacion', 'vacante', ['reclutador_id', 'fecha_creacion']),
+    ('ix_vacante_ejecutivo_fecha_creacion', 'vacante', ['ejecutivo_id', 'fecha_creacion']),
+    ('ix_vacante_cliente_estado', 'vacante', ['cliente_id', 'estado']),
+    ('ix_candidato_fecha_creacion', 'candidato', ['fecha_creacion']),
+    ('ix_candidato_estado_fecha_creacion', 'candidato', ['estado', 'fecha_creacion']),
+    ('ix_candidato_reclutador_fecha_creacion', 'candidato', ['reclutador_id', 'fecha_creacion']),
+    ('ix_cp_vacante_fecha_asignacion', 'candidatos_posiciones', ['vacante_id', 'fecha_asignacion']),
+    ('ix_cp_status_fecha_asignacion', 'candidatos_posiciones', ['status', 'fecha_asignacion']),
+    ('ix_cp_contratado_status_fecha_asignacion', 'candidatos_posiciones', ['contratado_status', 'fecha_asignacion']),
+    ('ix_cp_fecha_asignacion', 'candidatos_posiciones', ['fecha_asignacion']),
+    ('ix_entrevista_fecha', 'entrevista', ['fecha']),
+    ('ix_entrevista_resultado_fecha', 'entrevista', ['resultado', 'fecha']),
+    ('ix_entrevista_vacante_fecha', 'entrevista', ['vacante_id', 'fecha']),
+    ('ix_cliente_activo_fecha_creacion', 'cliente', ['activo', 'fecha_creacion']),
+    ('ix_cliente_activo_nombre', 'cliente', ['activo', 'nombre']),
+]
+
+# Columnas con llave foránea cuyo índice en MySQL pueden estar cubriendo los
+# índices compuestos; al bajar la revisión se recrean antes de eliminarlos
+COLUMNAS_FK = [
+    ('vacante', 'ejecutivo_id'),
+    ('vacante', 'reclutador_id'),
+    ('vacante', 'cliente_id'),
+    ('candidato', 'reclutador_id'),
+    ('candidatos_posiciones', 'candidato_id'),
+    ('candidatos_posiciones', 'vacante_id'),
+    ('entrevista', 'vacante_id'),
+]
+
+
+def upgrade():
+    # El índice único falla si ya hay asignaciones duplicadas: reportarlas claramente
+    duplicados = op.get_bind().execute(sa.text("""
+        SELECT candidato_id, vacante_id, COUNT(*)
+        FROM candidatos_posiciones
+        GROUP BY candidato_id, vacante_id
+        HAVING COUNT(*) > 1
+    """)).fetchall()
+    if duplicados:
+        detalle = ', '.join(f'(candidato {c}, vacante {v}: {n})' for c, v, n in duplicados[:20])
+        raise RuntimeError(
+            f'Hay {len(duplicados)} asignaciones candidato/vacante duplicadas; '
+            f'elimínelas antes de crear uq_candidato_vacante: {detalle}'
+        )
+
+    op.create_index('uq_candidato_vacante', 'candidatos_posiciones', ['candidato_id', 'vacante_id'], unique=True)
+
+    for nombre, tabla, columnas in INDICES:
+        op.create_index(nombre, tabla, columnas, unique=False)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'mysql':
+        for tabla, columna in COLUMNAS_FK:
+            op.create_index(f'ix_{tabla}_{columna}', tabla, [columna], unique=False)
+
+    for nombre, tabla, columnas in reversed(INDICES):
+        op.drop_index(nombre, table_name=tabla)
+
+    op.drop_index('uq_candidato_vacante', table_name='candidatos_posiciones')
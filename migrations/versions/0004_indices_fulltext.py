@@ -0,0 +1,33 @@
+"""índices FULLTEXT para búsqueda de candidatos, vacantes y clientes
+
+En MySQL son índices FULLTEXT (usados por services/search_service.py con
+MATCH ... AGAINST). En otros motores el prefijo se ignora y queda un índice
+normal; en SQLite la búsqueda usa tablas FTS5 que se crean con
+`flask reconstruir-indices-busqueda`.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 20:48:03.551207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ft_candidato_nombre', 'candidato', ['nombre'], unique=False, mysql_prefix='FULLTEXT')
+    op.create_index('ft_vacante_nombre', 'vacante', ['nombre'], unique=False, mysql_prefix='FULLTEXT')
+    op.create_index('ft_cliente_nombre_ccp', 'cliente', ['nombre', 'ccp'], unique=False, mysql_prefix='FULLTEXT')
+
+
+def downgrade():
+    op.drop_index('ft_cliente_nombre_ccp', table_name='cliente')
+    op.drop_index('ft_vacante_nombre', table_name='vacante')
+    op.drop_index('ft_candidato_nombre', table_name='candidato')
@@ -0,0 +1,36 @@
+"""tabla version_datos
+
+Contador de versión por conjunto de datos. Lo incrementa
+services/version_service.py en cada cambio; las cachés en memoria de cada
+worker (p. ej. el índice de clientes del autocomplete) lo comparan para
+saber cuándo recargarse.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 21:12:40.207316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    version_datos = op.create_table('version_datos',
+    sa.Column('clave', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('fecha_actualizacion', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('clave')
+    )
+
+    op.bulk_insert(version_datos, [{'clave': 'cliente', 'version': 1}])
+
+
+def downgrade():
+    op.drop_table('version_datos')
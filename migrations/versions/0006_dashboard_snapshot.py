@@ -0,0 +1,35 @@
+"""tabla dashboard_snapshot
+
+Métricas del dashboard precalculadas por alcance. Las filas se crean al
+primer acceso de cada alcance o con `flask reconstruir-dashboard`.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 21:48:19.662045
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('dashboard_snapshot',
+    sa.Column('alcance', sa.String(length=20), nullable=False),
+    sa.Column('usuario_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('datos', sa.Text(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('version_calculada', sa.Integer(), nullable=False),
+    sa.Column('fecha_calculo', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('alcance', 'usuario_id')
+    )
+
+
+def downgrade():
+    op.drop_table('dashboard_snapshot')
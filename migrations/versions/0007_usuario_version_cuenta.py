@@ -0,0 +1,29 @@
+"""usuario.version_cuenta
+
+Versión de la cuenta que viaja en los JWT: al cambiar rol, activo o
+contraseña se incrementa y los tokens emitidos antes dejan de ser válidos.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 22:26:51.904381
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('usuario', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version_cuenta', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('usuario', schema=None) as batch_op:
+        batch_op.drop_column('version_cuenta')
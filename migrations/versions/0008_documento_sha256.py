@@ -0,0 +1,30 @@
+"""documento.sha256
+
+SHA-256 del contenido, calculado al vuelo por la subida en streaming.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 20:14:05.318842
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('documento', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('sha256', sa.String(length=64), nullable=True))
+        batch_op.create_index(batch_op.f('ix_documento_sha256'), ['sha256'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('documento', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_documento_sha256'))
+        batch_op.drop_column('sha256')
@@ -0,0 +1,35 @@
+"""tabla documento_blob
+
+Contenido de documentos deduplicado por SHA-256 con conteo de referencias.
+Los documentos anteriores conservan su propio objeto en S3.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17 20:31:47.120934
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('documento_blob',
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('key_s3', sa.String(length=500), nullable=False),
+    sa.Column('url_s3', sa.String(length=500), nullable=False),
+    sa.Column('tamaño_bytes', sa.Integer(), nullable=True),
+    sa.Column('referencias', sa.Integer(), nullable=False),
+    sa.Column('fecha_creacion', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('sha256')
+    )
+
+
+def downgrade():
+    op.drop_table('documento_blob')
@@ -0,0 +1,51 @@
+"""tabla trabajo
+
+Cola de trabajos en segundo plano que procesa `flask worker`.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17 21:02:36.551870
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('trabajo',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tipo', sa.String(length=50), nullable=False),
+    sa.Column('estado', sa.Enum('pendiente', 'en_proceso', 'completado', 'fallido'), nullable=False),
+    sa.Column('parametros', sa.Text(), nullable=True),
+    sa.Column('resultado', sa.Text(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('intentos', sa.Integer(), nullable=False),
+    sa.Column('max_intentos', sa.Integer(), nullable=False),
+    sa.Column('disponible_en', sa.DateTime(), nullable=False),
+    sa.Column('bloqueado_por', sa.String(length=100), nullable=True),
+    sa.Column('bloqueado_hasta', sa.DateTime(), nullable=True),
+    sa.Column('usuario_id', sa.Integer(), nullable=True),
+    sa.Column('fecha_creacion', sa.DateTime(), nullable=True),
+    sa.Column('fecha_inicio', sa.DateTime(), nullable=True),
+    sa.Column('fecha_fin', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['usuario_id'], ['usuario.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('trabajo', schema=None) as batch_op:
+        batch_op.create_index('ix_trabajo_estado_disponible', ['estado', 'disponible_en'], unique=False)
+        batch_op.create_index('ix_trabajo_tipo_estado', ['tipo', 'estado'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('trabajo', schema=None) as batch_op:
+        batch_op.drop_index('ix_trabajo_tipo_estado')
+        batch_op.drop_index('ix_trabajo_estado_disponible')
+
+    op.drop_table('trabajo')
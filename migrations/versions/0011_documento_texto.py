@@ -0,0 +1,46 @@
+"""tabla documento_texto
+
+Texto extraído de los CV y datos detectados (emails, teléfonos, años de
+experiencia). Los documentos existentes se procesan con `flask extraer-texto-cv`.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-17 21:48:12.306417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('documento_texto',
+    sa.Column('documento_id', sa.Integer(), nullable=False),
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('estado', sa.Enum('completado', 'sin_texto', 'no_soportado', 'error'), nullable=False),
+    sa.Column('texto', sa.Text(length=16777215), nullable=True),
+    sa.Column('emails', sa.Text(), nullable=True),
+    sa.Column('telefonos', sa.Text(), nullable=True),
+    sa.Column('anios_experiencia', sa.Integer(), nullable=True),
+    sa.Column('paginas', sa.Integer(), nullable=True),
+    sa.Column('caracteres', sa.Integer(), nullable=True),
+    sa.Column('error', sa.String(length=500), nullable=True),
+    sa.Column('fecha_extraccion', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['documento_id'], ['documento.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('documento_id')
+    )
+    with op.batch_alter_table('documento_texto', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_documento_texto_sha256'), ['sha256'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('documento_texto', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_documento_texto_sha256'))
+
+    op.drop_table('documento_texto')
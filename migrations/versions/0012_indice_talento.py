@@ -0,0 +1,57 @@
+"""índice de talento
+
+Índice invertido (términos, postings con peso BM25 y candidatos indexados)
+para /api/candidatos/talent-search. Se llena con `flask reconstruir-indice-talento`.
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-17 22:34:51.872210
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0012'
+down_revision = '0011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('talento_termino',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('termino', sa.String(length=64), nullable=False),
+    sa.Column('df', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('termino')
+    )
+    op.create_table('talento_posting',
+    sa.Column('termino_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('candidato_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('tf', sa.Integer(), nullable=False),
+    sa.Column('peso', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('termino_id', 'candidato_id')
+    )
+    with op.batch_alter_table('talento_posting', schema=None) as batch_op:
+        batch_op.create_index('ix_talento_posting_candidato_termino', ['candidato_id', 'termino_id', 'peso'], unique=False)
+        batch_op.create_index('ix_talento_posting_termino_peso', ['termino_id', 'peso', 'candidato_id'], unique=False)
+
+    op.create_table('talento_documento',
+    sa.Column('candidato_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('longitud', sa.Integer(), nullable=False),
+    sa.Column('firma', sa.String(length=64), nullable=False),
+    sa.Column('fecha_indexado', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('candidato_id')
+    )
+
+
+def downgrade():
+    op.drop_table('talento_documento')
+    with op.batch_alter_table('talento_posting', schema=None) as batch_op:
+        batch_op.drop_index('ix_talento_posting_termino_peso')
+        batch_op.drop_index('ix_talento_posting_candidato_termino')
+
+    op.drop_table('talento_posting')
+    op.drop_table('talento_termino')
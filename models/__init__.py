@@ -1,3 +1,4 @@
+import json
 from extensions import db
 from datetime import datetime
 from flask_login import UserMixin
@@ -6,6 +7,11 @@ from werkzeug.security import generate_password_hash, check_password_hash
 # Modelo Cliente ⭐ NUEVO
 class Cliente(db.Model):
     __tablename__ = 'cliente'
+    __table_args__ = (
+        db.Index('ix_cliente_activo_fecha_creacion', 'activo', 'fecha_creacion'),
+        db.Index('ix_cliente_activo_nombre', 'activo', 'nombre'),
+        db.Index('ft_cliente_nombre_ccp', 'nombre', 'ccp', mysql_prefix='FULLTEXT'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     nombre = db.Column(db.String(200), nullable=False)
@@ -25,12 +31,20 @@ class Cliente(db.Model):
             'activo': self.activo,
             'fecha_creacion': self.fecha_creacion.isoformat() if self.fecha_creacion else None,
             'fecha_actualizacion': self.fecha_actualizacion.isoformat() if self.fecha_actualizacion else None,
-            'total_vacantes': len(self.vacantes) if self.vacantes else 0
+            'total_vacantes': self.total_vacantes or 0
         }
 
 # Tabla intermedia para relación muchos a muchos - ACTUALIZADA CON CAMPOS REALES
 class CandidatosPositions(db.Model):
     __tablename__ = 'candidatos_posiciones'
+    __table_args__ = (
+        # Un candidato solo puede estar una vez en cada vacante
+        db.Index('uq_candidato_vacante', 'candidato_id', 'vacante_id', unique=True),
+        db.Index('ix_cp_vacante_fecha_asignacion', 'vacante_id', 'fecha_asignacion'),
+        db.Index('ix_cp_status_fecha_asignacion', 'status', 'fecha_asignacion'),
+        db.Index('ix_cp_contratado_status_fecha_asignacion', 'contratado_status', 'fecha_asignacion'),
+        db.Index('ix_cp_fecha_asignacion', 'fecha_asignacion'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     candidato_id = db.Column(db.Integer, db.ForeignKey('candidato.id'), nullable=False)
@@ -99,6 +113,8 @@ class Usuario(UserMixin, db.Model):
     rol = db.Column(db.Enum('ejecutivo', 'reclutador', 'reclutador_lider', 'administrador'), nullable=False)
     activo = db.Column(db.Boolean, default=True)
     fecha_creacion = db.Column(db.DateTime, default=datetime.utcnow)
+    # Se incrementa al cambiar rol, activo o contraseña: invalida los tokens emitidos antes
+    version_cuenta = db.Column(db.Integer, nullable=False, default=1, server_default='1')
     
     # Relationships
     vacantes_ejecutivo = db.relationship('Vacante', foreign_keys='Vacante.ejecutivo_id', back_populates='ejecutivo')
@@ -125,6 +141,14 @@ class Usuario(UserMixin, db.Model):
 
 class Vacante(db.Model):
     __tablename__ = 'vacante'
+    __table_args__ = (
+        db.Index('ix_vacante_fecha_creacion', 'fecha_creacion'),
+        db.Index('ix_vacante_estado_fecha_creacion', 'estado', 'fecha_creacion'),
+        db.Index('ix_vacante_reclutador_fecha_creacion', 'reclutador_id', 'fecha_creacion'),
+        db.Index('ix_vacante_ejecutivo_fecha_creacion', 'ejecutivo_id', 'fecha_creacion'),
+        db.Index('ix_vacante_cliente_estado', 'cliente_id', 'estado'),
+        db.Index('ft_vacante_nombre', 'nombre', mysql_prefix='FULLTEXT'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     
@@ -180,6 +204,7 @@ class Vacante(db.Model):
     cliente = db.relationship('Cliente', back_populates='vacantes')  # ⭐ NUEVO
     entrevistas = db.relationship('Entrevista', back_populates='vacante_rel', cascade='all, delete-orphan')
     candidatos_posiciones = db.relationship('CandidatosPositions', back_populates='vacante', cascade='all, delete-orphan')
+    contadores = db.relationship('VacanteContadores', back_populates='vacante', uselist=False, cascade='all, delete-orphan')
     
     def calcular_dias_transcurridos(self):
         """Calcular días transcurridos desde la fecha de solicitud"""
@@ -210,18 +235,31 @@ class Vacante(db.Model):
     
     def actualizar_status_final(self):
         """Actualizar el status final basado en el estado de candidatos"""
-        contratados = len(self.get_candidatos_contratados())
+        contratados = self.get_contadores()['candidatos_contratados']
         if contratados >= self.vacantes:
             self.status_final = 'cubierta'
             self.avance = 'Posiciones cubiertas'
             self.fecha_cierre = datetime.utcnow()
     
-    def get_candidatos_restantes(self):
+    def get_candidatos_restantes(self, total_candidatos=None):
         """Calcular candidatos restantes que se necesitan"""
-        candidatos_actuales = len(self.candidatos_posiciones)
-        return max(0, self.candidatos_requeridos - candidatos_actuales)
-    
-    def to_dict(self):
+        if total_candidatos is None:
+            total_candidatos = self.get_contadores()['total_candidatos']
+        return max(0, self.candidatos_requeridos - total_candidatos)
+    
+    def get_contadores(self):
+        """
+        Contadores del pipeline desde la tabla vacante_contadores (mantenida por
+        services/contadores_service.py). Sin fila significa que aún no tiene candidatos.
+        """
+        if self.contadores:
+            return self.contadores.to_dict()
+        return VacanteContadores.vacios()
+    
+    def to_dict(self, contadores=None):
+        if contadores is None:
+            contadores = self.get_contadores()
+        
         return {
             'id': self.id,
             'nombre': self.nombre,
@@ -249,12 +287,12 @@ class Vacante(db.Model):
             'cliente_ccp': self.cliente.ccp if self.cliente else None,
             
             # Contadores dinámicos basados en el estado real
-            'total_candidatos': len(self.candidatos_posiciones),
-            'candidatos_aceptados': len(self.get_candidatos_aceptados()),
-            'candidatos_contratados': len(self.get_candidatos_contratados()),
-            'candidatos_rechazados': len(self.get_candidatos_rechazados()),
-            'candidatos_no_contratables': len(self.get_candidatos_no_contratables()),
-            'candidatos_restantes': self.get_candidatos_restantes(),
+            'total_candidatos': contadores['total_candidatos'],
+            'candidatos_aceptados': contadores['candidatos_aceptados'],
+            'candidatos_contratados': contadores['candidatos_contratados'],
+            'candidatos_rechazados': contadores['candidatos_rechazados'],
+            'candidatos_no_contratables': contadores['candidatos_no_contratables'],
+            'candidatos_restantes': self.get_candidatos_restantes(contadores['total_candidatos']),
             
             # Campos originales
             'estado': self.estado,
@@ -273,8 +311,53 @@ class Vacante(db.Model):
             'reclutador_lider': self.reclutador_lider.nombre if self.reclutador_lider else None
         }
 
+# COUNT por cliente en la misma consulta (índice cliente_id) en lugar de cargar
+# sus vacantes; diferido para que solo lo calculen las consultas que lo piden
+# con undefer (ver serializer_service.cliente_eager_options)
+Cliente.total_vacantes = db.column_property(
+    db.select(db.func.count(Vacante.id)).where(Vacante.cliente_id == Cliente.id)
+        .correlate_except(Vacante).scalar_subquery(),
+    deferred=True
+)
+
+class VacanteContadores(db.Model):
+    """Contadores desnormalizados del pipeline de cada vacante"""
+    __tablename__ = 'vacante_contadores'
+    
+    CAMPOS = (
+        'total_candidatos',
+        'candidatos_aceptados',
+        'candidatos_contratados',
+        'candidatos_rechazados',
+        'candidatos_no_contratables'
+    )
+    
+    vacante_id = db.Column(db.Integer, db.ForeignKey('vacante.id', ondelete='CASCADE'), primary_key=True)
+    total_candidatos = db.Column(db.Integer, nullable=False, default=0)
+    candidatos_aceptados = db.Column(db.Integer, nullable=False, default=0)
+    candidatos_contratados = db.Column(db.Integer, nullable=False, default=0)
+    candidatos_rechazados = db.Column(db.Integer, nullable=False, default=0)
+    candidatos_no_contratables = db.Column(db.Integer, nullable=False, default=0)
+    fecha_actualizacion = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Relationships
+    vacante = db.relationship('Vacante', back_populates='contadores')
+    
+    @classmethod
+    def vacios(cls):
+        return {campo: 0 for campo in cls.CAMPOS}
+    
+    def to_dict(self):
+        return {campo: getattr(self, campo) or 0 for campo in self.CAMPOS}
+
 class Candidato(db.Model):
     __tablename__ = 'candidato'
+    __table_args__ = (
+        db.Index('ix_candidato_fecha_creacion', 'fecha_creacion'),
+        db.Index('ix_candidato_estado_fecha_creacion', 'estado', 'fecha_creacion'),
+        db.Index('ix_candidato_reclutador_fecha_creacion', 'reclutador_id', 'fecha_creacion'),
+        db.Index('ft_candidato_nombre', 'nombre', mysql_prefix='FULLTEXT'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     nombre = db.Column(db.String(100), nullable=False)
@@ -348,10 +431,12 @@ class Documento(db.Model):
     candidato_id = db.Column(db.Integer, db.ForeignKey('candidato.id'), nullable=False)
     tamaño_bytes = db.Column(db.Integer)
     content_type = db.Column(db.String(100))
+    sha256 = db.Column(db.String(64), index=True)  # Hex del contenido (subidas en streaming)
     fecha_subida = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationships
     candidato_rel = db.relationship('Candidato', back_populates='documentos')
+    texto = db.relationship('DocumentoTexto', back_populates='documento', uselist=False, cascade='all, delete-orphan')
     
     def to_dict(self):
         return {
@@ -362,11 +447,99 @@ class Documento(db.Model):
             'candidato_id': self.candidato_id,
             'tamaño_bytes': self.tamaño_bytes,
             'content_type': self.content_type,
+            'sha256': self.sha256,
             'fecha_subida': self.fecha_subida.isoformat() if self.fecha_subida else None
         }
 
+class DocumentoBlob(db.Model):
+    """Contenido único en S3 (por SHA-256), compartido por los documentos que lo referencian"""
+    __tablename__ = 'documento_blob'
+    
+    sha256 = db.Column(db.String(64), primary_key=True)
+    key_s3 = db.Column(db.String(500), nullable=False)
+    url_s3 = db.Column(db.String(500), nullable=False)
+    tamaño_bytes = db.Column(db.Integer)
+    # Documentos que apuntan a key_s3; el objeto se elimina de S3 al llegar a 0
+    referencias = db.Column(db.Integer, nullable=False, default=0)
+    fecha_creacion = db.Column(db.DateTime, default=datetime.utcnow)
+
+class DocumentoTexto(db.Model):
+    """Texto extraído de un documento (CV) y los datos detectados en él"""
+    __tablename__ = 'documento_texto'
+    
+    documento_id = db.Column(db.Integer, db.ForeignKey('documento.id', ondelete='CASCADE'), primary_key=True)
+    sha256 = db.Column(db.String(64), nullable=False, index=True)  # Contenido del que se extrajo
+    estado = db.Column(db.Enum('completado', 'sin_texto', 'no_soportado', 'error'), nullable=False)
+    texto = db.Column(db.Text(16777215))  # MEDIUMTEXT en MySQL
+    emails = db.Column(db.Text)  # JSON
+    telefonos = db.Column(db.Text)  # JSON
+    anios_experiencia = db.Column(db.Integer)
+    paginas = db.Column(db.Integer)
+    caracteres = db.Column(db.Integer)
+    error = db.Column(db.String(500))
+    fecha_extraccion = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    documento = db.relationship('Documento', back_populates='texto')
+    
+    def to_dict(self, incluir_texto=False):
+        data = {
+            'documento_id': self.documento_id,
+            'sha256': self.sha256,
+            'estado': self.estado,
+            'emails': json.loads(self.emails) if self.emails else [],
+            'telefonos': json.loads(self.telefonos) if self.telefonos else [],
+            'anios_experiencia': self.anios_experiencia,
+            'paginas': self.paginas,
+            'caracteres': self.caracteres,
+            'error': self.error,
+            'fecha_extraccion': self.fecha_extraccion.isoformat() if self.fecha_extraccion else None
+        }
+        if incluir_texto:
+            data['texto'] = self.texto
+        return data
+
+class TalentoTermino(db.Model):
+    """Término del índice de talento y número de candidatos que lo contienen (df)"""
+    __tablename__ = 'talento_termino'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    termino = db.Column(db.String(64), nullable=False, unique=True)
+    df = db.Column(db.Integer, nullable=False, default=0)
+
+class TalentoPosting(db.Model):
+    """Aparición de un término en un candidato con su peso BM25 (sin idf)"""
+    __tablename__ = 'talento_posting'
+    __table_args__ = (
+        # Los postings más relevantes de un término se leen en orden de peso,
+        # solo del índice (incluye candidato_id)
+        db.Index('ix_talento_posting_termino_peso', 'termino_id', 'peso', 'candidato_id'),
+        # Postings de un candidato (reindexar) y de varios candidatos en varios términos (completar puntuaciones)
+        db.Index('ix_talento_posting_candidato_termino', 'candidato_id', 'termino_id', 'peso'),
+    )
+    
+    termino_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    candidato_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    tf = db.Column(db.Integer, nullable=False)
+    peso = db.Column(db.Float, nullable=False)
+
+class TalentoDocumento(db.Model):
+    """Candidato indexado: largo en términos y firma del contenido indexado"""
+    __tablename__ = 'talento_documento'
+    
+    # Sin FK: al eliminar un candidato el índice todavía debe descontar sus términos
+    candidato_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    longitud = db.Column(db.Integer, nullable=False)
+    firma = db.Column(db.String(64), nullable=False)
+    fecha_indexado = db.Column(db.DateTime, default=datetime.utcnow)
+
 class Entrevista(db.Model):
     __tablename__ = 'entrevista'
+    __table_args__ = (
+        db.Index('ix_entrevista_fecha', 'fecha'),
+        db.Index('ix_entrevista_resultado_fecha', 'resultado', 'fecha'),
+        db.Index('ix_entrevista_vacante_fecha', 'vacante_id', 'fecha'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     fecha = db.Column(db.DateTime, nullable=False)
@@ -404,3 +577,65 @@ class Entrevista(db.Model):
             'vacante': self.vacante_rel.nombre if self.vacante_rel else None,
             'entrevistador': self.entrevistador.nombre if self.entrevistador else None
         }
+
+class VersionDatos(db.Model):
+    """Contador de versión por conjunto de datos, para invalidar cachés de todos los workers"""
+    __tablename__ = 'version_datos'
+    
+    clave = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    fecha_actualizacion = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class DashboardSnapshot(db.Model):
+    """Métricas del dashboard precalculadas por alcance (global, ejecutivo o reclutador)"""
+    __tablename__ = 'dashboard_snapshot'
+    
+    alcance = db.Column(db.String(20), primary_key=True)  # global, ejecutivo, reclutador
+    usuario_id = db.Column(db.Integer, primary_key=True, autoincrement=False)  # 0 en el alcance global
+    datos = db.Column(db.Text, nullable=False)  # JSON de calcular_dashboard()
+    # Se incrementa con cada cambio que afecta al alcance; el snapshot está
+    # vigente mientras version_calculada == version
+    version = db.Column(db.Integer, nullable=False, default=0)
+    version_calculada = db.Column(db.Integer, nullable=False, default=0)
+    fecha_calculo = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+class Trabajo(db.Model):
+    """Trabajo en segundo plano: cola en base de datos que procesa `flask worker`"""
+    __tablename__ = 'trabajo'
+    __table_args__ = (
+        db.Index('ix_trabajo_estado_disponible', 'estado', 'disponible_en'),
+        db.Index('ix_trabajo_tipo_estado', 'tipo', 'estado'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    tipo = db.Column(db.String(50), nullable=False)
+    estado = db.Column(db.Enum('pendiente', 'en_proceso', 'completado', 'fallido'), nullable=False, default='pendiente')
+    parametros = db.Column(db.Text)  # JSON
+    resultado = db.Column(db.Text)  # JSON
+    error = db.Column(db.Text)
+    intentos = db.Column(db.Integer, nullable=False, default=0)
+    max_intentos = db.Column(db.Integer, nullable=False, default=3)
+    disponible_en = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)  # Reintentos con espera
+    bloqueado_por = db.Column(db.String(100))  # Worker que lo procesa
+    bloqueado_hasta = db.Column(db.DateTime)  # Si vence, el worker murió y el trabajo vuelve a la cola
+    usuario_id = db.Column(db.Integer, db.ForeignKey('usuario.id'))
+    fecha_creacion = db.Column(db.DateTime, default=datetime.utcnow)
+    fecha_inicio = db.Column(db.DateTime)
+    fecha_fin = db.Column(db.DateTime)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'tipo': self.tipo,
+            'estado': self.estado,
+            'parametros': json.loads(self.parametros) if self.parametros else None,
+            'resultado': json.loads(self.resultado) if self.resultado else None,
+            'error': self.error,
+            'intentos': self.intentos,
+            'max_intentos': self.max_intentos,
+            'disponible_en': self.disponible_en.isoformat() if self.disponible_en else None,
+            'usuario_id': self.usuario_id,
+            'fecha_creacion': self.fecha_creacion.isoformat() if self.fecha_creacion else None,
+            'fecha_inicio': self.fecha_inicio.isoformat() if self.fecha_inicio else None,
+            'fecha_fin': self.fecha_fin.isoformat() if self.fecha_fin else None
+        }
@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
-from services.auth_service import authenticate_user
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from services.auth_service import authenticate_user, crear_access_token
 from extensions import db
 
 auth_bp = Blueprint('auth', __name__)
@@ -20,6 +21,7 @@ def login():
             return jsonify({
                 'message': 'Login exitoso',
                 'access_token': result['access_token'],
+                'refresh_token': result['refresh_token'],
                 'user': result['user']
             }), 200
         else:
@@ -28,6 +30,23 @@ def login():
     except Exception as e:
         return jsonify({'message': f'Error en login: {str(e)}'}), 500
 
+@auth_bp.route('/refresh', methods=['POST'])
+@jwt_required(refresh=True)
+def refresh():
+    """Emitir un nuevo access token a partir del refresh token"""
+    try:
+        from models import Usuario
+        usuario = db.session.get(Usuario, int(get_jwt_identity()))
+        
+        # El refresh token deja de valer si la cuenta se desactivó o cambió de rol/contraseña
+        if not usuario or not usuario.activo or get_jwt().get('ver') != usuario.version_cuenta:
+            return jsonify({'message': 'Token inválido o usuario inactivo'}), 401
+        
+        return jsonify({'access_token': crear_access_token(usuario)}), 200
+        
+    except Exception as e:
+        return jsonify({'message': f'Error renovando token: {str(e)}'}), 500
+
 @auth_bp.route('/register', methods=['POST'])
 def register():
     try:
@@ -1,11 +1,17 @@
 from flask import Blueprint, request, jsonify
 from services.auth_service import token_required, role_required
+from services.etag_service import condicional
+from services.serializer_service import candidato_eager_options
+from services.search_service import aplicar_busqueda
+from services.talento_service import buscar_talento
+from utils.pagination import paginate_query, CursorInvalido
 from models import Candidato, db
 
 candidato_bp = Blueprint('candidato', __name__)
 
 @candidato_bp.route('', methods=['GET'])
 @token_required
+@condicional('candidato', 'candidatos_posiciones', 'vacante', 'usuario')
 def get_candidatos(current_user):
     try:
         page = request.args.get('page', 1, type=int)
@@ -19,33 +25,84 @@ def get_candidatos(current_user):
         if estado:
             query = query.filter_by(estado=estado)
         
-        # Búsqueda por nombre o email (considerando que email puede ser None)
+        # Búsqueda por nombre (texto completo) o email (considerando que email puede ser None)
         if search:
-            search_filter = Candidato.nombre.contains(search)
-            if search.count('@') > 0:  # Si parece un email
-                search_filter = search_filter | (Candidato.email.contains(search))
-            query = query.filter(search_filter)
+            if search.count('@') > 0:  # Si parece un email: prefijo, usa el índice único de email
+                query = query.filter(
+                    Candidato.email.startswith(search) | Candidato.nombre.contains(search)
+                )
+            else:
+                query = aplicar_busqueda(query, 'candidato', search, ordenar='cursor' not in request.args)
         
         # Filtrar según rol del usuario
         if current_user.rol == 'reclutador':
-            query = query.filter_by(reclutador_id=current_user.id)
+            query = query.filter(Candidato.reclutador_id == current_user.id)
         
-        candidatos = query.order_by(Candidato.fecha_creacion.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
+        candidatos, paginacion = paginate_query(
+            query.options(*candidato_eager_options()), Candidato.fecha_creacion, Candidato.id, page, per_page
         )
         
         return jsonify({
-            'candidatos': [candidato.to_dict() for candidato in candidatos.items],
-            'total': candidatos.total,
-            'pages': candidatos.pages,
-            'current_page': page
+            'candidatos': [candidato.to_dict() for candidato in candidatos],
+            **paginacion
         }), 200
         
+    except CursorInvalido as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         return jsonify({'message': f'Error obteniendo candidatos: {str(e)}'}), 500
 
+@candidato_bp.route('/talent-search', methods=['GET'])
+@token_required
+def talent_search(current_user):
+    """
+    Búsqueda por el contenido de los CV, comentarios generales, ubicación y
+    nivel de inglés, ordenada por relevancia (BM25). Acepta estado y page/per_page.
+    """
+    try:
+        q = request.args.get('q', '').strip()
+        estado = request.args.get('estado')
+        page = max(request.args.get('page', 1, type=int), 1)
+        per_page = min(max(request.args.get('per_page', 20, type=int), 1), 100)
+        
+        if not q:
+            return jsonify({'message': 'q es requerido'}), 400
+        
+        # Filtrar según rol del usuario
+        reclutador_id = current_user.id if current_user.rol == 'reclutador' else None
+        resultados, terminos = buscar_talento(q, reclutador_id=reclutador_id, estado=estado)
+        
+        pagina = resultados[(page - 1) * per_page:page * per_page]
+        candidatos = {
+            candidato.id: candidato for candidato in Candidato.query.options(*candidato_eager_options()).filter(
+                Candidato.id.in_([candidato_id for candidato_id, _, _ in pagina])
+            )
+        } if pagina else {}
+        
+        items = []
+        for candidato_id, puntuacion, coincidencias in pagina:
+            candidato = candidatos.get(candidato_id)
+            if candidato is None:
+                continue  # Eliminado; sale del índice con el siguiente trabajo de indexación
+            item = candidato.to_dict()
+            item['puntuacion'] = round(puntuacion, 4)
+            item['terminos_coincidentes'] = coincidencias
+            items.append(item)
+        
+        return jsonify({
+            'candidatos': items,
+            'terminos': terminos,
+            'total': len(resultados),
+            'pages': (len(resultados) + per_page - 1) // per_page,
+            'current_page': page
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'message': f'Error en la búsqueda de talento: {str(e)}'}), 500
+
 @candidato_bp.route('/<int:candidato_id>', methods=['GET'])
 @token_required
+@condicional('candidato', 'candidatos_posiciones', 'vacante', 'usuario', 'documento', 'entrevista')
 def get_candidato(current_user, candidato_id):
     try:
         candidato = Candidato.query.get_or_404(candidato_id)
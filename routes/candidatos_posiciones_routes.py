@@ -1,6 +1,12 @@
 from flask import Blueprint, request, jsonify
 from services.auth_service import token_required, role_required
+from services.serializer_service import (
+    candidato_posicion_eager_options, load_candidatos_posiciones,
+    get_vacante_con_relaciones
+)
+from utils.pagination import paginate_query, CursorInvalido
 from models import CandidatosPositions, Candidato, Vacante, db
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime
 
 candidatos_posiciones_bp = Blueprint('candidatos_posiciones', __name__)
@@ -32,22 +38,23 @@ def get_candidatos_posiciones(current_user):
         if current_user.rol == 'reclutador':
             query = query.join(Candidato).filter(Candidato.reclutador_id == current_user.id)
         
-        asignaciones = query.order_by(CandidatosPositions.fecha_asignacion.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
+        asignaciones, paginacion = paginate_query(
+            query.options(*candidato_posicion_eager_options()),
+            CandidatosPositions.fecha_asignacion, CandidatosPositions.id, page, per_page
         )
         
         result = []
-        for asignacion in asignaciones.items:
+        for asignacion in asignaciones:
             asignacion_dict = asignacion.to_dict()
             result.append(asignacion_dict)
         
         return jsonify({
             'asignaciones': result,
-            'total': asignaciones.total,
-            'pages': asignaciones.pages,
-            'current_page': page
+            **paginacion
         }), 200
         
+    except CursorInvalido as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         return jsonify({'message': f'Error obteniendo asignaciones: {str(e)}'}), 500
 
@@ -76,7 +83,7 @@ def create_candidato_posicion(current_user):
             candidato.reclutador_id != current_user.id):
             return jsonify({'message': 'Sin permisos para asignar este candidato'}), 403
         
-        # Verificar que no existe ya la asignación
+        # Verificar que no existe ya la asignación (búsqueda por el índice único uq_candidato_vacante)
         existing = CandidatosPositions.query.filter_by(
             candidato_id=data['candidato_id'],
             vacante_id=data['vacante_id']
@@ -106,6 +113,10 @@ def create_candidato_posicion(current_user):
             'asignacion': nueva_asignacion.to_dict()
         }), 201
         
+    except IntegrityError:
+        # Otra petición creó la misma asignación entre la verificación y el INSERT
+        db.session.rollback()
+        return jsonify({'message': 'El candidato ya está asignado a esta vacante'}), 400
     except Exception as e:
         db.session.rollback()
         return jsonify({'message': f'Error creando asignación: {str(e)}'}), 500
@@ -266,14 +277,16 @@ def finalizar_proceso_candidato(current_user, asignacion_id):
 def get_candidatos_por_vacante(current_user, vacante_id):
     """Obtener todos los candidatos de una vacante específica con su estado"""
     try:
-        vacante = Vacante.query.get_or_404(vacante_id)
+        vacante = get_vacante_con_relaciones(vacante_id)
+        if not vacante:
+            return jsonify({'message': 'Vacante no encontrada'}), 404
         
         # Verificar permisos
         if (current_user.rol == 'reclutador' and 
             vacante.reclutador_id != current_user.id):
             return jsonify({'message': 'Sin permisos para ver candidatos de esta vacante'}), 403
         
-        asignaciones = CandidatosPositions.query.filter_by(vacante_id=vacante_id).all()
+        asignaciones = load_candidatos_posiciones(vacante_id)
         
         candidatos_detalle = []
         for asignacion in asignaciones:
@@ -1,5 +1,10 @@
 from flask import Blueprint, request, jsonify
 from services.auth_service import token_required, role_required
+from services.etag_service import condicional
+from services.serializer_service import cliente_eager_options
+from services.search_service import aplicar_busqueda
+from services.cliente_indice_service import indice_clientes
+from utils.pagination import paginate_query, CursorInvalido
 from models import Cliente, db
 from datetime import datetime
 
@@ -7,6 +12,7 @@ cliente_bp = Blueprint('cliente', __name__)
 
 @cliente_bp.route('', methods=['GET'])
 @role_required('ejecutivo', 'administrador')
+@condicional('cliente', 'vacante')
 def get_clientes(current_user):
     try:
         page = request.args.get('page', 1, type=int)
@@ -17,43 +23,30 @@ def get_clientes(current_user):
         
         # Filtrar por búsqueda si se proporciona
         if search:
-            query = query.filter(
-                db.or_(
-                    Cliente.nombre.contains(search),
-                    Cliente.ccp.contains(search)
-                )
-            )
-        
-        clientes = query.order_by(Cliente.fecha_creacion.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
+            query = aplicar_busqueda(query, 'cliente', search, ordenar='cursor' not in request.args)
+        
+        clientes, paginacion = paginate_query(
+            query.options(*cliente_eager_options()), Cliente.fecha_creacion, Cliente.id, page, per_page
         )
         
         return jsonify({
-            'clientes': [cliente.to_dict() for cliente in clientes.items],
-            'total': clientes.total,
-            'pages': clientes.pages,
-            'current_page': page
+            'clientes': [cliente.to_dict() for cliente in clientes],
+            **paginacion
         }), 200
         
+    except CursorInvalido as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         return jsonify({'message': f'Error obteniendo clientes: {str(e)}'}), 500
 
 @cliente_bp.route('/active', methods=['GET'])
 @token_required
+@condicional('cliente')
 def get_clientes_activos(current_user):
     """Obtener lista simple de clientes activos para selectors"""
     try:
-        clientes = Cliente.query.filter_by(activo=True).order_by(Cliente.nombre).all()
-        
-        return jsonify({
-            'clientes': [
-                {
-                    'id': cliente.id,
-                    'nombre': cliente.nombre,
-                    'ccp': cliente.ccp
-                } for cliente in clientes
-            ]
-        }), 200
+        # Desde el índice en memoria; se recarga cuando cambia la versión de clientes
+        return jsonify({'clientes': indice_clientes.activos()}), 200
         
     except Exception as e:
         return jsonify({'message': f'Error obteniendo clientes activos: {str(e)}'}), 500
@@ -68,21 +61,14 @@ def search_clientes(current_user):
         if not q:
             return jsonify({'clientes': []}), 200
         
-        clientes = Cliente.query.filter(
-            Cliente.activo == True,
-            db.or_(
-                Cliente.nombre.contains(q),
-                Cliente.ccp.contains(q)
-            )
-        ).limit(10).all()
+        # Índice en memoria del worker, ordenado por relevancia
+        clientes = indice_clientes.buscar(q, limite=10)
         
         return jsonify({
             'clientes': [
                 {
-                    'id': cliente.id,
-                    'nombre': cliente.nombre,
-                    'ccp': cliente.ccp,
-                    'display': f"{cliente.nombre} ({cliente.ccp})"
+                    **cliente,
+                    'display': f"{cliente['nombre']} ({cliente['ccp']})"
                 } for cliente in clientes
             ]
         }), 200
@@ -92,6 +78,7 @@ def search_clientes(current_user):
 
 @cliente_bp.route('/<int:cliente_id>', methods=['GET'])
 @role_required('ejecutivo', 'administrador')
+@condicional('cliente', 'vacante', 'candidatos_posiciones', 'vacante_contadores', 'usuario')
 def get_cliente(current_user, cliente_id):
     try:
         cliente = Cliente.query.get_or_404(cliente_id)
@@ -107,7 +94,7 @@ def get_cliente(current_user, cliente_id):
                 'estado': vacante.estado,
                 'fecha_creacion': vacante.fecha_creacion.isoformat() if vacante.fecha_creacion else None,
                 'ejecutivo': vacante.ejecutivo.nombre if vacante.ejecutivo else None,
-                'total_candidatos': len(vacante.candidatos_posiciones)
+                'total_candidatos': vacante.get_contadores()['total_candidatos']
             } for vacante in cliente.vacantes
         ]
         
@@ -1,12 +1,28 @@
-from flask import Blueprint, request, jsonify
+import mimetypes
+import os
+from flask import Blueprint, request, jsonify, current_app, send_file, abort
+from werkzeug.exceptions import RequestEntityTooLarge
 from werkzeug.utils import secure_filename
 from services.auth_service import token_required
-from services.s3_service import S3Service
-from models import Documento, Candidato, db
-from utils.file_utils import validate_file_upload
+from services.almacenamiento_service import obtener_almacenamiento, LocalStorageService
+from services.documento_blob_service import subir_deduplicado, registrar_subida, liberar_documento
+from services.documento_lote_service import subir_lote, LoteInvalido
+from services.cv_texto_service import encolar_extraccion
+from models import Documento, DocumentoTexto, Candidato, db
+from utils.file_utils import validate_file_upload, allowed_file
 
 documento_bp = Blueprint('documento', __name__)
 
+# Máximo de documentos por petición en /download-urls
+MAX_DOCUMENTOS_URLS = 200
+
+# Tipos de los archivos permitidos (ALLOWED_EXTENSIONS) que /archivo conserva; el resto,
+# p. ej. text/html o image/svg+xml declarados al subir, se descarga como octet-stream
+TIPOS_DESCARGA = frozenset({
+    'application/pdf', 'application/msword', 'text/plain', 'image/jpeg', 'image/png',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+})
+
 @documento_bp.route('/upload', methods=['POST'])
 @token_required
 def upload_documento(current_user):
@@ -37,13 +53,14 @@ def upload_documento(current_user):
         if not validation['valid']:
             return jsonify({'message': validation['error']}), 400
         
-        # Subir a S3
-        s3_service = S3Service()
-        upload_result = s3_service.upload_file(
+        # Subir al almacenamiento (si el mismo contenido ya está se reutiliza sin subirlo)
+        almacenamiento = obtener_almacenamiento()
+        upload_result = subir_deduplicado(
+            almacenamiento,
             file_obj=file,
             file_name=secure_filename(file.filename),
             content_type=file.content_type,
-            folder=f'candidatos/{candidato_id}'
+            tamano=validation['size']
         )
         
         if not upload_result['success']:
@@ -57,26 +74,299 @@ def upload_documento(current_user):
             tipo=tipo,
             candidato_id=candidato_id,
             tamaño_bytes=validation['size'],
-            content_type=file.content_type
+            content_type=file.content_type,
+            sha256=upload_result['sha256']
         )
         
         db.session.add(nuevo_documento)
         
-        # Si es un CV, actualizar el candidato
+        # Si es un CV, actualizar el candidato y extraer su texto en segundo plano
         if tipo == 'cv':
             candidato.cv_url = upload_result['url']
+            db.session.flush()
+            encolar_extraccion([nuevo_documento.id], usuario_id=current_user.id)
         
         db.session.commit()
         
         return jsonify({
             'message': 'Archivo subido exitosamente',
-            'documento': nuevo_documento.to_dict()
+            'documento': nuevo_documento.to_dict(),
+            'contenido_reutilizado': upload_result['reutilizado']
         }), 201
         
     except Exception as e:
         db.session.rollback()
         return jsonify({'message': f'Error subiendo archivo: {str(e)}'}), 500
 
+@documento_bp.route('/upload/stream', methods=['POST'])
+@token_required
+def upload_documento_stream(current_user):
+    """
+    Subida en streaming: el cuerpo de la petición es el archivo (sin multipart/form-data)
+    y los datos van en la query string: candidato_id, tipo y nombre. El cuerpo se lee
+    una sola vez, en bloques, directo al almacenamiento.
+    """
+    try:
+        candidato_id = request.args.get('candidato_id', type=int)
+        tipo = request.args.get('tipo', 'otro')
+        nombre = request.args.get('nombre', '')
+        content_type = request.mimetype or 'application/octet-stream'
+        max_bytes = current_app.config['MAX_CONTENT_LENGTH']
+        
+        if not candidato_id:
+            return jsonify({'message': 'candidato_id es requerido'}), 400
+        if not nombre:
+            return jsonify({'message': 'nombre es requerido'}), 400
+        if not allowed_file(nombre):
+            return jsonify({'message': 'Tipo de archivo no permitido'}), 400
+        if tipo not in Documento.tipo.type.enums:
+            return jsonify({'message': f'tipo debe ser uno de: {", ".join(Documento.tipo.type.enums)}'}), 400
+        
+        # Rechazar antes de leer el cuerpo si el tamaño declarado ya excede el límite
+        if request.content_length is not None and request.content_length > max_bytes:
+            return jsonify({'message': 'El archivo es demasiado grande'}), 413
+        
+        # Verificar que el candidato existe
+        candidato = db.session.get(Candidato, candidato_id)
+        if not candidato:
+            return jsonify({'message': 'Candidato no encontrado'}), 404
+        
+        # Verificar permisos
+        if (current_user.rol == 'reclutador' and 
+            candidato.reclutador_id != current_user.id):
+            return jsonify({'message': 'Sin permisos para subir archivos a este candidato'}), 403
+        
+        # Subir al almacenamiento (el límite también se aplica mientras se lee, p. ej. con chunked encoding)
+        almacenamiento = obtener_almacenamiento()
+        upload_result = almacenamiento.upload_stream(
+            stream=request.stream,
+            file_name=secure_filename(nombre),
+            content_type=content_type,
+            folder=f'candidatos/{candidato_id}',
+            max_bytes=max_bytes
+        )
+        
+        if not upload_result['success']:
+            return jsonify({'message': upload_result['error']}), upload_result.get('status', 500)
+        
+        if upload_result['size'] == 0:
+            almacenamiento.delete_file(upload_result['key'])
+            return jsonify({'message': 'El archivo está vacío'}), 400
+        
+        # Si el contenido ya estaba almacenado se borra la copia recién subida
+        upload_result = registrar_subida(almacenamiento, upload_result)
+        
+        # Guardar en base de datos
+        nuevo_documento = Documento(
+            nombre_original=nombre,
+            url_s3=upload_result['url'],
+            key_s3=upload_result['key'],
+            tipo=tipo,
+            candidato_id=candidato_id,
+            tamaño_bytes=upload_result['size'],
+            content_type=content_type,
+            sha256=upload_result['sha256']
+        )
+        
+        db.session.add(nuevo_documento)
+        
+        # Si es un CV, actualizar el candidato y extraer su texto en segundo plano
+        if tipo == 'cv':
+            candidato.cv_url = upload_result['url']
+            db.session.flush()
+            encolar_extraccion([nuevo_documento.id], usuario_id=current_user.id)
+        
+        db.session.commit()
+        
+        return jsonify({
+            'message': 'Archivo subido exitosamente',
+            'documento': nuevo_documento.to_dict(),
+            'contenido_reutilizado': upload_result['reutilizado']
+        }), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'message': f'Error subiendo archivo: {str(e)}'}), 500
+
+def _valor_por_archivo(valores, indice, total, campo, defecto):
+    """Un valor para todos los archivos o uno por archivo"""
+    if not valores:
+        return defecto
+    if len(valores) == 1:
+        return valores[0]
+    if len(valores) == total:
+        return valores[indice]
+    raise LoteInvalido(f'{campo} debe enviarse una vez o una vez por archivo')
+
+def _max_bytes_lote():
+    config = current_app.config
+    return config.get('DOCUMENTOS_LOTE_MAX', 50) * config['MAX_CONTENT_LENGTH']
+
+@documento_bp.route('/upload/lote', methods=['POST'])
+@token_required
+def upload_documentos_lote(current_user):
+    """
+    Varios archivos en una petición multipart/form-data: `files` repetido y
+    `candidato_id` / `tipo` una vez para todos o una vez por archivo, en el
+    mismo orden. Retorna un resultado por archivo (201 si todos se subieron,
+    207 si solo algunos, 400 si ninguno).
+    """
+    keys_subidos = []
+    almacenamiento = None
+    try:
+        # Límite propio antes de leer el cuerpo: MAX_CONTENT_LENGTH se aplica a cada archivo (subir_lote)
+        request.max_content_length = _max_bytes_lote()
+
+        files = request.files.getlist('files')
+        candidato_ids = request.form.getlist('candidato_id')
+        tipos = request.form.getlist('tipo')
+        
+        archivos = []
+        for indice, file in enumerate(files):
+            candidato_id = _valor_por_archivo(candidato_ids, indice, len(files), 'candidato_id', '')
+            archivos.append((
+                file,
+                int(candidato_id) if candidato_id.isdigit() else None,
+                _valor_por_archivo(tipos, indice, len(files), 'tipo', 'otro')
+            ))
+        
+        almacenamiento = obtener_almacenamiento()
+        resultados = subir_lote(almacenamiento, current_user, archivos, keys_subidos)
+        encolar_extraccion([
+            resultado['documento']['id'] for resultado in resultados
+            if resultado['success'] and resultado['documento']['tipo'] == 'cv'
+        ], usuario_id=current_user.id)
+        db.session.commit()
+        
+        exitosos = sum(1 for resultado in resultados if resultado['success'])
+        if exitosos == len(resultados):
+            status = 201
+        else:
+            status = 207 if exitosos else 400
+        
+        return jsonify({
+            'message': f'{exitosos} de {len(resultados)} archivos subidos',
+            'resultados': resultados
+        }), status
+        
+    except LoteInvalido as e:
+        return jsonify({'message': str(e)}), 400
+    except RequestEntityTooLarge:
+        return jsonify({'message': f'La petición supera el máximo de {_max_bytes_lote() // (1024 * 1024)} MB'}), 413
+    except Exception as e:
+        db.session.rollback()
+        # Objetos subidos en esta petición que ya no referencia ningún documento
+        for key in keys_subidos:
+            almacenamiento.delete_file(key)
+        return jsonify({'message': f'Error subiendo archivos: {str(e)}'}), 500
+
+@documento_bp.route('/download-urls', methods=['GET'])
+@token_required
+def get_download_urls(current_user):
+    """
+    URLs de descarga de varios documentos en una respuesta: todos los de un
+    candidato (?candidato_id=) o una lista de ids (?ids=1,2,3). Los permisos se
+    resuelven en la misma consulta que carga los documentos.
+    """
+    try:
+        candidato_id = request.args.get('candidato_id', type=int)
+        ids_param = request.args.get('ids', '')
+        
+        query = db.session.query(Documento, Candidato.reclutador_id).join(
+            Candidato, Documento.candidato_id == Candidato.id
+        )
+        if candidato_id:
+            query = query.filter(Documento.candidato_id == candidato_id)
+            ids = None
+        elif ids_param:
+            try:
+                ids = list(dict.fromkeys(int(documento_id) for documento_id in ids_param.split(',') if documento_id.strip()))
+            except ValueError:
+                return jsonify({'message': 'ids debe ser una lista de enteros separados por comas'}), 400
+            if len(ids) > MAX_DOCUMENTOS_URLS:
+                return jsonify({'message': f'Máximo {MAX_DOCUMENTOS_URLS} documentos por petición'}), 400
+            query = query.filter(Documento.id.in_(ids))
+        else:
+            return jsonify({'message': 'Se requiere candidato_id o ids'}), 400
+        
+        filas = query.order_by(Documento.id).all()
+        
+        if candidato_id and not filas and not db.session.get(Candidato, candidato_id):
+            return jsonify({'message': 'Candidato no encontrado'}), 404
+        
+        almacenamiento = obtener_almacenamiento()
+        documentos = []
+        sin_permisos = []
+        for documento, reclutador_id in filas:
+            # Verificar permisos
+            if current_user.rol == 'reclutador' and reclutador_id != current_user.id:
+                sin_permisos.append(documento.id)
+                continue
+            
+            url_result = almacenamiento.generate_presigned_url(documento.key_s3, content_type=documento.content_type)
+            if not url_result['success']:
+                return jsonify({'message': url_result['error']}), 500
+            
+            documento_dict = documento.to_dict()
+            documento_dict['download_url'] = url_result['url']
+            documentos.append(documento_dict)
+        
+        if candidato_id and sin_permisos:
+            return jsonify({'message': 'Sin permisos para ver los documentos de este candidato'}), 403
+        
+        respuesta = {'documentos': documentos}
+        if ids is not None:
+            encontrados = {documento.id for documento, _ in filas}
+            respuesta['no_encontrados'] = [documento_id for documento_id in ids if documento_id not in encontrados]
+            respuesta['sin_permisos'] = sin_permisos
+        
+        return jsonify(respuesta), 200
+        
+    except Exception as e:
+        return jsonify({'message': f'Error obteniendo documentos: {str(e)}'}), 500
+
+@documento_bp.route('/archivo/<path:key>', methods=['GET'])
+def descargar_archivo(key):
+    """
+    Descarga con almacenamiento local a partir de la URL firmada de
+    generate_presigned_url (sin JWT, como una URL prefirmada de S3). send_file
+    usa sendfile(2) cuando el servidor WSGI lo soporta (o X-Sendfile con
+    USE_X_SENDFILE) y responde Range y If-None-Match / ETag. Siempre como
+    adjunto: el tipo lo declaró quien subió el archivo y la respuesta sale
+    del origen de la API.
+    """
+    if current_app.config.get('STORAGE_BACKEND', 's3') != 'local':
+        abort(404)
+    
+    almacenamiento = LocalStorageService()
+    expira = request.args.get('expira', type=int)
+    content_type = request.args.get('tipo')
+    if expira is None or not almacenamiento.firma_valida(key, expira, content_type, request.args.get('firma')):
+        return jsonify({'message': 'URL inválida o vencida'}), 403
+    
+    ruta = almacenamiento.ruta(key)
+    if ruta is None or not os.path.isfile(ruta):
+        abort(404)
+    
+    nombre = os.path.basename(key)
+    if content_type in TIPOS_DESCARGA:
+        nombre += mimetypes.guess_extension(content_type) or ''
+    else:
+        content_type = 'application/octet-stream'
+    
+    respuesta = send_file(
+        ruta,
+        mimetype=content_type,
+        as_attachment=True,
+        download_name=nombre,
+        conditional=True,
+        etag=True
+    )
+    respuesta.headers['X-Content-Type-Options'] = 'nosniff'
+    # CVs y documentos personales: ni cachés compartidas ni copia en disco del navegador
+    respuesta.headers['Cache-Control'] = 'private, no-store'
+    return respuesta
+
 @documento_bp.route('/<int:documento_id>', methods=['GET'])
 @token_required
 def get_documento(current_user, documento_id):
@@ -89,8 +379,8 @@ def get_documento(current_user, documento_id):
             return jsonify({'message': 'Sin permisos para ver este documento'}), 403
         
         # Generar URL firmada para descarga
-        s3_service = S3Service()
-        url_result = s3_service.generate_presigned_url(documento.key_s3)
+        almacenamiento = obtener_almacenamiento()
+        url_result = almacenamiento.generate_presigned_url(documento.key_s3, content_type=documento.content_type)
         
         if not url_result['success']:
             return jsonify({'message': url_result['error']}), 500
@@ -103,6 +393,27 @@ def get_documento(current_user, documento_id):
     except Exception as e:
         return jsonify({'message': f'Error obteniendo documento: {str(e)}'}), 500
 
+@documento_bp.route('/<int:documento_id>/texto', methods=['GET'])
+@token_required
+def get_documento_texto(current_user, documento_id):
+    """Texto extraído del documento y datos detectados (emails, teléfonos, años de experiencia)"""
+    try:
+        documento = Documento.query.get_or_404(documento_id)
+        
+        # Verificar permisos
+        if (current_user.rol == 'reclutador' and 
+            documento.candidato_rel.reclutador_id != current_user.id):
+            return jsonify({'message': 'Sin permisos para ver este documento'}), 403
+        
+        texto = db.session.get(DocumentoTexto, documento_id)
+        if texto is None:
+            return jsonify({'message': 'El texto del documento todavía no se ha extraído'}), 404
+        
+        return jsonify(texto.to_dict(incluir_texto=True)), 200
+        
+    except Exception as e:
+        return jsonify({'message': f'Error obteniendo texto del documento: {str(e)}'}), 500
+
 @documento_bp.route('/<int:documento_id>', methods=['DELETE'])
 @token_required
 def delete_documento(current_user, documento_id):
@@ -114,14 +425,14 @@ def delete_documento(current_user, documento_id):
             documento.candidato_rel.reclutador_id != current_user.id):
             return jsonify({'message': 'Sin permisos para eliminar este documento'}), 403
         
-        # Eliminar de S3
-        s3_service = S3Service()
-        s3_service.delete_file(documento.key_s3)
-        
-        # Eliminar de base de datos
+        # Eliminar de base de datos; el archivo solo si ningún otro documento lo usa
+        key_eliminar = liberar_documento(documento)
         db.session.delete(documento)
         db.session.commit()
         
+        if key_eliminar:
+            obtener_almacenamiento().delete_file(key_eliminar)
+        
         return jsonify({'message': 'Documento eliminado exitosamente'}), 200
         
     except Exception as e:
@@ -1,5 +1,8 @@
 from flask import Blueprint, request, jsonify
 from services.auth_service import token_required
+from services.etag_service import condicional
+from services.serializer_service import entrevista_eager_options
+from utils.pagination import paginate_query, CursorInvalido
 from models import Entrevista, Candidato, Vacante, db
 from datetime import datetime
 
@@ -27,22 +30,23 @@ def get_entrevistas(current_user):
             # Solo entrevistas de candidatos asignados al reclutador
             query = query.join(Candidato).filter(Candidato.reclutador_id == current_user.id)
         
-        entrevistas = query.order_by(Entrevista.fecha.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
+        entrevistas, paginacion = paginate_query(
+            query.options(*entrevista_eager_options()), Entrevista.fecha, Entrevista.id, page, per_page
         )
         
         return jsonify({
-            'entrevistas': [entrevista.to_dict() for entrevista in entrevistas.items],
-            'total': entrevistas.total,
-            'pages': entrevistas.pages,
-            'current_page': page
+            'entrevistas': [entrevista.to_dict() for entrevista in entrevistas],
+            **paginacion
         }), 200
         
+    except CursorInvalido as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         return jsonify({'message': f'Error obteniendo entrevistas: {str(e)}'}), 500
 
 @entrevista_bp.route('/<int:entrevista_id>', methods=['GET'])
 @token_required
+@condicional('entrevista', 'candidato', 'vacante', 'usuario')
 def get_entrevista(current_user, entrevista_id):
     try:
         entrevista = Entrevista.query.get_or_404(entrevista_id)
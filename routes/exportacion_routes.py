@@ -0,0 +1,81 @@
+import json
+from datetime import datetime
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from services.auth_service import token_required
+from services.almacenamiento_service import obtener_almacenamiento
+from services.dashboard_service import alcance_usuario
+from services.exportacion_service import ENTIDADES, FORMATOS, FiltroInvalido, consulta_exportacion, generar
+from services.tracker_service import TIPO_TRABAJO, CONTENT_TYPE, version_tracker, parametros_tracker, buscar_trabajo
+from services.trabajo_service import encolar
+from routes.trabajo_routes import respuesta_encolado
+from extensions import db
+
+exportacion_bp = Blueprint('exportacion', __name__)
+
+@exportacion_bp.route('/tracker', methods=['GET'])
+@token_required
+def exportar_tracker(current_user):
+    """
+    Tracker de vacantes en XLSX (vacantes, por reclutador y por cliente) del
+    alcance del usuario. Si ya existe para la versión actual de los datos
+    responde 200 con `download_url`; si no, encola el trabajo
+    'exportar_tracker' (o devuelve el que ya lo está generando) y responde 202.
+    """
+    try:
+        alcance = alcance_usuario(current_user)
+        version = version_tracker(alcance)
+        parametros = parametros_tracker(alcance, version)
+
+        trabajo = buscar_trabajo(parametros)
+        if trabajo is not None and trabajo.estado == 'completado':
+            resultado = json.loads(trabajo.resultado)
+            url_result = obtener_almacenamiento().generate_presigned_url(resultado['key'], content_type=CONTENT_TYPE)
+            if not url_result['success']:
+                return jsonify({'message': url_result['error']}), 500
+            return jsonify({
+                'download_url': url_result['url'],
+                'version': version,
+                'filas': resultado['filas'],
+                'fecha_generacion': trabajo.fecha_fin.isoformat() if trabajo.fecha_fin else None,
+                'trabajo_id': trabajo.id
+            }), 200
+
+        if trabajo is None:
+            trabajo = encolar(TIPO_TRABAJO, parametros, usuario_id=current_user.id)
+            db.session.commit()
+
+        return respuesta_encolado(trabajo, 'Tracker en generación')
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'message': f'Error exportando tracker: {str(e)}'}), 500
+
+@exportacion_bp.route('/<entidad>', methods=['GET'])
+@token_required
+def exportar(current_user, entidad):
+    """
+    Todas las filas de la entidad (vacantes, candidatos, candidatos-posiciones,
+    entrevistas) como CSV o NDJSON (`formato`), en streaming. Acepta los mismos
+    filtros que el listado de la entidad y aplica el mismo alcance por rol.
+    """
+    try:
+        if entidad not in ENTIDADES:
+            return jsonify({'message': f'entidad debe ser una de: {", ".join(ENTIDADES)}'}), 404
+
+        formato = request.args.get('formato', 'csv')
+        if formato not in FORMATOS:
+            return jsonify({'message': f'formato debe ser uno de: {", ".join(FORMATOS)}'}), 400
+
+        query = consulta_exportacion(entidad, current_user, request.args)
+
+        respuesta = Response(stream_with_context(generar(entidad, query, formato)), content_type=FORMATOS[formato])
+        nombre = f'{entidad}-{datetime.utcnow():%Y%m%d-%H%M}.{formato}'
+        respuesta.headers['Content-Disposition'] = f'attachment; filename="{nombre}"'
+        # Que nginx envíe cada bloque en cuanto se genera en lugar de acumular la respuesta
+        respuesta.headers['X-Accel-Buffering'] = 'no'
+        return respuesta
+
+    except FiltroInvalido as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'message': f'Error exportando {entidad}: {str(e)}'}), 500
@@ -0,0 +1,83 @@
+import os
+from flask import Blueprint, request, jsonify, current_app
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.utils import secure_filename
+from services.auth_service import token_required
+from services.almacenamiento_service import obtener_almacenamiento
+from services.importacion_service import ROLES, EXTENSIONES
+from services.trabajo_service import encolar
+from routes.trabajo_routes import respuesta_encolado
+from extensions import db
+
+importacion_bp = Blueprint('importacion', __name__)
+
+@importacion_bp.route('/<entidad>', methods=['POST'])
+@token_required
+def importar(current_user, entidad):
+    """
+    Importa vacantes o candidatos desde un CSV o XLSX (campo `file` de
+    multipart/form-data, o el cuerpo de la petición con `nombre` en la query
+    string). Guarda el archivo y responde 202 con el trabajo 'importar_datos';
+    su resultado trae los totales y los errores por fila. Para CSV que no estén
+    en UTF-8 se indica `codificacion` (p. ej. latin-1).
+    """
+    try:
+        if entidad not in ROLES:
+            return jsonify({'message': f'entidad debe ser una de: {", ".join(ROLES)}'}), 404
+        if current_user.rol not in ROLES[entidad]:
+            return jsonify({'message': 'Sin permisos para importar ' + entidad}), 403
+
+        # Límite propio antes de leer el cuerpo: los archivos a importar superan MAX_CONTENT_LENGTH
+        max_bytes = current_app.config['IMPORTACION_MAX_BYTES']
+        request.max_content_length = max_bytes
+
+        archivo = request.files.get('file')
+        if archivo is not None:
+            nombre = archivo.filename or ''
+            stream = archivo.stream
+            content_type = archivo.content_type
+        else:
+            nombre = request.args.get('nombre', '')
+            stream = request.stream
+            content_type = request.mimetype or 'application/octet-stream'
+
+        if not nombre:
+            return jsonify({'message': 'No se encontró archivo'}), 400
+        if os.path.splitext(nombre)[1].lower() not in EXTENSIONES:
+            return jsonify({'message': f'Formato no soportado; use {" o ".join(EXTENSIONES)}'}), 400
+
+        codificacion = request.args.get('codificacion') or request.form.get('codificacion') or 'utf-8-sig'
+
+        # Se guarda en bloques, sin leerlo completo en memoria; el worker lo lee del almacenamiento
+        almacenamiento = obtener_almacenamiento()
+        upload_result = almacenamiento.upload_stream(
+            stream=stream,
+            file_name=secure_filename(nombre),
+            content_type=content_type,
+            folder='importaciones',
+            max_bytes=max_bytes
+        )
+
+        if not upload_result['success']:
+            return jsonify({'message': upload_result['error']}), upload_result.get('status', 500)
+
+        if upload_result['size'] == 0:
+            almacenamiento.delete_file(upload_result['key'])
+            return jsonify({'message': 'El archivo está vacío'}), 400
+
+        trabajo = encolar('importar_datos', {
+            'entidad': entidad,
+            'key': upload_result['key'],
+            'nombre': nombre,
+            'usuario_id': current_user.id,
+            'codificacion': codificacion
+        }, usuario_id=current_user.id)
+        db.session.commit()
+
+        return respuesta_encolado(trabajo, 'Importación encolada')
+
+    except RequestEntityTooLarge:
+        return jsonify({'message': f'El archivo supera el máximo de {current_app.config["IMPORTACION_MAX_BYTES"] // (1024 * 1024)} MB'}), 413
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'message': f'Error importando {entidad}: {str(e)}'}), 500
@@ -0,0 +1,93 @@
+from flask import Blueprint, request, jsonify
+from services.auth_service import token_required, role_required
+from services.trabajo_service import encolar, cargar_tareas, TipoTrabajoDesconocido
+from extensions import db
+from utils.pagination import paginate_query, CursorInvalido
+from models import Trabajo
+
+trabajo_bp = Blueprint('trabajo', __name__)
+
+# Segundos sugeridos al cliente entre consultas de un trabajo sin terminar
+RETRY_AFTER = 2
+
+def respuesta_encolado(trabajo, mensaje='Trabajo encolado'):
+    """Respuesta 202 de las rutas que delegan su trabajo a la cola"""
+    respuesta = jsonify({
+        'message': mensaje,
+        'trabajo': trabajo.to_dict(),
+        'estado_url': f'/api/trabajos/{trabajo.id}'
+    })
+    respuesta.headers['Location'] = f'/api/trabajos/{trabajo.id}'
+    return respuesta, 202
+
+@trabajo_bp.route('', methods=['GET'])
+@token_required
+def get_trabajos(current_user):
+    try:
+        page = request.args.get('page', 1, type=int)
+        per_page = request.args.get('per_page', 10, type=int)
+        estado = request.args.get('estado')
+        tipo = request.args.get('tipo')
+        
+        query = Trabajo.query
+        # Cada usuario ve sus trabajos; el administrador, todos
+        if current_user.rol != 'administrador':
+            query = query.filter(Trabajo.usuario_id == current_user.id)
+        if estado:
+            query = query.filter(Trabajo.estado == estado)
+        if tipo:
+            query = query.filter(Trabajo.tipo == tipo)
+        
+        trabajos, paginacion = paginate_query(query, Trabajo.id, Trabajo.id, page, per_page)
+        
+        return jsonify({
+            'trabajos': [trabajo.to_dict() for trabajo in trabajos],
+            **paginacion
+        }), 200
+        
+    except CursorInvalido as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'message': f'Error obteniendo trabajos: {str(e)}'}), 500
+
+@trabajo_bp.route('/<int:trabajo_id>', methods=['GET'])
+@token_required
+def get_trabajo(current_user, trabajo_id):
+    try:
+        trabajo = Trabajo.query.get_or_404(trabajo_id)
+        
+        # Verificar permisos
+        if current_user.rol != 'administrador' and trabajo.usuario_id != current_user.id:
+            return jsonify({'message': 'Sin permisos para ver este trabajo'}), 403
+        
+        respuesta = jsonify(trabajo.to_dict())
+        if trabajo.estado in ('pendiente', 'en_proceso'):
+            respuesta.headers['Retry-After'] = str(RETRY_AFTER)
+        return respuesta, 200
+        
+    except Exception as e:
+        return jsonify({'message': f'Error obteniendo trabajo: {str(e)}'}), 500
+
+@trabajo_bp.route('', methods=['POST'])
+@role_required('administrador')
+def create_trabajo(current_user):
+    """Encolar una tarea de mantenimiento (tipos registrados con manual=True)"""
+    try:
+        data = request.get_json() or {}
+        tipo = data.get('tipo')
+        
+        tareas = cargar_tareas()
+        if tipo not in tareas or not tareas[tipo].manual:
+            manuales = sorted(nombre for nombre, tarea in tareas.items() if tarea.manual)
+            return jsonify({'message': f'tipo debe ser uno de: {", ".join(manuales)}'}), 400
+        
+        trabajo = encolar(tipo, data.get('parametros') or {}, usuario_id=current_user.id)
+        db.session.commit()
+        
+        return respuesta_encolado(trabajo)
+        
+    except TipoTrabajoDesconocido as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'message': f'Error encolando trabajo: {str(e)}'}), 500
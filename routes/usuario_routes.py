@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from services.auth_service import token_required, role_required
 from extensions import db
+from utils.pagination import paginate_query, CursorInvalido
 from models import Usuario
 
 usuario_bp = Blueprint('usuario', __name__)
@@ -12,17 +13,18 @@ def get_usuarios(current_user):
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
         
-        usuarios = Usuario.query.filter_by(activo=True).paginate(
-            page=page, per_page=per_page, error_out=False
+        usuarios, paginacion = paginate_query(
+            Usuario.query.filter_by(activo=True), Usuario.id, Usuario.id, page, per_page,
+            descendente=False
         )
         
         return jsonify({
-            'usuarios': [usuario.to_dict() for usuario in usuarios.items],
-            'total': usuarios.total,
-            'pages': usuarios.pages,
-            'current_page': page
+            'usuarios': [usuario.to_dict() for usuario in usuarios],
+            **paginacion
         }), 200
         
+    except CursorInvalido as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         return jsonify({'message': f'Error obteniendo usuarios: {str(e)}'}), 500
 
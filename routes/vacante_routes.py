@@ -1,5 +1,17 @@
 from flask import Blueprint, request, jsonify
 from services.auth_service import token_required, role_required
+from services.etag_service import condicional
+from services.serializer_service import (
+    con_opciones_vacante, serialize_vacantes,
+    get_vacante_con_relaciones, load_candidatos_posiciones
+)
+from services.search_service import aplicar_busqueda
+from services.transicion_service import (
+    transicion_masiva, valores_transicion, normalizar_ids, TransicionInvalida, CAMPOS_TRANSICION
+)
+from services.trabajo_service import encolar
+from routes.trabajo_routes import respuesta_encolado
+from utils.pagination import paginate_query, CursorInvalido
 from models import Vacante, Usuario, db
 from datetime import datetime
 
@@ -7,6 +19,7 @@ vacante_bp = Blueprint('vacante', __name__)
 
 @vacante_bp.route('', methods=['GET'])
 @token_required
+@condicional('vacante', 'candidatos_posiciones', 'vacante_contadores', 'cliente', 'usuario', reloj=True)
 def get_vacantes(current_user):
     try:
         page = request.args.get('page', 1, type=int)
@@ -17,6 +30,9 @@ def get_vacantes(current_user):
         cliente = request.args.get('cliente')  # ⭐ NUEVO - Búsqueda por cliente/CCP
         
         query = Vacante.query
+        # Orden por relevancia solo en paginación por offset; con cursor el
+        # orden debe ser (fecha_creacion, id)
+        por_relevancia = 'cursor' not in request.args
         
         # Filtrar por estado si se proporciona
         if estado:
@@ -28,48 +44,45 @@ def get_vacantes(current_user):
         
         # ⭐ NUEVO - Filtrar por búsqueda en nombre de vacante
         if search:
-            query = query.filter(Vacante.nombre.contains(search))
+            query = aplicar_busqueda(query, 'vacante', search, ordenar=por_relevancia)
         
         # ⭐ NUEVO - Filtrar por cliente o CCP
         if cliente:
             from models import Cliente
-            query = query.join(Cliente).filter(
-                db.or_(
-                    Cliente.nombre.contains(cliente),
-                    Cliente.ccp.contains(cliente)
-                )
-            )
+            query = aplicar_busqueda(query.join(Cliente), 'cliente', cliente, ordenar=por_relevancia)
         
         # Filtrar según rol del usuario
         if current_user.rol == 'reclutador':
-            query = query.filter_by(reclutador_id=current_user.id)
+            query = query.filter(Vacante.reclutador_id == current_user.id)
         elif current_user.rol == 'ejecutivo':
-            query = query.filter_by(ejecutivo_id=current_user.id)
+            query = query.filter(Vacante.ejecutivo_id == current_user.id)
         
-        # Actualizar días transcurridos para todas las vacantes
-        for vacante in query.all():
-            vacante.dias_transcurridos = vacante.calcular_dias_transcurridos()
-        db.session.commit()
+        # dias_transcurridos se calcula al serializar (to_dict); la columna la
+        # persiste el job nocturno `flask actualizar-dias-transcurridos`
         
-        vacantes = query.order_by(Vacante.fecha_creacion.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
+        # Una sola consulta por página: usuarios, cliente y contadores con JOIN
+        vacantes, paginacion = paginate_query(
+            con_opciones_vacante(query), Vacante.fecha_creacion, Vacante.id, page, per_page
         )
         
         return jsonify({
-            'vacantes': [vacante.to_dict() for vacante in vacantes.items],
-            'total': vacantes.total,
-            'pages': vacantes.pages,
-            'current_page': page
+            'vacantes': serialize_vacantes(vacantes),
+            **paginacion
         }), 200
         
+    except CursorInvalido as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         return jsonify({'message': f'Error obteniendo vacantes: {str(e)}'}), 500
 
 @vacante_bp.route('/<int:vacante_id>', methods=['GET'])
 @token_required
+@condicional('vacante', 'candidatos_posiciones', 'vacante_contadores', 'candidato', 'cliente', 'usuario', reloj=True)
 def get_vacante(current_user, vacante_id):
     try:
-        vacante = Vacante.query.get_or_404(vacante_id)
+        vacante = get_vacante_con_relaciones(vacante_id)
+        if not vacante:
+            return jsonify({'message': 'Vacante no encontrada'}), 404
         
         # Verificar permisos
         if (current_user.rol == 'reclutador' and 
@@ -79,10 +92,6 @@ def get_vacante(current_user, vacante_id):
               vacante.ejecutivo_id != current_user.id):
             return jsonify({'message': 'Sin permisos para ver esta vacante'}), 403
         
-        # Actualizar días transcurridos
-        vacante.dias_transcurridos = vacante.calcular_dias_transcurridos()
-        db.session.commit()
-        
         # Incluir información detallada de candidatos
         vacante_dict = vacante.to_dict()
         
@@ -91,19 +100,19 @@ def get_vacante(current_user, vacante_id):
         vacante_dict['en_entrevista_detalle'] = []
         vacante_dict['seleccionados_detalle'] = []
         
-        for cp in vacante.candidatos_posiciones:
+        for cp in load_candidatos_posiciones(vacante_id):
             candidato_info = {
                 'id': cp.candidato.id,
                 'nombre': cp.candidato.nombre,
                 'email': cp.candidato.email,
                 'status': cp.status,
+                'aceptado': cp.aceptado,
+                'contratado_status': cp.contratado_status,
                 'fecha_asignacion': cp.fecha_asignacion.isoformat() if cp.fecha_asignacion else None,
                 'fecha_envio_candidato': cp.fecha_envio_candidato.isoformat() if cp.fecha_envio_candidato else None,
                 'fecha_entrevista_ejecutivo': cp.fecha_entrevista_ejecutivo.isoformat() if cp.fecha_entrevista_ejecutivo else None,
-                'entrevista_definitiva': cp.entrevista_definitiva.isoformat() if cp.entrevista_definitiva else None,
-                'es_seleccionado': cp.es_seleccionado,
-                'es_propuesta': cp.es_propuesta,
-                'nota': cp.nota
+                'fecha_decision_final': cp.fecha_decision_final.isoformat() if cp.fecha_decision_final else None,
+                'nota': cp.nota_reclutador
             }
             
             vacante_dict['candidatos_detalle'].append(candidato_info)
@@ -111,7 +120,7 @@ def get_vacante(current_user, vacante_id):
             if cp.status in ['en_entrevista', 'entrevista_programada']:
                 vacante_dict['en_entrevista_detalle'].append(candidato_info)
             
-            if cp.es_seleccionado:
+            if cp.aceptado:
                 vacante_dict['seleccionados_detalle'].append(candidato_info)
         
         return jsonify(vacante_dict), 200
@@ -282,46 +291,89 @@ def delete_vacante(current_user, vacante_id):
 def enviar_candidatos_rh(current_user, vacante_id):
     """Marcar cuando RH envía candidatos al ejecutivo"""
     try:
-        vacante = Vacante.query.get_or_404(vacante_id)
+        vacante = get_vacante_con_relaciones(vacante_id)
+        if not vacante:
+            return jsonify({'message': 'Vacante no encontrada'}), 404
         
         # Verificar permisos
         if (current_user.rol == 'reclutador' and 
             vacante.reclutador_id != current_user.id):
             return jsonify({'message': 'Sin permisos para esta acción'}), 403
         
-        data = request.get_json()
+        data = request.get_json() or {}
         candidatos_ids = data.get('candidatos_ids', [])
         
-        if not candidatos_ids:
-            return jsonify({'message': 'Se requiere al menos un candidato'}), 400
-        
         # Actualizar fecha de envío en la vacante
         vacante.envio_candidatos_rh = datetime.utcnow()
         vacante.avance = 'Candidatos enviados a RH'
         
-        # Actualizar fecha de envío para cada candidato
-        from models import CandidatosPositions
-        for candidato_id in candidatos_ids:
-            cp = CandidatosPositions.query.filter_by(
-                candidato_id=candidato_id, 
-                vacante_id=vacante_id
-            ).first()
-            
-            if cp:
-                cp.fecha_envio_candidato = datetime.utcnow()
-                cp.status = 'enviado_rh'
+        # Fecha de envío y status de todos los candidatos en un solo UPDATE
+        resultado = transicion_masiva(vacante_id, candidatos_ids, valores_transicion({'status': 'enviado_rh'}))
         
         db.session.commit()
         
         return jsonify({
             'message': 'Candidatos enviados a RH exitosamente',
-            'vacante': vacante.to_dict()
+            'vacante': get_vacante_con_relaciones(vacante_id).to_dict(),
+            **resultado
         }), 200
         
+    except TransicionInvalida as e:
+        db.session.rollback()
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         db.session.rollback()
         return jsonify({'message': f'Error enviando candidatos: {str(e)}'}), 500
 
+@vacante_bp.route('/<int:vacante_id>/candidatos/transicion', methods=['POST'])
+@token_required
+def transicion_candidatos(current_user, vacante_id):
+    """
+    Aplicar el mismo cambio (status, aceptado, contratado_status,
+    comentarios_finales) a varios candidatos de la vacante
+    """
+    try:
+        vacante = Vacante.query.get_or_404(vacante_id)
+        
+        # Verificar permisos
+        if ((current_user.rol == 'reclutador' and vacante.reclutador_id != current_user.id) or
+            (current_user.rol == 'ejecutivo' and vacante.ejecutivo_id != current_user.id)):
+            return jsonify({'message': 'Sin permisos para esta acción'}), 403
+        
+        data = request.get_json() or {}
+        valores = valores_transicion(data)
+        
+        # Listas grandes: procesar en segundo plano y consultar /api/trabajos/<id>
+        if data.get('asincrono'):
+            cambios = {campo: data[campo] for campo in CAMPOS_TRANSICION if campo in data}
+            trabajo = encolar('transicion_candidatos', {
+                'vacante_id': vacante_id,
+                'candidatos_ids': normalizar_ids(data.get('candidatos_ids', [])),
+                'cambios': cambios
+            }, usuario_id=current_user.id)
+            db.session.commit()
+            return respuesta_encolado(trabajo, 'Transición encolada')
+        
+        resultado = transicion_masiva(vacante_id, data.get('candidatos_ids', []), valores)
+        
+        # Verificar si la vacante debe marcarse como cubierta
+        if 'contratado_status' in valores:
+            vacante.actualizar_status_final()
+        
+        db.session.commit()
+        
+        return jsonify({
+            'message': f'{len(resultado["actualizados"])} candidatos actualizados',
+            **resultado
+        }), 200
+        
+    except TransicionInvalida as e:
+        db.session.rollback()
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'message': f'Error actualizando candidatos: {str(e)}'}), 500
+
 @vacante_bp.route('/<int:vacante_id>/programar-entrevista', methods=['POST'])
 @token_required
 def programar_entrevista_ejecutivo(current_user, vacante_id):
@@ -0,0 +1,246 @@
+"""
+Almacenamiento de archivos de documentos.
+
+STORAGE_BACKEND elige la implementación: 's3' (S3Service, por defecto) o
+'local' (LocalStorageService, disco del servidor en STORAGE_LOCAL_DIR). Ambas
+exponen la misma interfaz y retornan los mismos dicts:
+
+    upload_file(file_obj, file_name, content_type, folder, key=None)
+    upload_stream(stream, file_name, content_type, folder, max_bytes=None)
+    delete_file(key)
+    generate_presigned_url(key, expiration=None, content_type=None)
+    abrir(key) -> archivo binario de solo lectura
+    url_objeto(key)
+
+Los keys son rutas relativas ('candidatos/1/<uuid>.pdf', 'blobs/ab/<sha256>-x'),
+así que un documento conserva su key al migrar entre implementaciones
+(flask migrar-almacenamiento).
+"""
+import hashlib
+import hmac
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from contextlib import closing
+from flask import current_app, url_for
+from werkzeug.security import safe_join
+from extensions import db
+from models import Candidato, Documento, DocumentoBlob
+from services.s3_service import S3Service, leer_bloque
+from utils.metrics import metricas
+
+TAMANO_BLOQUE = 1024 * 1024
+
+class _ArchivoDemasiadoGrande(Exception):
+    pass
+
+class LocalStorageService:
+    """Archivos en disco; las descargas las sirve /api/documentos/archivo/<key> con send_file"""
+
+    def __init__(self, raiz=None):
+        self.raiz = os.path.abspath(raiz or current_app.config['STORAGE_LOCAL_DIR'])
+
+    def ruta(self, key):
+        """Ruta absoluta del key dentro de la raíz, o None si intenta salir de ella"""
+        return safe_join(self.raiz, key)
+
+    def _nueva_key(self, file_name, folder):
+        # Generar nombre único para el archivo
+        file_extension = os.path.splitext(file_name)[1]
+        return f"{folder}/{uuid.uuid4()}{file_extension}"
+
+    def url_objeto(self, key):
+        return f"/api/documentos/archivo/{key}"
+
+    def _escribir(self, key, escribir):
+        """Escribe en un temporal del mismo directorio y lo renombra: nunca queda un archivo a medias"""
+        ruta = self.ruta(key)
+        if ruta is None:
+            raise ValueError(f'Key inválido: {key}')
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(ruta), prefix='.subida-')
+        try:
+            with os.fdopen(descriptor, 'wb') as destino:
+                resultado = escribir(destino)
+            os.replace(temporal, ruta)
+            return resultado
+        except BaseException:
+            os.unlink(temporal)
+            raise
+
+    def upload_file(self, file_obj, file_name, content_type, folder='documents', key=None):
+        """
+        Guarda un archivo en disco y retorna la URL y key
+        """
+        try:
+            key = key or self._nueva_key(file_name, folder)
+            self._escribir(key, lambda destino: shutil.copyfileobj(file_obj, destino, TAMANO_BLOQUE))
+            return {
+                'success': True,
+                'url': self.url_objeto(key),
+                'key': key,
+                'message': 'Archivo subido exitosamente'
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'Error guardando archivo: {str(e)}'
+            }
+
+    def upload_stream(self, stream, file_name, content_type, folder='documents', max_bytes=None):
+        """
+        Guarda el stream en disco leyéndolo una sola vez en bloques, calculando
+        tamaño y SHA-256 al vuelo; corta en cuanto se supera max_bytes
+        """
+        key = self._nueva_key(file_name, folder)
+        sha256 = hashlib.sha256()
+
+        def escribir(destino):
+            total = 0
+            for bloque in iter(lambda: leer_bloque(stream, TAMANO_BLOQUE), b''):
+                total += len(bloque)
+                if max_bytes is not None and total > max_bytes:
+                    raise _ArchivoDemasiadoGrande()
+                sha256.update(bloque)
+                destino.write(bloque)
+            return total
+
+        try:
+            total = self._escribir(key, escribir)
+            metricas.incrementar('almacenamiento_local.bytes_subidos', total)
+            return {
+                'success': True,
+                'url': self.url_objeto(key),
+                'key': key,
+                'size': total,
+                'sha256': sha256.hexdigest(),
+                'message': 'Archivo subido exitosamente'
+            }
+        except _ArchivoDemasiadoGrande:
+            return {'success': False, 'status': 413, 'error': 'El archivo es demasiado grande'}
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'Error guardando archivo: {str(e)}'
+            }
+
+    def delete_file(self, key):
+        """
+        Elimina un archivo del disco
+        """
+        ruta = self.ruta(key)
+        try:
+            if ruta is None:
+                raise ValueError(f'Key inválido: {key}')
+            os.remove(ruta)
+            return {'success': True, 'message': 'Archivo eliminado exitosamente'}
+        except FileNotFoundError:
+            return {'success': True, 'message': 'El archivo ya no existía'}
+        except Exception as e:
+            return {'success': False, 'error': f'Error eliminando archivo: {str(e)}'}
+
+    def abrir(self, key):
+        ruta = self.ruta(key)
+        if ruta is None:
+            raise ValueError(f'Key inválido: {key}')
+        return open(ruta, 'rb')
+
+    def firma(self, key, expira, content_type):
+        mensaje = f'{key}\n{expira}\n{content_type or ""}'.encode('utf-8')
+        return hmac.new(current_app.config['SECRET_KEY'].encode('utf-8'), mensaje, hashlib.sha256).hexdigest()
+
+    def firma_valida(self, key, expira, content_type, firma):
+        return expira >= time.time() and hmac.compare_digest(self.firma(key, expira, content_type), firma or '')
+
+    def generate_presigned_url(self, key, expiration=None, content_type=None):
+        """
+        URL firmada (HMAC con SECRET_KEY) hacia /api/documentos/archivo/<key>,
+        equivalente a la URL prefirmada de S3: no requiere JWT y vence
+        """
+        try:
+            expiration = expiration or current_app.config.get('S3_PRESIGN_EXPIRACION', 3600)
+            expira = int(time.time()) + expiration
+            url = url_for(
+                'documento.descargar_archivo', key=key, expira=expira, tipo=content_type or None,
+                firma=self.firma(key, expira, content_type), _external=True
+            )
+            return {'success': True, 'url': url}
+        except Exception as e:
+            return {'success': False, 'error': f'Error generando URL: {str(e)}'}
+
+BACKENDS = {
+    's3': S3Service,
+    'local': LocalStorageService,
+}
+
+def obtener_almacenamiento(nombre=None):
+    """Implementación configurada en STORAGE_BACKEND (o la indicada)"""
+    nombre = nombre or current_app.config.get('STORAGE_BACKEND', 's3')
+    if nombre not in BACKENDS:
+        raise ValueError(f'STORAGE_BACKEND debe ser uno de: {", ".join(BACKENDS)}')
+    return BACKENDS[nombre]()
+
+def migrar_almacenamiento(origen, destino, eliminar_origen=False, lote=100, progreso=None):
+    """
+    Copia al almacenamiento `destino` los archivos de todos los documentos y
+    actualiza sus URLs (documento, documento_blob y candidato.cv_url). Los keys
+    no cambian. Hace commit cada `lote` archivos; los que ya apuntan al destino
+    se omiten, así que puede reanudarse si se interrumpe. Con eliminar_origen
+    borra cada archivo del origen después del commit que lo deja sin uso.
+    Retorna (copiados, errores).
+    """
+    if origen == destino:
+        raise ValueError('El origen y el destino deben ser distintos')
+    almacen_origen = obtener_almacenamiento(origen)
+    almacen_destino = obtener_almacenamiento(destino)
+
+    # key -> (content_type, urls actuales); un key puede tener varios documentos (deduplicación)
+    archivos = {}
+    for key, url, content_type in db.session.query(Documento.key_s3, Documento.url_s3, Documento.content_type):
+        if url != almacen_destino.url_objeto(key):
+            archivos.setdefault(key, (content_type, set()))[1].add(url)
+
+    copiados = 0
+    errores = []
+    pendientes_borrar = []
+    for numero, (key, (content_type, urls)) in enumerate(sorted(archivos.items()), start=1):
+        try:
+            with closing(almacen_origen.abrir(key)) as archivo:
+                resultado = almacen_destino.upload_file(
+                    file_obj=archivo, file_name=key, content_type=content_type or 'application/octet-stream', key=key
+                )
+        except Exception as e:
+            resultado = {'success': False, 'error': str(e)}
+        if not resultado['success']:
+            errores.append((key, resultado['error']))
+            continue
+
+        url_nueva = resultado['url']
+        db.session.query(Documento).filter(Documento.key_s3 == key).update(
+            {Documento.url_s3: url_nueva}, synchronize_session=False
+        )
+        db.session.query(DocumentoBlob).filter(DocumentoBlob.key_s3 == key).update(
+            {DocumentoBlob.url_s3: url_nueva}, synchronize_session=False
+        )
+        db.session.query(Candidato).filter(Candidato.cv_url.in_(urls)).update(
+            {Candidato.cv_url: url_nueva}, synchronize_session=False
+        )
+        copiados += 1
+        pendientes_borrar.append(key)
+
+        if numero % lote == 0:
+            _confirmar_migracion(almacen_origen, pendientes_borrar, eliminar_origen)
+            if progreso:
+                progreso(numero, len(archivos))
+
+    _confirmar_migracion(almacen_origen, pendientes_borrar, eliminar_origen)
+    return copiados, errores
+
+def _confirmar_migracion(almacen_origen, keys, eliminar_origen):
+    db.session.commit()
+    if eliminar_origen:
+        for key in keys:
+            almacen_origen.delete_file(key)
+    keys.clear()
@@ -1,18 +1,33 @@
+from collections import namedtuple
 from functools import wraps
 from flask import jsonify, current_app
-from flask_jwt_extended import jwt_required, get_jwt_identity, create_access_token
+from flask_jwt_extended import (
+    jwt_required, get_jwt_identity, get_jwt, create_access_token, create_refresh_token
+)
 from extensions import db
 
+class UsuarioActual(namedtuple('UsuarioActual', ['id', 'nombre', 'rol', 'activo'])):
+    """Datos del usuario autenticado que reciben las rutas como current_user"""
+    __slots__ = ()
+
 def token_required(f):
     @wraps(f)
     @jwt_required()
     def decorated(*args, **kwargs):
         try:
-            from models import Usuario
-            current_user_id = get_jwt_identity()
-            current_user = Usuario.query.get(int(current_user_id))  # Convertir de vuelta a int
-            if not current_user or not current_user.activo:
+            from services.revocacion_service import revocaciones
+            current_user_id = int(get_jwt_identity())  # Convertir de vuelta a int
+            claims = get_jwt()
+            
+            # Tokens emitidos antes de los claims (sin `ver`, y sin `exp` con el antiguo
+            # JWT_ACCESS_TOKEN_EXPIRES=False) no se pueden revocar: se exige volver a iniciar sesión
+            if 'ver' not in claims or 'exp' not in claims:
+                return jsonify({'message': 'Token inválido o vencido; inicie sesión de nuevo'}), 401
+            
+            # Se autoriza con los claims, sin consultar la base de datos
+            if not revocaciones.token_vigente(current_user_id, claims['ver']):
                 return jsonify({'message': 'Token inválido o usuario inactivo'}), 401
+            current_user = UsuarioActual(current_user_id, claims.get('nombre'), claims.get('rol'), True)
             return f(current_user, *args, **kwargs)
         except Exception as e:
             return jsonify({'message': 'Token inválido'}), 401
@@ -29,16 +44,26 @@ def role_required(*allowed_roles):
         return decorated
     return decorator
 
+def crear_access_token(user):
+    """Access token de corta duración con rol, nombre y versión de la cuenta"""
+    return create_access_token(
+        identity=str(user.id),  # Convertir a string
+        additional_claims={'rol': user.rol, 'nombre': user.nombre, 'ver': user.version_cuenta}
+    )
+
+def crear_refresh_token(user):
+    return create_refresh_token(identity=str(user.id), additional_claims={'ver': user.version_cuenta})
+
 def authenticate_user(email, password):
-    """Autentica un usuario y retorna un token JWT"""
+    """Autentica un usuario y retorna access y refresh token JWT"""
     try:
         from models import Usuario
         user = Usuario.query.filter_by(email=email, activo=True).first()
         if user and user.check_password(password):
-            access_token = create_access_token(identity=str(user.id))  # Convertir a string
             return {
                 'success': True,
-                'access_token': access_token,
+                'access_token': crear_access_token(user),
+                'refresh_token': crear_refresh_token(user),
                 'user': user.to_dict()
             }
         return {'success': False, 'message': 'Credenciales inválidas'}
@@ -0,0 +1,156 @@
+"""
+Índice en memoria de clientes activos para el autocomplete.
+
+Cada worker guarda los clientes activos con un índice de trigramas (términos
+de 3 o más letras) y de prefijos de palabra (1 y 2 letras), sin acentos y en
+minúsculas. El índice se reconstruye cuando cambia la versión 'cliente' de
+version_datos: la consulta de la versión se hace como máximo una vez cada
+CLIENTES_INDICE_INTERVALO segundos, y al instante en el worker que hizo el
+commit.
+"""
+import threading
+import time
+from flask import current_app
+from extensions import db
+from models import Cliente
+from services.search_service import tokenizar
+from services.version_service import obtener_version, suscribir
+from utils.texto_es import plegar
+
+CLAVE_VERSION = 'cliente'
+
+def _trigramas(texto):
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+class _Snapshot:
+    """Clientes activos de una versión y sus índices (inmutable una vez construido)"""
+
+    def __init__(self, origen, version, filas):
+        self.origen = origen
+        self.version = version
+        self.clientes = []    # en orden de nombre, como /active
+        self.textos = []      # 'nombre ccp' normalizado, por posición
+        self.trigramas = {}   # trigrama -> posiciones
+        self.prefijos = {}    # prefijo de palabra (1-2 letras) -> posiciones
+
+        for posicion, (id_, nombre, ccp) in enumerate(filas):
+            nombre_n, ccp_n = plegar(nombre), plegar(ccp)
+            texto = f'{nombre_n} {ccp_n}'
+            self.clientes.append({
+                'id': id_,
+                'nombre': nombre,
+                'ccp': ccp,
+                'nombre_n': nombre_n,
+                'ccp_n': ccp_n,
+                'palabras': tokenizar(texto),
+            })
+            self.textos.append(texto)
+            for trigrama in _trigramas(texto):
+                self.trigramas.setdefault(trigrama, set()).add(posicion)
+            for palabra in self.clientes[-1]['palabras']:
+                for largo in (1, 2):
+                    self.prefijos.setdefault(palabra[:largo], set()).add(posicion)
+
+    def _candidatos(self, token):
+        if len(token) < 3:
+            return self.prefijos.get(token, set())
+
+        conjuntos = sorted((self.trigramas.get(t, set()) for t in _trigramas(token)), key=len)
+        posiciones = set(conjuntos[0])
+        for conjunto in conjuntos[1:]:
+            posiciones &= conjunto
+            if not posiciones:
+                break
+        # Los trigramas pueden coincidir sin que el término sea contiguo
+        return {p for p in posiciones if token in self.textos[p]}
+
+    def buscar(self, q, limite):
+        tokens = tokenizar(q)
+        if not tokens:
+            return []
+
+        posiciones = None
+        for token in sorted(tokens, key=len, reverse=True):
+            encontrados = self._candidatos(token)
+            posiciones = encontrados if posiciones is None else posiciones & encontrados
+            if not posiciones:
+                return []
+
+        termino = ' '.join(tokens)
+        resultados = sorted(
+            (self.clientes[p] for p in posiciones),
+            key=lambda c: (self._rango(c, termino, tokens), c['nombre_n'], c['id'])
+        )
+        return resultados[:limite]
+
+    @staticmethod
+    def _rango(cliente, termino, tokens):
+        """Menor es mejor: CCP exacto, prefijo de CCP, prefijo de nombre, prefijos de palabra, contiene"""
+        if cliente['ccp_n'] == termino:
+            return 0
+        if cliente['ccp_n'].startswith(termino):
+            return 1
+        if cliente['nombre_n'].startswith(termino):
+            return 2
+        if all(any(p.startswith(t) for p in cliente['palabras']) for t in tokens):
+            return 3
+        return 4
+
+class IndiceClientes:
+    """Índice por worker; seguro entre hilos (los snapshots no se modifican)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._verificado = 0.0
+        self._obsoleto = True
+
+    def invalidar(self, claves=None):
+        if claves is None or CLAVE_VERSION in claves:
+            self._obsoleto = True
+
+    def _vigente(self):
+        origen = str(db.engine.url)
+        snapshot = self._snapshot
+        intervalo = current_app.config.get('CLIENTES_INDICE_INTERVALO', 2)
+
+        if (snapshot is not None and snapshot.origen == origen and not self._obsoleto
+                and time.monotonic() - self._verificado < intervalo):
+            return snapshot
+
+        version = obtener_version(CLAVE_VERSION)
+        if snapshot is not None and snapshot.origen == origen and snapshot.version == version:
+            self._obsoleto = False
+            self._verificado = time.monotonic()
+            return snapshot
+
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or snapshot.origen != origen or snapshot.version != version:
+                # La versión se lee antes que las filas: si cambian en medio,
+                # la siguiente verificación vuelve a reconstruir
+                filas = db.session.query(Cliente.id, Cliente.nombre, Cliente.ccp).filter(
+                    Cliente.activo == True
+                ).order_by(Cliente.nombre).all()
+                snapshot = _Snapshot(origen, version, filas)
+                self._snapshot = snapshot
+            self._obsoleto = False
+            self._verificado = time.monotonic()
+            return snapshot
+
+    def activos(self):
+        """Clientes activos ordenados por nombre: [{'id', 'nombre', 'ccp'}]"""
+        return [
+            {'id': c['id'], 'nombre': c['nombre'], 'ccp': c['ccp']}
+            for c in self._vigente().clientes
+        ]
+
+    def buscar(self, q, limite=10):
+        """Clientes activos que contienen cada palabra de q (prefijo si tiene menos de 3 letras), por relevancia"""
+        return [
+            {'id': c['id'], 'nombre': c['nombre'], 'ccp': c['ccp']}
+            for c in self._vigente().buscar(q, limite)
+        ]
+
+indice_clientes = IndiceClientes()
+suscribir(indice_clientes.invalidar)
@@ -0,0 +1,245 @@
+"""
+Mantenimiento de la tabla vacante_contadores.
+
+Cada flush que inserta, modifica o elimina CandidatosPositions aplica el delta
+correspondiente sobre vacante_contadores dentro de la misma transacción, así
+que cualquier ruta que use la sesión (CRUD de asignaciones, flujo de la
+vacante, scripts) mantiene los contadores sin código adicional. La fila de
+cada vacante se crea (en cero) en el mismo flush que la inserta, así que las
+asignaciones concurrentes solo la incrementan. Las inserciones de vacantes que
+no pasan por el ORM deben llamar a crear_contadores(), y las actualizaciones
+masivas de asignaciones a reconciliar_contadores() con las vacantes afectadas.
+"""
+from collections import defaultdict
+from datetime import datetime
+from sqlalchemy import event, func, case, inspect
+from sqlalchemy.orm.util import identity_key
+from extensions import db
+from models import Vacante, CandidatosPositions, VacanteContadores
+from services.version_service import incrementar_version
+
+CAMPOS = VacanteContadores.CAMPOS
+
+def _aporte(aceptado, contratado_status):
+    """Contribución de una asignación a cada contador"""
+    contratado_status = contratado_status or 'pendiente'
+    return {
+        'total_candidatos': 1,
+        'candidatos_aceptados': 1 if aceptado else 0,
+        'candidatos_contratados': 1 if contratado_status == 'contratado' else 0,
+        'candidatos_rechazados': 1 if contratado_status == 'rechazado' else 0,
+        'candidatos_no_contratables': 1 if contratado_status == 'no_contratable' else 0
+    }
+
+def _sumar(deltas, vacante_id, aporte, signo):
+    if vacante_id is None:
+        return
+    for campo, valor in aporte.items():
+        deltas[vacante_id][campo] += signo * valor
+
+def _valor_anterior(state, attr):
+    """
+    Valor previo al flush de un atributo. Retorna (True, valor) si se conoce
+    o (False, None) si el atributo no estaba cargado.
+    """
+    history = state.attrs[attr].history
+    if history.deleted:
+        return True, history.deleted[0]
+    if history.unchanged:
+        return True, history.unchanged[0]
+    if history.added:
+        # Valor nuevo sin valor previo cargado
+        return False, None
+    # Atributo no cargado y sin cambios: el valor actual es el previo
+    return True, getattr(state.obj(), attr)
+
+def _recolectar_deltas(session):
+    """
+    Calcula los deltas por vacante a partir de los cambios pendientes.
+    Retorna (deltas, recontar) donde recontar son vacantes cuyo valor
+    previo se desconoce y deben recalcularse desde la tabla intermedia.
+    """
+    deltas = defaultdict(lambda: defaultdict(int))
+    recontar = set()
+
+    for obj in session.new:
+        if isinstance(obj, CandidatosPositions):
+            _sumar(deltas, obj.vacante_id, _aporte(obj.aceptado, obj.contratado_status), 1)
+
+    for obj in session.deleted:
+        if isinstance(obj, CandidatosPositions):
+            state = inspect(obj)
+            conocido_v, vacante_id = _valor_anterior(state, 'vacante_id')
+            conocido_a, aceptado = _valor_anterior(state, 'aceptado')
+            conocido_c, contratado_status = _valor_anterior(state, 'contratado_status')
+            if conocido_v and conocido_a and conocido_c:
+                _sumar(deltas, vacante_id, _aporte(aceptado, contratado_status), -1)
+            else:
+                recontar.add(vacante_id if conocido_v else obj.vacante_id)
+
+    for obj in session.dirty:
+        if not isinstance(obj, CandidatosPositions) or not session.is_modified(obj):
+            continue
+
+        state = inspect(obj)
+        if not any(state.attrs[attr].history.has_changes()
+                   for attr in ('vacante_id', 'aceptado', 'contratado_status')):
+            continue
+
+        conocido_v, vacante_anterior = _valor_anterior(state, 'vacante_id')
+        conocido_a, aceptado_anterior = _valor_anterior(state, 'aceptado')
+        conocido_c, contratado_anterior = _valor_anterior(state, 'contratado_status')
+
+        if conocido_v and conocido_a and conocido_c:
+            _sumar(deltas, vacante_anterior, _aporte(aceptado_anterior, contratado_anterior), -1)
+            _sumar(deltas, obj.vacante_id, _aporte(obj.aceptado, obj.contratado_status), 1)
+        else:
+            recontar.add(obj.vacante_id)
+            if conocido_v:
+                recontar.add(vacante_anterior)
+
+    recontar.discard(None)
+    return deltas, recontar
+
+def _insert_ignorando_existentes(tabla):
+    """INSERT que omite las filas cuya llave ya existe (otra transacción pudo crearlas)"""
+    return tabla.insert().prefix_with('IGNORE', dialect='mysql').prefix_with('OR IGNORE', dialect='sqlite')
+
+def crear_contadores(vacante_ids, connection=None):
+    """Crea en cero las filas que falten de estas vacantes. No hace commit."""
+    if not vacante_ids:
+        return
+    connection = connection or db.session.connection()
+    ahora = datetime.utcnow()
+    connection.execute(_insert_ignorando_existentes(VacanteContadores.__table__), [
+        {'vacante_id': vacante_id, **VacanteContadores.vacios(), 'fecha_actualizacion': ahora}
+        for vacante_id in vacante_ids
+    ])
+
+def _incrementar(connection, vacante_id, delta, ahora):
+    """UPDATE incremental de la fila. Retorna False si la vacante no tiene fila."""
+    tabla = VacanteContadores.__table__
+    valores = {campo: tabla.c[campo] + delta.get(campo, 0) for campo in CAMPOS}
+    valores['fecha_actualizacion'] = ahora
+    result = connection.execute(
+        tabla.update().where(tabla.c.vacante_id == vacante_id).values(**valores)
+    )
+    return result.rowcount > 0
+
+def _aplicar_deltas(connection, deltas, recontar):
+    """Aplica los deltas con UPDATE incremental; sin fila previa, la crea con el agregado"""
+    tabla = VacanteContadores.__table__
+    ahora = datetime.utcnow()
+    columnas = ['vacante_id'] + list(CAMPOS) + ['fecha_actualizacion']
+
+    for vacante_id, delta in deltas.items():
+        if vacante_id in recontar or not any(delta.values()):
+            continue
+        if _incrementar(connection, vacante_id, delta, ahora):
+            continue
+
+        # Vacante sin fila (insertada sin crear_contadores): el agregado ya
+        # incluye lo de este flush. Si otra transacción la crea a la vez, el
+        # INSERT se omite y se aplica el delta sobre la suya.
+        result = connection.execute(
+            _insert_ignorando_existentes(tabla).from_select(columnas, _select_agregado([vacante_id]))
+        )
+        if result.rowcount == 0:
+            _incrementar(connection, vacante_id, delta, ahora)
+
+    if recontar:
+        _recalcular(connection, recontar)
+
+def _select_agregado(vacante_ids=None):
+    """SELECT vacante_id, contadores... agregado desde candidatos_posiciones"""
+    cp = CandidatosPositions
+    query = db.select(
+        Vacante.id,
+        func.count(cp.id),
+        func.coalesce(func.sum(case((cp.aceptado == True, 1), else_=0)), 0),
+        func.coalesce(func.sum(case((cp.contratado_status == 'contratado', 1), else_=0)), 0),
+        func.coalesce(func.sum(case((cp.contratado_status == 'rechazado', 1), else_=0)), 0),
+        func.coalesce(func.sum(case((cp.contratado_status == 'no_contratable', 1), else_=0)), 0),
+        db.literal(datetime.utcnow())
+    ).select_from(Vacante).outerjoin(cp, cp.vacante_id == Vacante.id).group_by(Vacante.id)
+
+    if vacante_ids is not None:
+        query = query.where(Vacante.id.in_(list(vacante_ids)))
+
+    return query
+
+def _recalcular(connection, vacante_ids=None):
+    """Reemplaza las filas de contadores indicadas (o todas) con INSERT ... SELECT"""
+    tabla = VacanteContadores.__table__
+
+    delete = tabla.delete()
+    if vacante_ids is not None:
+        delete = delete.where(tabla.c.vacante_id.in_(list(vacante_ids)))
+    connection.execute(delete)
+
+    columnas = ['vacante_id'] + list(CAMPOS) + ['fecha_actualizacion']
+    result = connection.execute(
+        tabla.insert().from_select(columnas, _select_agregado(vacante_ids))
+    )
+    return result.rowcount
+
+def reconciliar_contadores(vacante_ids=None):
+    """
+    Reconstruye los contadores desde candidatos_posiciones en bloque, para
+    todas las vacantes o solo las indicadas. No hace commit.
+    Retorna el número de filas escritas.
+    """
+    if vacante_ids is not None and not vacante_ids:
+        return 0
+
+    filas = _recalcular(db.session.connection(), vacante_ids)
+    incrementar_version('vacante_contadores')
+    _expirar(db.session, vacante_ids)
+    return filas
+
+def _expirar(session, vacante_ids=None):
+    """Expira los contadores en memoria para que se relean de la base de datos"""
+    for obj in list(session.identity_map.values()):
+        if isinstance(obj, VacanteContadores):
+            if vacante_ids is None or obj.vacante_id in vacante_ids:
+                session.expire(obj)
+        elif isinstance(obj, Vacante):
+            if vacante_ids is None or obj.id in vacante_ids:
+                session.expire(obj, ['contadores'])
+
+def _after_flush(session, flush_context):
+    nuevas = [obj.id for obj in session.new if isinstance(obj, Vacante)]
+    if nuevas:
+        crear_contadores(nuevas, session.connection())
+
+    deltas, recontar = _recolectar_deltas(session)
+    if not deltas and not recontar:
+        return
+
+    # Las vacantes eliminadas en este flush arrastran sus contadores (cascade)
+    eliminadas = {obj.id for obj in session.deleted if isinstance(obj, Vacante)}
+    for vacante_id in eliminadas:
+        deltas.pop(vacante_id, None)
+    recontar -= eliminadas
+
+    _aplicar_deltas(session.connection(), deltas, recontar)
+    session.info.setdefault('contadores_modificados', set()).update(set(deltas) | recontar)
+
+def _after_flush_postexec(session, flush_context):
+    modificados = session.info.pop('contadores_modificados', None)
+    if not modificados:
+        return
+
+    for vacante_id in modificados:
+        contadores = session.identity_map.get(identity_key(VacanteContadores, vacante_id))
+        if contadores is not None:
+            session.expire(contadores)
+        vacante = session.identity_map.get(identity_key(Vacante, vacante_id))
+        if vacante is not None:
+            session.expire(vacante, ['contadores'])
+
+def register_contadores_events():
+    """Registra los listeners de la sesión (idempotente)"""
+    if not event.contains(db.session, 'after_flush', _after_flush):
+        event.listen(db.session, 'after_flush', _after_flush)
+        event.listen(db.session, 'after_flush_postexec', _after_flush_postexec)
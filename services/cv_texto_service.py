@@ -0,0 +1,244 @@
+"""
+Texto de los CV (tabla documento_texto).
+
+Al subir un documento tipo 'cv' se encola el trabajo 'extraer_texto_cv';
+`flask extraer-texto-cv` procesa los documentos que ya existían. Los archivos
+se descargan con hilos y se analizan en un pool de procesos del worker
+(CV_EXTRACCION_PROCESOS), así que el parseo de PDFs no ocupa a los workers
+web ni compite por el GIL con las descargas.
+
+La extracción es idempotente por contenido: se omite el documento cuyo texto
+ya se extrajo del mismo sha256, y si otro documento con el mismo contenido ya
+tiene texto se copia sin descargar ni analizar el archivo.
+"""
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import closing
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import or_
+from sqlalchemy.orm import joinedload
+from extensions import db
+from models import Documento, DocumentoTexto
+from services.almacenamiento_service import obtener_almacenamiento
+from services.trabajo_service import encolar
+from utils.cv_texto import extraer
+from utils.metrics import metricas
+
+CAMPOS = ('estado', 'texto', 'emails', 'telefonos', 'anios_experiencia', 'paginas', 'caracteres', 'error')
+
+# max_tasks_per_child existe desde Python 3.11; antes el pool completo se
+# reemplaza tras procesos * tareas_por_proceso tareas
+_RECICLA_PROCESOS = sys.version_info >= (3, 11)
+
+_lock = threading.Lock()
+_pool = None
+_pool_procesos = None
+_pool_tareas = 0
+# Pool -> extracciones que lo están usando; uno reemplazado se cierra al liberarlo la última
+_en_uso = {}
+
+def _nuevo_pool(procesos, tareas_por_proceso):
+    opciones = {}
+    if _RECICLA_PROCESOS:
+        opciones['max_tasks_per_child'] = tareas_por_proceso or None
+    return ProcessPoolExecutor(
+        max_workers=procesos,
+        mp_context=multiprocessing.get_context('spawn'),
+        **opciones
+    )
+
+def _obtener_pool(procesos, tareas_por_proceso, tareas):
+    """
+    Pool de procesos compartido por el worker para enviar `tareas` archivos;
+    se devuelve con _liberar_pool. Usa 'spawn': el worker tiene hilos (y
+    conexiones abiertas) que no deben copiarse con fork.
+    """
+    global _pool, _pool_procesos, _pool_tareas
+    with _lock:
+        agotado = not _RECICLA_PROCESOS and tareas_por_proceso and _pool_tareas >= procesos * tareas_por_proceso
+        if _pool is None or _pool_procesos != procesos or agotado:
+            if _pool is not None and not _en_uso.get(_pool):
+                _pool.shutdown(wait=False)
+            _pool = _nuevo_pool(procesos, tareas_por_proceso)
+            _pool_procesos = procesos
+            _pool_tareas = 0
+        _pool_tareas += tareas
+        _en_uso[_pool] = _en_uso.get(_pool, 0) + 1
+        return _pool
+
+def _liberar_pool(pool):
+    with _lock:
+        _en_uso[pool] -= 1
+        cerrar = not _en_uso[pool] and pool is not _pool
+        if not _en_uso[pool]:
+            del _en_uso[pool]
+    if cerrar:
+        pool.shutdown(wait=False)
+
+def _descartar_pool(pool):
+    """Un proceso murió (p. ej. sin memoria con un PDF malformado): el pool ya no sirve"""
+    global _pool
+    with _lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+def _descargar(app, almacenamiento, key):
+    with app.app_context():
+        with closing(almacenamiento.abrir(key)) as archivo:
+            return archivo.read()
+
+def _valores(resultado):
+    """Dict de utils.cv_texto.extraer -> valores de las columnas de documento_texto"""
+    valores = {campo: resultado.get(campo) for campo in CAMPOS}
+    valores['emails'] = json.dumps(resultado.get('emails') or [])
+    valores['telefonos'] = json.dumps(resultado.get('telefonos') or [])
+    return valores
+
+def _guardar(documento, sha256, valores):
+    registro = documento.texto
+    if registro is None:
+        registro = DocumentoTexto(documento_id=documento.id)
+        documento.texto = registro
+    registro.sha256 = sha256
+    for campo in CAMPOS:
+        setattr(registro, campo, valores[campo])
+    registro.fecha_extraccion = datetime.utcnow()
+
+def extraer_documentos(documento_ids, reprocesar=False):
+    """
+    Extrae el texto de los documentos indicados y hace commit. Con reprocesar
+    vuelve a analizar aunque ya tengan texto del mismo contenido. Retorna las
+    estadísticas; 'errores' lista los documentos que no pudieron descargarse
+    (quedan sin texto para reintentarlos).
+    """
+    config = current_app.config
+    documentos = Documento.query.options(joinedload(Documento.texto)).filter(
+        Documento.id.in_(documento_ids)
+    ).order_by(Documento.id).all()
+    estadisticas = {'documentos': len(documentos), 'extraidos': 0, 'copiados': 0, 'omitidos': 0, 'bytes': 0, 'errores': []}
+
+    por_revisar = []
+    for documento in documentos:
+        texto = documento.texto
+        if not reprocesar and texto is not None and (documento.sha256 is None or texto.sha256 == documento.sha256):
+            estadisticas['omitidos'] += 1
+        else:
+            por_revisar.append(documento)
+
+    # Contenido que ya se analizó para otro documento
+    existentes = {}
+    hashes = {documento.sha256 for documento in por_revisar if documento.sha256}
+    if hashes and not reprocesar:
+        for texto in DocumentoTexto.query.filter(DocumentoTexto.sha256.in_(hashes)):
+            existentes.setdefault(texto.sha256, {campo: getattr(texto, campo) for campo in CAMPOS})
+
+    # Un archivo por contenido (los documentos sin sha256 van por separado)
+    por_extraer = {}
+    for documento in por_revisar:
+        if documento.sha256 in existentes:
+            _guardar(documento, documento.sha256, existentes[documento.sha256])
+            estadisticas['copiados'] += 1
+        else:
+            por_extraer.setdefault(documento.sha256 or f'documento:{documento.id}', []).append(documento)
+
+    if por_extraer:
+        app = current_app._get_current_object()
+        almacenamiento = obtener_almacenamiento()
+        pool = _obtener_pool(
+            config.get('CV_EXTRACCION_PROCESOS') or os.cpu_count() or 1,
+            config.get('CV_EXTRACCION_TAREAS_POR_PROCESO', 100),
+            len(por_extraer)
+        )
+        max_caracteres = config.get('CV_TEXTO_MAX_CARACTERES', 200000)
+        hilos = min(len(por_extraer), config.get('CV_EXTRACCION_HILOS', 8))
+
+        try:
+            with metricas.medir('cv_texto.extraccion'):
+                # Cada archivo pasa al pool en cuanto termina de descargarse
+                en_proceso = {}
+                with ThreadPoolExecutor(max_workers=hilos, thread_name_prefix='cv-texto') as descargas:
+                    futuros = {
+                        descargas.submit(_descargar, app, almacenamiento, grupo[0].key_s3): clave
+                        for clave, grupo in por_extraer.items()
+                    }
+                    for futuro in as_completed(futuros):
+                        clave = futuros[futuro]
+                        documento = por_extraer[clave][0]
+                        try:
+                            contenido = futuro.result()
+                        except Exception as e:
+                            estadisticas['errores'].extend(
+                                {'documento_id': d.id, 'error': f'Error descargando archivo: {str(e)}'} for d in por_extraer[clave]
+                            )
+                            continue
+                        estadisticas['bytes'] += len(contenido)
+                        en_proceso[clave] = (
+                            hashlib.sha256(contenido).hexdigest(),
+                            pool.submit(extraer, contenido, documento.nombre_original, documento.content_type, max_caracteres)
+                        )
+
+                for clave, (sha256, futuro) in en_proceso.items():
+                    try:
+                        resultado = futuro.result()
+                    except BrokenProcessPool:
+                        _descartar_pool(pool)
+                        resultado = {'estado': 'error', 'error': 'El proceso de extracción terminó inesperadamente'}
+                    valores = _valores(resultado)
+                    for documento in por_extraer[clave]:
+                        _guardar(documento, sha256, valores)
+                        estadisticas['extraidos'] += 1
+                    metricas.incrementar(f'cv_texto.{resultado["estado"]}', len(por_extraer[clave]))
+        finally:
+            _liberar_pool(pool)
+
+    db.session.commit()
+    metricas.incrementar('cv_texto.copiados', estadisticas['copiados'])
+    return estadisticas
+
+def encolar_extraccion(documento_ids, usuario_id=None):
+    """Encola la extracción de texto de los documentos (en la misma transacción). No hace commit."""
+    if not documento_ids:
+        return None
+    return encolar('extraer_texto_cv', {'documento_ids': list(documento_ids)}, usuario_id=usuario_id)
+
+def pendientes(despues_de=0, limite=100, tipos=('cv',), reprocesar=False):
+    """Ids de documentos sin texto del contenido actual, en orden, después de `despues_de`"""
+    query = db.session.query(Documento.id).outerjoin(DocumentoTexto).filter(
+        Documento.tipo.in_(tipos), Documento.id > despues_de
+    )
+    if not reprocesar:
+        query = query.filter(or_(
+            DocumentoTexto.documento_id.is_(None),
+            DocumentoTexto.sha256 != Documento.sha256
+        ))
+    return [documento_id for (documento_id,) in query.order_by(Documento.id).limit(limite)]
+
+def extraer_pendientes(lote=100, tipos=('cv',), reprocesar=False, progreso=None):
+    """
+    Procesa en lotes todos los documentos pendientes (backfill). Cada lote
+    hace commit, así que puede interrumpirse y reanudarse. progreso(totales,
+    segundos) se llama después de cada lote. Retorna los totales.
+    """
+    totales = {'documentos': 0, 'extraidos': 0, 'copiados': 0, 'omitidos': 0, 'bytes': 0, 'errores': []}
+    inicio = time.perf_counter()
+    ultimo = 0
+    while True:
+        ids = pendientes(ultimo, lote, tipos, reprocesar)
+        if not ids:
+            return totales
+        ultimo = ids[-1]
+        estadisticas = extraer_documentos(ids, reprocesar=reprocesar)
+        for campo, valor in estadisticas.items():
+            totales[campo] += valor
+        db.session.expunge_all()
+        if progreso:
+            progreso(totales, time.perf_counter() - inicio)
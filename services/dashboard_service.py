@@ -0,0 +1,201 @@
+"""
+Estadísticas del dashboard (/api/reports/dashboard).
+
+El alcance por rol se define una sola vez (alcance_usuario) y cada tabla se
+lee en una sola pasada con agregación condicional (SUM(CASE ...)): una
+consulta para vacantes, una para candidatos, una para entrevistas y una
+agrupada por status para candidatos_posiciones. Las distribuciones de
+columnas Enum se cuentan en la misma pasada, una columna por valor.
+"""
+from datetime import datetime, timedelta
+from sqlalchemy import func, case, cast, literal_column
+from extensions import db
+from models import Vacante, Candidato, Entrevista, CandidatosPositions
+
+DIAS_ACTIVIDAD_RECIENTE = 7
+
+def alcance_usuario(usuario):
+    """
+    (tipo, usuario_id) de los datos que ve el usuario: ('reclutador', id),
+    ('ejecutivo', id) o ('global', None) para el resto de roles
+    """
+    if usuario.rol in ('reclutador', 'ejecutivo'):
+        return usuario.rol, usuario.id
+    return 'global', None
+
+def _contar_si(condicion):
+    return func.coalesce(func.sum(case((condicion, 1), else_=0)), 0)
+
+def _valores_enum(columna):
+    return list(columna.type.enums)
+
+def _distribucion(fila, prefijo, valores):
+    """{valor: cantidad} con los valores presentes, como lo daría un GROUP BY"""
+    resultado = {}
+    for valor in valores:
+        cantidad = int(fila[f'{prefijo}_{valor}'] or 0)
+        if cantidad:
+            resultado[valor] = cantidad
+    return resultado
+
+def _dias_entre(inicio, fin):
+    """Días completos entre dos columnas DateTime según el dialecto"""
+    if db.engine.dialect.name == 'mysql':
+        return func.timestampdiff(literal_column('DAY'), inicio, fin)
+    return cast(func.julianday(fin) - func.julianday(inicio), db.Integer)
+
+def _filtrar_vacantes(query, alcance):
+    tipo, usuario_id = alcance
+    if tipo == 'reclutador':
+        return query.filter(Vacante.reclutador_id == usuario_id)
+    if tipo == 'ejecutivo':
+        return query.filter(Vacante.ejecutivo_id == usuario_id)
+    return query
+
+def _filtrar_candidatos(query, alcance):
+    tipo, usuario_id = alcance
+    if tipo == 'reclutador':
+        return query.filter(Candidato.reclutador_id == usuario_id)
+    if tipo == 'ejecutivo':
+        # Candidatos asignados a alguna de sus vacantes (semijoin: sin duplicados)
+        asignados = db.select(CandidatosPositions.candidato_id).join(
+            Vacante, CandidatosPositions.vacante_id == Vacante.id
+        ).where(Vacante.ejecutivo_id == usuario_id)
+        return query.filter(Candidato.id.in_(asignados))
+    return query
+
+def _filtrar_entrevistas(query, alcance):
+    tipo, usuario_id = alcance
+    if tipo == 'reclutador':
+        return query.join(Candidato, Entrevista.candidato_id == Candidato.id).filter(
+            Candidato.reclutador_id == usuario_id
+        )
+    if tipo == 'ejecutivo':
+        return query.join(Vacante, Entrevista.vacante_id == Vacante.id).filter(
+            Vacante.ejecutivo_id == usuario_id
+        )
+    return query
+
+def _filtrar_posiciones(query, alcance):
+    tipo, usuario_id = alcance
+    if tipo == 'reclutador':
+        return query.join(Candidato, CandidatosPositions.candidato_id == Candidato.id).filter(
+            Candidato.reclutador_id == usuario_id
+        )
+    if tipo == 'ejecutivo':
+        return query.join(Vacante, CandidatosPositions.vacante_id == Vacante.id).filter(
+            Vacante.ejecutivo_id == usuario_id
+        )
+    return query
+
+def _stats_vacantes(alcance, desde):
+    dias_resolucion = _dias_entre(Vacante.fecha_solicitud, Vacante.fecha_cierre)
+    con_cierre = Vacante.fecha_cierre.isnot(None) & Vacante.fecha_solicitud.isnot(None)
+    columnas = [
+        func.count(Vacante.id).label('total'),
+        _contar_si(Vacante.status_final == 'cubierta').label('cubiertas'),
+        _contar_si(Vacante.fecha_solicitud >= desde).label('recientes'),
+        _contar_si(con_cierre).label('con_cierre'),
+        func.coalesce(func.sum(case((con_cierre, dias_resolucion), else_=0)), 0).label('dias_resolucion'),
+    ]
+    for campo, columna in (('estado', Vacante.estado), ('prioridad', Vacante.prioridad), ('modalidad', Vacante.modalidad)):
+        columnas += [_contar_si(columna == valor).label(f'{campo}_{valor}') for valor in _valores_enum(columna)]
+
+    fila = _filtrar_vacantes(db.session.query(*columnas), alcance).one()._mapping
+    con_cierre = int(fila['con_cierre'])
+    return {
+        'total_vacantes': int(fila['total']),
+        'vacantes_abiertas': int(fila['estado_abierta']),
+        'vacantes_cerradas': int(fila['estado_cerrada']),
+        'vacantes_pausadas': int(fila['estado_pausada']),
+        'vacantes_canceladas': int(fila['estado_cancelada']),
+        'vacantes_cubiertas': int(fila['cubiertas']),
+        'vacantes_recientes': int(fila['recientes']),
+        'vacantes_por_prioridad': _distribucion(fila, 'prioridad', _valores_enum(Vacante.prioridad)),
+        'vacantes_por_modalidad': _distribucion(fila, 'modalidad', _valores_enum(Vacante.modalidad)),
+        'tiempo_promedio_resolucion': round(int(fila['dias_resolucion']) / con_cierre, 1) if con_cierre else 0,
+    }
+
+def _stats_candidatos(alcance, desde):
+    columnas = [
+        func.count(Candidato.id).label('total'),
+        _contar_si(Candidato.fecha_creacion >= desde).label('recientes'),
+    ] + [
+        _contar_si(Candidato.estado == valor).label(f'estado_{valor}') for valor in _valores_enum(Candidato.estado)
+    ]
+
+    fila = _filtrar_candidatos(db.session.query(*columnas), alcance).one()._mapping
+    return {
+        'total_candidatos': int(fila['total']),
+        'candidatos_activos': int(fila['estado_activo']),
+        'candidatos_inactivos': int(fila['estado_inactivo']),
+        'candidatos_blacklist': int(fila['estado_blacklist']),
+        'candidatos_recientes': int(fila['recientes']),
+    }
+
+def _stats_entrevistas(alcance, desde):
+    columnas = [
+        func.count(Entrevista.id).label('total'),
+        _contar_si(Entrevista.fecha >= desde).label('recientes'),
+    ] + [
+        _contar_si(Entrevista.resultado == valor).label(f'resultado_{valor}') for valor in _valores_enum(Entrevista.resultado)
+    ] + [
+        _contar_si(Entrevista.tipo == valor).label(f'tipo_{valor}') for valor in _valores_enum(Entrevista.tipo)
+    ]
+
+    fila = _filtrar_entrevistas(db.session.query(*columnas), alcance).one()._mapping
+    return {
+        'total_entrevistas': int(fila['total']),
+        'entrevistas_pendientes': int(fila['resultado_pendiente']),
+        'entrevistas_aprobadas': int(fila['resultado_aprobada']),
+        'entrevistas_rechazadas': int(fila['resultado_rechazada']),
+        'entrevistas_recientes': int(fila['recientes']),
+        'entrevistas_por_tipo': _distribucion(fila, 'tipo', _valores_enum(Entrevista.tipo)),
+    }
+
+def _stats_posiciones(alcance):
+    """status es texto libre: se agrupa por status y el resto se suma por grupo"""
+    valores_contratacion = _valores_enum(CandidatosPositions.contratado_status)
+    columnas = [
+        CandidatosPositions.status.label('status'),
+        func.count(CandidatosPositions.id).label('total'),
+        _contar_si(CandidatosPositions.aceptado == True).label('aceptados'),
+    ] + [
+        _contar_si(func.coalesce(CandidatosPositions.contratado_status, 'pendiente') == valor).label(f'contratacion_{valor}')
+        for valor in valores_contratacion
+    ]
+
+    filas = _filtrar_posiciones(db.session.query(*columnas), alcance).group_by(CandidatosPositions.status).all()
+
+    por_status = {}
+    contratacion = dict.fromkeys(valores_contratacion, 0)
+    aceptados = 0
+    for fila in filas:
+        fila = fila._mapping
+        por_status[fila['status']] = int(fila['total'])
+        aceptados += int(fila['aceptados'])
+        for valor in valores_contratacion:
+            contratacion[valor] += int(fila[f'contratacion_{valor}'])
+
+    return {
+        'candidatos_por_status': por_status,
+        'candidatos_por_contratacion': {valor: n for valor, n in contratacion.items() if n},
+        'candidatos_aceptados_supervisor': aceptados,
+    }
+
+def calcular_dashboard(alcance, ahora=None):
+    """Métricas del dashboard para un alcance de alcance_usuario(), en cuatro consultas"""
+    ahora = ahora or datetime.utcnow()
+    desde = ahora - timedelta(days=DIAS_ACTIVIDAD_RECIENTE)
+
+    stats = {}
+    stats.update(_stats_vacantes(alcance, desde))
+    stats.update(_stats_candidatos(alcance, desde))
+    stats.update(_stats_entrevistas(alcance, desde))
+    stats.update(_stats_posiciones(alcance))
+
+    total_candidatos = stats['total_candidatos']
+    stats['tasa_conversion_global'] = (
+        round(stats['candidatos_aceptados_supervisor'] / total_candidatos * 100, 1) if total_candidatos > 0 else 0
+    )
+    return stats
@@ -0,0 +1,293 @@
+"""
+Snapshots del dashboard (tabla dashboard_snapshot).
+
+/api/reports/dashboard lee una sola fila por alcance (global, ejecutivo o
+reclutador) con el resultado de calcular_dashboard(). Cada flush que toca
+Vacante, Candidato, Entrevista o CandidatosPositions anota los alcances
+afectados (siempre el global, más los ejecutivos y reclutadores
+relacionados), y después del commit se incrementa `version` en sus filas con
+un UPDATE corto, en orden de clave: las escrituras no esperan unas a otras
+por la fila global. Una fila con version_calculada < version está obsoleta.
+
+La lectura sirve el snapshot que hay, indicando su antigüedad, y si está
+obsoleto desde hace DASHBOARD_SNAPSHOT_INTERVALO segundos (o tiene más de
+DASHBOARD_SNAPSHOT_EDAD_MAXIMA) encola un trabajo 'reconstruir_dashboard'
+para su alcance, uno solo a la vez por alcance. Solo recalcula en la
+petición la primera vez de cada alcance (sin fila) o cuando el snapshot
+supera la edad máxima y su trabajo sigue sin tomarse (sin `flask worker` o
+con la cola atrasada). `flask reconstruir-dashboard` recalcula todos los
+alcances (job periódico; las métricas de actividad reciente dependen de la
+fecha aunque no haya cambios).
+"""
+import json
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import event, inspect, or_, and_
+from sqlalchemy.exc import IntegrityError
+from extensions import db
+from models import (
+    Vacante, Candidato, Entrevista, CandidatosPositions, Usuario, DashboardSnapshot, Trabajo
+)
+from services.dashboard_service import calcular_dashboard
+from services.trabajo_service import encolar
+
+GLOBAL = ('global', None)
+
+def _clave(alcance):
+    """(alcance, usuario_id) tal como se guarda: el global usa usuario_id 0"""
+    tipo, usuario_id = alcance
+    return tipo, usuario_id or 0
+
+def _valores(obj, attr):
+    """Valores actual y previo de un atributo (ambos si cambió en este flush)"""
+    state = inspect(obj)
+    history = state.attrs[attr].history
+    valores = set(history.added) | set(history.deleted) | set(history.unchanged)
+    if not valores:
+        valores = {state.dict.get(attr) if state.deleted or state.was_deleted else getattr(obj, attr)}
+    valores.discard(None)
+    return valores
+
+def _alcances_afectados(session):
+    """Claves (alcance, usuario_id) cuyo dashboard cambia con lo pendiente del flush"""
+    modificados = [
+        obj for obj in session.new | session.deleted
+        if isinstance(obj, (Vacante, Candidato, Entrevista, CandidatosPositions))
+    ] + [
+        obj for obj in session.dirty
+        if isinstance(obj, (Vacante, Candidato, Entrevista, CandidatosPositions)) and session.is_modified(obj)
+    ]
+    if not modificados:
+        return set()
+
+    ejecutivos, reclutadores = set(), set()
+    vacante_ids, candidato_ids, candidatos_modificados = set(), set(), set()
+
+    for obj in modificados:
+        if isinstance(obj, Vacante):
+            ejecutivos |= _valores(obj, 'ejecutivo_id')
+            reclutadores |= _valores(obj, 'reclutador_id')
+        elif isinstance(obj, Candidato):
+            reclutadores |= _valores(obj, 'reclutador_id')
+            if obj.id is not None:
+                candidatos_modificados.add(obj.id)
+        else:
+            # Entrevista y CandidatosPositions: el reclutador es el del
+            # candidato y el ejecutivo el de la vacante
+            vacante_ids |= _valores(obj, 'vacante_id')
+            candidato_ids |= _valores(obj, 'candidato_id')
+
+    return _resolver_alcances(
+        session.connection(), ejecutivos, reclutadores, vacante_ids, candidato_ids, candidatos_modificados
+    )
+
+def _resolver_alcances(connection, ejecutivos=(), reclutadores=(), vacante_ids=(), candidato_ids=(),
+                       candidatos_modificados=()):
+    """Claves afectadas a partir de usuarios conocidos y de vacantes/candidatos por resolver"""
+    ejecutivos, reclutadores = set(ejecutivos), set(reclutadores)
+
+    if vacante_ids:
+        ejecutivos |= set(connection.execute(
+            db.select(Vacante.ejecutivo_id).where(Vacante.id.in_(list(vacante_ids))).distinct()
+        ).scalars())
+    if candidato_ids:
+        reclutadores |= set(connection.execute(
+            db.select(Candidato.reclutador_id).where(Candidato.id.in_(list(candidato_ids))).distinct()
+        ).scalars())
+    if candidatos_modificados:
+        # El ejecutivo ve a los candidatos asignados a sus vacantes
+        ejecutivos |= set(connection.execute(
+            db.select(Vacante.ejecutivo_id).join(
+                CandidatosPositions, CandidatosPositions.vacante_id == Vacante.id
+            ).where(CandidatosPositions.candidato_id.in_(list(candidatos_modificados))).distinct()
+        ).scalars())
+
+    claves = {_clave(GLOBAL)}
+    claves |= {('ejecutivo', usuario_id) for usuario_id in ejecutivos if usuario_id}
+    claves |= {('reclutador', usuario_id) for usuario_id in reclutadores if usuario_id}
+    return claves
+
+def _marcar_obsoletos(connection, claves):
+    tabla = DashboardSnapshot.__table__
+    condiciones = [and_(tabla.c.alcance == 'global', tabla.c.usuario_id == 0)]
+    for tipo in ('ejecutivo', 'reclutador'):
+        ids = sorted(usuario_id for alcance, usuario_id in claves if alcance == tipo)
+        if ids:
+            condiciones.append(and_(tabla.c.alcance == tipo, tabla.c.usuario_id.in_(ids)))
+
+    connection.execute(
+        tabla.update().where(or_(*condiciones)).values(version=tabla.c.version + 1)
+    )
+
+def _anotar(session, claves):
+    session.info.setdefault('alcances_obsoletos', set()).update(claves)
+
+def _after_flush(session, flush_context):
+    claves = _alcances_afectados(session)
+    if claves:
+        _anotar(session, claves)
+
+def _after_commit(session):
+    claves = session.info.pop('alcances_obsoletos', None)
+    if not claves:
+        return
+    try:
+        with db.engine.begin() as connection:
+            _marcar_obsoletos(connection, claves)
+    except Exception:
+        # Los datos ya se confirmaron; el recálculo por edad máxima pone el snapshot al día
+        current_app.logger.exception('No se pudieron marcar como obsoletos los snapshots del dashboard')
+
+def _after_rollback(session):
+    session.info.pop('alcances_obsoletos', None)
+
+def invalidar_alcances(vacante_ids=(), candidato_ids=(), ejecutivos=(), reclutadores=()):
+    """
+    Marca como obsoletos, al hacer commit, los snapshots afectados por cambios
+    hechos sin el ORM (UPDATE masivos) sobre asignaciones o entrevistas de
+    estas vacantes y candidatos, o (INSERT masivos) por vacantes y candidatos
+    nuevos de estos ejecutivos y reclutadores. No hace commit.
+    """
+    _anotar(db.session, _resolver_alcances(
+        db.session.connection(), ejecutivos, reclutadores, vacante_ids=vacante_ids, candidato_ids=candidato_ids
+    ))
+
+def _guardar(clave, datos, version, inicio):
+    """Escribe el resultado sin tocar `version` (que pudo avanzar mientras se calculaba)"""
+    tabla = DashboardSnapshot.__table__
+    alcance, usuario_id = clave
+    valores = {'datos': json.dumps(datos), 'version_calculada': version, 'fecha_calculo': inicio}
+
+    result = db.session.execute(
+        tabla.update().where(tabla.c.alcance == alcance, tabla.c.usuario_id == usuario_id).values(**valores)
+    )
+    if result.rowcount == 0:
+        db.session.execute(tabla.insert().values(alcance=alcance, usuario_id=usuario_id, version=version, **valores))
+
+def recalcular(alcance):
+    """Recalcula y guarda el snapshot de un alcance. Hace commit. Retorna (datos, fecha_calculo)."""
+    clave = _clave(alcance)
+    tabla = DashboardSnapshot.__table__
+    inicio = datetime.utcnow()
+
+    # La versión se lee antes que los datos: un cambio confirmado mientras se
+    # calcula deja la fila obsoleta y se recalcula en la siguiente lectura
+    version = db.session.execute(
+        db.select(tabla.c.version).where(tabla.c.alcance == clave[0], tabla.c.usuario_id == clave[1])
+    ).scalar() or 0
+    datos = calcular_dashboard(alcance, inicio)
+
+    try:
+        _guardar(clave, datos, version, inicio)
+        db.session.commit()
+    except IntegrityError:
+        # Otro worker insertó la fila al mismo tiempo: su resultado es igual de válido
+        db.session.rollback()
+
+    return datos, inicio
+
+def _edad(snapshot):
+    return (datetime.utcnow() - snapshot.fecha_calculo).total_seconds()
+
+def _vencido(snapshot):
+    return _edad(snapshot) >= current_app.config.get('DASHBOARD_SNAPSHOT_EDAD_MAXIMA', 3600)
+
+def _debe_recalcular(snapshot):
+    """Obsoleto y con al menos DASHBOARD_SNAPSHOT_INTERVALO segundos, o más viejo que la edad máxima"""
+    obsoleto = snapshot.version_calculada < snapshot.version
+    intervalo = current_app.config.get('DASHBOARD_SNAPSHOT_INTERVALO', 60)
+    return (obsoleto and _edad(snapshot) >= intervalo) or _vencido(snapshot)
+
+def version_dashboard(alcance):
+    """
+    (version, version_calculada, fecha_calculo) del snapshot para el ETag de
+    /api/reports/dashboard, o None si no existe o toca recalcularlo (la ruta
+    debe ejecutarse para encolar el recálculo)
+    """
+    snapshot = db.session.get(DashboardSnapshot, _clave(alcance))
+    if snapshot is None or _debe_recalcular(snapshot):
+        return None
+    return snapshot.version, snapshot.version_calculada, snapshot.fecha_calculo.isoformat()
+
+def _parametros_recalculo(alcance):
+    tipo, usuario_id = alcance
+    return {'alcance': tipo, 'usuario_id': usuario_id}
+
+def trabajo_en_cola(alcance):
+    """Trabajo 'reconstruir_dashboard' pendiente o en proceso del alcance, o None"""
+    return Trabajo.query.filter(
+        Trabajo.tipo == 'reconstruir_dashboard',
+        Trabajo.estado.in_(['pendiente', 'en_proceso']),
+        Trabajo.parametros == json.dumps(_parametros_recalculo(alcance))
+    ).first()
+
+def encolar_recalculo(alcance):
+    """
+    Encola 'reconstruir_dashboard' para el alcance salvo que ya haya uno
+    pendiente o en proceso. Hace commit.
+    """
+    if trabajo_en_cola(alcance) is None:
+        encolar('reconstruir_dashboard', _parametros_recalculo(alcance))
+        db.session.commit()
+
+def recalcular_si_corresponde(alcance):
+    """Recalcula el alcance si sigue sin fila o por recalcular (el trabajo encolado). Retorna si lo hizo."""
+    snapshot = db.session.get(DashboardSnapshot, _clave(alcance))
+    if snapshot is not None and not _debe_recalcular(snapshot):
+        return False
+    recalcular(alcance)
+    return True
+
+def obtener_dashboard(alcance):
+    """
+    Métricas del alcance desde su snapshot. Retorna (datos, fecha_calculo, obsoleto):
+    obsoleto=True si hubo cambios desde el cálculo; el recálculo, si toca, queda
+    encolado. Sin fila, o vencido con el trabajo encolado sin tomar, recalcula aquí.
+    """
+    clave = _clave(alcance)
+    snapshot = db.session.get(DashboardSnapshot, clave)
+    if snapshot is None:
+        datos, fecha_calculo = recalcular(alcance)
+        return datos, fecha_calculo, False
+
+    if _debe_recalcular(snapshot):
+        trabajo = trabajo_en_cola(alcance)
+        if trabajo is None:
+            encolar_recalculo(alcance)
+        elif trabajo.estado == 'pendiente' and _vencido(snapshot):
+            # Nadie tomó el trabajo: el dashboard no se queda sin actualizar
+            # (el trabajo, al correr, ya lo encuentra al día y no recalcula)
+            datos, fecha_calculo = recalcular(alcance)
+            return datos, fecha_calculo, False
+
+    datos = json.loads(snapshot.datos)
+    return datos, snapshot.fecha_calculo, snapshot.version_calculada < snapshot.version
+
+def reconstruir_snapshots(solo_obsoletos=False):
+    """
+    Recalcula el snapshot global y el de cada ejecutivo y reclutador activo
+    (o solo los obsoletos). Retorna el número de alcances recalculados.
+    """
+    if solo_obsoletos:
+        alcances = [
+            (snapshot.alcance, snapshot.usuario_id or None)
+            for snapshot in DashboardSnapshot.query.filter(
+                DashboardSnapshot.version_calculada < DashboardSnapshot.version
+            )
+        ]
+    else:
+        usuarios = db.session.query(Usuario.rol, Usuario.id).filter(
+            Usuario.activo == True, Usuario.rol.in_(['ejecutivo', 'reclutador'])
+        ).all()
+        alcances = [GLOBAL] + [(rol, usuario_id) for rol, usuario_id in usuarios]
+
+    for alcance in alcances:
+        recalcular(alcance)
+    return len(alcances)
+
+def register_dashboard_events():
+    """Registra los listeners de la sesión (idempotente)"""
+    if not event.contains(db.session, 'after_flush', _after_flush):
+        event.listen(db.session, 'after_flush', _after_flush)
+        event.listen(db.session, 'after_commit', _after_commit)
+        event.listen(db.session, 'after_rollback', _after_rollback)
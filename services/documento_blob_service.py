@@ -0,0 +1,136 @@
+"""
+Almacenamiento de documentos direccionado por contenido.
+
+Cada contenido distinto (SHA-256) se guarda una sola vez en el almacenamiento
+(S3 o disco) y se registra en documento_blob con un conteo de referencias. Los
+documentos con el mismo contenido apuntan al mismo key_s3; al eliminar un
+documento se descuenta su referencia y el objeto solo se borra cuando ya nadie
+lo usa.
+
+Las referencias se ajustan con UPDATE ... SET referencias = referencias ± 1 y
+el blob se elimina con DELETE ... WHERE referencias = 0, así que dos
+peticiones concurrentes nunca dejan un documento apuntando a un objeto
+borrado. Los keys de blobs nuevos llevan un sufijo único para que una subida
+nunca sobrescriba un objeto que otra petición está borrando.
+"""
+import hashlib
+import uuid
+from sqlalchemy.exc import IntegrityError
+from extensions import db
+from models import DocumentoBlob
+from utils.metrics import metricas
+
+TAMANO_LECTURA = 1024 * 1024
+
+def calcular_sha256(file_obj):
+    """SHA-256 de un archivo seekable, leyéndolo en bloques; lo deja al inicio"""
+    sha256 = hashlib.sha256()
+    file_obj.seek(0)
+    for bloque in iter(lambda: file_obj.read(TAMANO_LECTURA), b''):
+        sha256.update(bloque)
+    file_obj.seek(0)
+    return sha256.hexdigest()
+
+def key_blob(sha256):
+    return f'blobs/{sha256[:2]}/{sha256}-{uuid.uuid4().hex[:8]}'
+
+def sumar_referencia(sha256):
+    """Suma una referencia al blob si existe. Retorna el blob o None."""
+    tabla = DocumentoBlob.__table__
+    result = db.session.execute(
+        tabla.update().where(tabla.c.sha256 == sha256).values(referencias=tabla.c.referencias + 1)
+    )
+    if result.rowcount == 0:
+        return None
+    return db.session.execute(db.select(tabla).where(tabla.c.sha256 == sha256)).first()
+
+def registrar_blob(sha256, upload_result, tamano):
+    """
+    Registra el objeto recién subido como blob del contenido. Si otra petición
+    lo registró primero, se usa ese y el objeto subido se devuelve para borrar.
+    Retorna (blob, key_sobrante).
+    """
+    try:
+        with db.session.begin_nested():
+            db.session.execute(DocumentoBlob.__table__.insert().values(
+                sha256=sha256, key_s3=upload_result['key'], url_s3=upload_result['url'],
+                tamaño_bytes=tamano, referencias=1
+            ))
+    except IntegrityError:
+        blob = sumar_referencia(sha256)
+        if blob is not None:
+            return blob, upload_result['key']
+        raise
+    return db.session.execute(
+        db.select(DocumentoBlob.__table__).where(DocumentoBlob.sha256 == sha256)
+    ).first(), None
+
+def _resultado(blob, sha256, tamano, reutilizado):
+    return {
+        'success': True,
+        'url': blob.url_s3,
+        'key': blob.key_s3,
+        'sha256': sha256,
+        'size': tamano,
+        'reutilizado': reutilizado
+    }
+
+def subir_deduplicado(almacenamiento, file_obj, file_name, content_type, tamano):
+    """
+    Sube un archivo seekable solo si su contenido no está ya almacenado.
+    No hace commit. Retorna el dict de upload_file más sha256, size y reutilizado.
+    """
+    sha256 = calcular_sha256(file_obj)
+    blob = sumar_referencia(sha256)
+    if blob is not None:
+        metricas.incrementar('documentos.blobs_reutilizados')
+        metricas.incrementar('documentos.bytes_no_subidos', tamano)
+        return _resultado(blob, sha256, tamano, True)
+
+    upload_result = almacenamiento.upload_file(
+        file_obj=file_obj, file_name=file_name, content_type=content_type, key=key_blob(sha256)
+    )
+    if not upload_result['success']:
+        return upload_result
+
+    blob, sobrante = registrar_blob(sha256, upload_result, tamano)
+    if sobrante:
+        almacenamiento.delete_file(sobrante)
+    return _resultado(blob, sha256, tamano, sobrante is not None)
+
+def registrar_subida(almacenamiento, upload_result):
+    """
+    Deduplica un objeto ya subido (subida en streaming, el hash se conoce al
+    terminar): si el contenido ya existía se borra el objeto nuevo y se usa el
+    existente. No hace commit.
+    """
+    sha256 = upload_result['sha256']
+    tamano = upload_result['size']
+    blob = sumar_referencia(sha256)
+    if blob is not None:
+        almacenamiento.delete_file(upload_result['key'])
+        metricas.incrementar('documentos.blobs_reutilizados')
+        return _resultado(blob, sha256, tamano, True)
+
+    blob, sobrante = registrar_blob(sha256, upload_result, tamano)
+    if sobrante:
+        almacenamiento.delete_file(sobrante)
+    return _resultado(blob, sha256, tamano, sobrante is not None)
+
+def liberar_documento(documento):
+    """
+    Descuenta la referencia del documento a su blob. No hace commit.
+    Retorna el key que debe borrarse del almacenamiento después del commit, o
+    None si el contenido sigue en uso. Los documentos sin blob (anteriores a
+    la deduplicación) retornan su propio key.
+    """
+    if documento.sha256:
+        tabla = DocumentoBlob.__table__
+        condicion = (tabla.c.sha256 == documento.sha256) & (tabla.c.key_s3 == documento.key_s3)
+        result = db.session.execute(
+            tabla.update().where(condicion).values(referencias=tabla.c.referencias - 1)
+        )
+        if result.rowcount:
+            eliminado = db.session.execute(tabla.delete().where(condicion & (tabla.c.referencias <= 0)))
+            return documento.key_s3 if eliminado.rowcount else None
+    return documento.key_s3
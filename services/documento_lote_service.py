@@ -0,0 +1,149 @@
+"""
+Subida de varios documentos en una sola petición.
+
+Valida todos los archivos y los permisos (una sola consulta para todos los
+candidatos), sube en paralelo solo el contenido que todavía no está
+almacenado (un archivo repetido dentro del lote se sube una vez) y agrega los
+Documento a la transacción de la petición. Cada archivo tiene su propio
+resultado; los que fallan no impiden guardar los demás.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from werkzeug.utils import secure_filename
+from extensions import db
+from models import Candidato, Documento, DocumentoBlob
+from services.documento_blob_service import calcular_sha256, key_blob, sumar_referencia, registrar_blob
+from utils.file_utils import validate_file_upload
+from utils.metrics import metricas
+
+TIPOS = tuple(Documento.tipo.type.enums)
+
+class LoteInvalido(ValueError):
+    pass
+
+def _subir(app, almacenamiento, archivo, sha256):
+    with app.app_context():
+        try:
+            return almacenamiento.upload_file(
+                file_obj=archivo,
+                file_name=secure_filename(archivo.filename),
+                content_type=archivo.content_type,
+                key=key_blob(sha256)
+            )
+        except Exception as e:
+            return {'success': False, 'error': f'Error inesperado: {str(e)}'}
+
+def _error(indice, archivo, error):
+    return {'indice': indice, 'nombre': archivo.filename, 'success': False, 'error': error}
+
+def _validar(archivos, current_user, resultados):
+    """Archivos válidos como (indice, archivo, candidato, tipo, tamaño, sha256)"""
+    ids = {candidato_id for _, candidato_id, _ in archivos if candidato_id}
+    candidatos = {c.id: c for c in Candidato.query.filter(Candidato.id.in_(ids))} if ids else {}
+
+    validos = []
+    for indice, (archivo, candidato_id, tipo) in enumerate(archivos):
+        candidato = candidatos.get(candidato_id)
+        if not candidato_id:
+            error = 'candidato_id es requerido'
+        elif not candidato:
+            error = 'Candidato no encontrado'
+        elif current_user.rol == 'reclutador' and candidato.reclutador_id != current_user.id:
+            error = 'Sin permisos para subir archivos a este candidato'
+        elif tipo not in TIPOS:
+            error = f'tipo debe ser uno de: {", ".join(TIPOS)}'
+        else:
+            validation = validate_file_upload(archivo)
+            error = None if validation['valid'] else validation['error']
+
+        if error:
+            resultados[indice] = _error(indice, archivo, error)
+        else:
+            validos.append((indice, archivo, candidato, tipo, validation['size'], calcular_sha256(archivo)))
+    return validos
+
+def subir_lote(almacenamiento, current_user, archivos, keys_subidos):
+    """
+    archivos: lista de (FileStorage, candidato_id, tipo). No hace commit.
+    Retorna un resultado por archivo, en el mismo orden. Los keys subidos al
+    almacenamiento en esta llamada se agregan a `keys_subidos` para que quien
+    hace el commit los borre si la transacción falla.
+    """
+    config = current_app.config
+    maximo = config.get('DOCUMENTOS_LOTE_MAX', 50)
+    if not archivos:
+        raise LoteInvalido('No se encontraron archivos')
+    if len(archivos) > maximo:
+        raise LoteInvalido(f'Máximo {maximo} archivos por petición')
+
+    resultados = [None] * len(archivos)
+    validos = _validar(archivos, current_user, resultados)
+
+    # Contenido nuevo: se sube una vez por sha256, en paralelo
+    hashes = {sha256 for *_, sha256 in validos}
+    existentes = set(db.session.execute(
+        db.select(DocumentoBlob.sha256).where(DocumentoBlob.sha256.in_(hashes))
+    ).scalars()) if hashes else set()
+    por_subir = {}
+    for indice, archivo, candidato, tipo, tamano, sha256 in validos:
+        if sha256 not in existentes and sha256 not in por_subir:
+            por_subir[sha256] = archivo
+
+    subidas = {}
+    if por_subir:
+        app = current_app._get_current_object()
+        hilos = min(len(por_subir), config.get('DOCUMENTOS_LOTE_HILOS', 8))
+        with metricas.medir('documentos.lote_subida'):
+            with ThreadPoolExecutor(max_workers=hilos, thread_name_prefix='documentos-lote') as executor:
+                futuros = {sha256: executor.submit(_subir, app, almacenamiento, archivo, sha256)
+                           for sha256, archivo in por_subir.items()}
+            subidas = {sha256: futuro.result() for sha256, futuro in futuros.items()}
+        keys_subidos.extend(subida['key'] for subida in subidas.values() if subida['success'])
+
+    nuevos = []
+    for indice, archivo, candidato, tipo, tamano, sha256 in validos:
+        subida = subidas.get(sha256)
+        if subida is not None and not subida['success']:
+            resultados[indice] = _error(indice, archivo, subida['error'])
+            continue
+
+        blob = sumar_referencia(sha256)
+        reutilizado = blob is not None
+        if blob is None:
+            if subida is None:
+                # El blob existente se eliminó entre la verificación y ahora
+                resultados[indice] = _error(indice, archivo, 'El contenido se eliminó durante la subida, intente de nuevo')
+                continue
+            blob, sobrante = registrar_blob(sha256, subida, tamano)
+            if sobrante:
+                almacenamiento.delete_file(sobrante)
+                keys_subidos.remove(sobrante)
+                reutilizado = True
+        if reutilizado:
+            metricas.incrementar('documentos.blobs_reutilizados')
+
+        documento = Documento(
+            nombre_original=archivo.filename,
+            url_s3=blob.url_s3,
+            key_s3=blob.key_s3,
+            tipo=tipo,
+            candidato_id=candidato.id,
+            tamaño_bytes=tamano,
+            content_type=archivo.content_type,
+            sha256=sha256
+        )
+        db.session.add(documento)
+        if tipo == 'cv':
+            candidato.cv_url = blob.url_s3
+        nuevos.append((indice, archivo, documento, reutilizado))
+
+    db.session.flush()
+    for indice, archivo, documento, reutilizado in nuevos:
+        resultados[indice] = {
+            'indice': indice,
+            'nombre': archivo.filename,
+            'success': True,
+            'documento': documento.to_dict(),
+            'contenido_reutilizado': reutilizado
+        }
+    return resultados
@@ -0,0 +1,87 @@
+"""
+GET condicional (ETag / If-None-Match) de las rutas de lectura.
+
+El ETag no se calcula con el cuerpo: es un hash de la ruta, la query string,
+el usuario (id y rol, que definen el alcance) y las versiones de las tablas
+que muestra la respuesta (version_datos), o de la versión del snapshot en el
+dashboard. Las versiones se leen con una consulta antes de ejecutar la ruta;
+si el ETag coincide con If-None-Match se responde 304 sin ejecutarla. Como se
+leen antes que los datos, un cambio confirmado mientras la ruta se ejecuta
+deja un ETag anterior a los datos y la siguiente petición recibe 200. Las
+versiones se incrementan justo después del commit, así que solo en esa
+ventana breve una revalidación puede recibir 304 con datos anteriores.
+
+Son ETag débiles: dos respuestas con el mismo ETag son equivalentes aunque
+difieran en metadatos (p. ej. la antigüedad del snapshot). Las respuestas con
+días transcurridos, que cambian con la hora, incluyen además la ventana
+actual de ETAG_VENTANA_SEGUNDOS.
+"""
+import hashlib
+import time
+from functools import wraps
+from flask import current_app, make_response, request
+from services.version_service import obtener_versiones
+from utils.metrics import metricas
+
+def _partes(current_user, claves, reloj, version):
+    """Valores de los que depende la respuesta, o None si no se pueden conocer sin ejecutar la ruta"""
+    partes = []
+    if version is not None:
+        propias = version(current_user)
+        if propias is None:
+            return None
+        partes.extend(propias)
+    if claves:
+        versiones = obtener_versiones(claves)
+        partes.extend(f'{clave}={versiones[clave]}' for clave in claves)
+    if reloj:
+        partes.append(int(time.time() // current_app.config.get('ETAG_VENTANA_SEGUNDOS', 3600)))
+    return partes
+
+def _etag(current_user, partes):
+    contenido = '\n'.join([
+        request.path, request.query_string.decode('latin-1'), f'{current_user.id}:{current_user.rol}',
+        *map(str, partes)
+    ])
+    return hashlib.sha1(contenido.encode('utf-8')).hexdigest()
+
+def _con_etag(respuesta, etag):
+    respuesta.set_etag(etag, weak=True)
+    # El navegador guarda la respuesta pero la revalida en cada petición
+    respuesta.headers['Cache-Control'] = 'private, no-cache'
+    return respuesta
+
+def condicional(*claves, reloj=False, version=None):
+    """
+    Decorador para rutas GET, debajo de @token_required o @role_required. El
+    ETag usa las versiones de `claves` en version_datos, la ventana de tiempo
+    si reloj=True y lo que retorne version(current_user); si version retorna
+    None la ruta se ejecuta y el ETag se calcula después.
+    """
+    def decorador(f):
+        @wraps(f)
+        def decorated(current_user, *args, **kwargs):
+            try:
+                partes = _partes(current_user, claves, reloj, version)
+            except Exception:
+                # Sin validación la ruta responde igual, solo sin ETag
+                current_app.logger.exception('No se pudieron leer las versiones para el ETag')
+                return f(current_user, *args, **kwargs)
+
+            etag = _etag(current_user, partes) if partes is not None else None
+            if etag is not None and request.if_none_match.contains_weak(etag):
+                metricas.incrementar('etag.no_modificado')
+                return _con_etag(make_response('', 304), etag)
+
+            respuesta = make_response(f(current_user, *args, **kwargs))
+            if respuesta.status_code != 200:
+                return respuesta
+
+            if etag is None:
+                partes = _partes(current_user, claves, reloj, version)
+                if partes is None:
+                    return respuesta
+                etag = _etag(current_user, partes)
+            return _con_etag(respuesta, etag)
+        return decorated
+    return decorador
@@ -0,0 +1,208 @@
+"""
+Exportación completa de vacantes, candidatos, asignaciones (pipeline) y
+entrevistas (GET /api/exports/<entidad>).
+
+Cada entidad es un SELECT de columnas planas (los nombres de cliente y
+usuarios y los contadores vienen con JOIN, sin instanciar modelos ni llamar a
+to_dict()) con el mismo alcance por rol que su listado. Las filas se leen con
+un cursor del lado del servidor (stream_results) en bloques de
+EXPORTACION_FILAS_POR_LOTE y se escriben como CSV o NDJSON a medida que
+llegan, así que la memoria no crece con el número de filas.
+"""
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from flask import current_app
+from sqlalchemy import func
+from sqlalchemy.orm import aliased
+from extensions import db
+from models import Candidato, CandidatosPositions, Cliente, Entrevista, Usuario, Vacante, VacanteContadores
+from utils.metrics import metricas
+
+FORMATOS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+class FiltroInvalido(ValueError):
+    pass
+
+def _fecha_filtro(filtros, campo):
+    valor = filtros.get(campo)
+    if not valor:
+        return None
+    try:
+        return datetime.fromisoformat(valor)
+    except ValueError:
+        raise FiltroInvalido(f'{campo} debe tener formato ISO (AAAA-MM-DD)')
+
+def _vacantes(usuario, filtros):
+    ejecutivo = aliased(Usuario)
+    reclutador = aliased(Usuario)
+    lider = aliased(Usuario)
+    columnas = [
+        Vacante.id, Vacante.nombre,
+        Cliente.nombre.label('cliente'), Cliente.ccp.label('cliente_ccp'),
+        ejecutivo.nombre.label('ejecutivo'), reclutador.nombre.label('reclutador'),
+        lider.nombre.label('reclutador_lider'),
+        Vacante.vacantes, Vacante.candidatos_requeridos, Vacante.entrevistas_op,
+        Vacante.avance, Vacante.estado, Vacante.status_final, Vacante.prioridad,
+        Vacante.ubicacion, Vacante.modalidad, Vacante.salario_min, Vacante.salario_max,
+        Vacante.fecha_solicitud, Vacante.envio_candidatos_rh, Vacante.fecha_limite, Vacante.fecha_cierre,
+    ] + [
+        func.coalesce(getattr(VacanteContadores, campo), 0).label(campo) for campo in VacanteContadores.CAMPOS
+    ] + [Vacante.comentarios, Vacante.fecha_creacion]
+
+    query = db.select(*columnas).select_from(Vacante) \
+        .outerjoin(Cliente, Cliente.id == Vacante.cliente_id) \
+        .outerjoin(ejecutivo, ejecutivo.id == Vacante.ejecutivo_id) \
+        .outerjoin(reclutador, reclutador.id == Vacante.reclutador_id) \
+        .outerjoin(lider, lider.id == Vacante.reclutador_lider_id) \
+        .outerjoin(VacanteContadores, VacanteContadores.vacante_id == Vacante.id)
+
+    if filtros.get('estado'):
+        query = query.where(Vacante.estado == filtros['estado'])
+    if filtros.get('avance'):
+        query = query.where(Vacante.avance == filtros['avance'])
+
+    # Mismo alcance que GET /api/vacantes
+    if usuario.rol == 'reclutador':
+        query = query.where(Vacante.reclutador_id == usuario.id)
+    elif usuario.rol == 'ejecutivo':
+        query = query.where(Vacante.ejecutivo_id == usuario.id)
+    return query.order_by(Vacante.id)
+
+def _candidatos(usuario, filtros):
+    query = db.select(
+        Candidato.id, Candidato.nombre, Candidato.email, Candidato.telefono, Candidato.estado,
+        Usuario.nombre.label('reclutador'), Candidato.ubicacion, Candidato.nivel_ingles,
+        Candidato.disponibilidad, Candidato.experiencia_anos, Candidato.salario_esperado,
+        Candidato.linkedin_url, Candidato.cv_url, Candidato.comentarios_generales, Candidato.fecha_creacion
+    ).select_from(Candidato).outerjoin(Usuario, Usuario.id == Candidato.reclutador_id)
+
+    if filtros.get('estado'):
+        query = query.where(Candidato.estado == filtros['estado'])
+
+    # Mismo alcance que GET /api/candidatos
+    if usuario.rol == 'reclutador':
+        query = query.where(Candidato.reclutador_id == usuario.id)
+    return query.order_by(Candidato.id)
+
+def _candidatos_posiciones(usuario, filtros):
+    query = db.select(
+        CandidatosPositions.id,
+        CandidatosPositions.vacante_id, Vacante.nombre.label('vacante'),
+        CandidatosPositions.candidato_id, Candidato.nombre.label('candidato'), Candidato.email.label('candidato_email'),
+        CandidatosPositions.status, CandidatosPositions.aceptado, CandidatosPositions.contratado_status,
+        CandidatosPositions.entrevista_realizada, CandidatosPositions.se_presento, CandidatosPositions.motivo_rechazo,
+        CandidatosPositions.comentarios_finales, CandidatosPositions.fecha_asignacion,
+        CandidatosPositions.fecha_envio_candidato, CandidatosPositions.fecha_entrevista_ejecutivo,
+        CandidatosPositions.fecha_decision_final, CandidatosPositions.fecha_actualizacion
+    ).select_from(CandidatosPositions) \
+        .join(Candidato, Candidato.id == CandidatosPositions.candidato_id) \
+        .join(Vacante, Vacante.id == CandidatosPositions.vacante_id)
+
+    for campo in ('candidato_id', 'vacante_id', 'status', 'contratado_status'):
+        if filtros.get(campo):
+            query = query.where(getattr(CandidatosPositions, campo) == filtros[campo])
+
+    # Mismo alcance que GET /api/candidatos-posiciones
+    if usuario.rol == 'reclutador':
+        query = query.where(Candidato.reclutador_id == usuario.id)
+    return query.order_by(CandidatosPositions.id)
+
+def _entrevistas(usuario, filtros):
+    query = db.select(
+        Entrevista.id, Entrevista.fecha, Entrevista.tipo, Entrevista.resultado, Entrevista.puntuacion,
+        Entrevista.vacante_id, Vacante.nombre.label('vacante'),
+        Entrevista.candidato_id, Candidato.nombre.label('candidato'),
+        Usuario.nombre.label('entrevistador'), Entrevista.duracion_minutos, Entrevista.ubicacion,
+        Entrevista.comentarios, Entrevista.fecha_creacion
+    ).select_from(Entrevista) \
+        .join(Candidato, Candidato.id == Entrevista.candidato_id) \
+        .join(Vacante, Vacante.id == Entrevista.vacante_id) \
+        .outerjoin(Usuario, Usuario.id == Entrevista.entrevistador_id)
+
+    desde = _fecha_filtro(filtros, 'fecha_desde')
+    hasta = _fecha_filtro(filtros, 'fecha_hasta')
+    if desde:
+        query = query.where(Entrevista.fecha >= desde)
+    if hasta:
+        query = query.where(Entrevista.fecha <= hasta)
+
+    # Mismo alcance que GET /api/entrevistas
+    if usuario.rol == 'reclutador':
+        query = query.where(Candidato.reclutador_id == usuario.id)
+    return query.order_by(Entrevista.id)
+
+# Entidad -> función (usuario, filtros) -> SELECT ordenado
+ENTIDADES = {
+    'vacantes': _vacantes,
+    'candidatos': _candidatos,
+    'candidatos-posiciones': _candidatos_posiciones,
+    'entrevistas': _entrevistas,
+}
+
+def consulta_exportacion(entidad, usuario, filtros):
+    """SELECT de la entidad con los filtros y el alcance del usuario. FiltroInvalido si un filtro no sirve."""
+    return ENTIDADES[entidad](usuario, filtros)
+
+def leer_filas(query, tamano_lote=None):
+    """
+    Genera bloques de filas (tuplas) de la consulta con un cursor del lado del
+    servidor, en una conexión propia que se cierra al terminar. El primer
+    elemento son los nombres de las columnas.
+    """
+    tamano_lote = tamano_lote or current_app.config.get('EXPORTACION_FILAS_POR_LOTE', 1000)
+    with db.engine.connect() as connection:
+        result = connection.execution_options(stream_results=True, yield_per=tamano_lote).execute(query)
+        yield list(result.keys())
+        for bloque in result.partitions():
+            yield bloque
+
+def _valor_json(valor):
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    if isinstance(valor, Decimal):
+        return float(valor)
+    raise TypeError(f'{type(valor).__name__} no es serializable')
+
+def _valor_csv(valor):
+    if valor is None:
+        return ''
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    return valor
+
+def generar(entidad, query, formato='csv'):
+    """Cuerpo de la respuesta (texto) bloque por bloque"""
+    filas = 0
+    bloques = leer_filas(query)
+    columnas = next(bloques)
+    try:
+        if formato == 'ndjson':
+            for bloque in bloques:
+                filas += len(bloque)
+                yield ''.join(
+                    json.dumps(dict(zip(columnas, fila)), default=_valor_json, ensure_ascii=False) + '\n'
+                    for fila in bloque
+                )
+        else:
+            salida = io.StringIO()
+            escritor = csv.writer(salida)
+            # BOM: Excel abre el CSV como UTF-8 (acentos y ñ)
+            salida.write('\ufeff')
+            escritor.writerow(columnas)
+            for bloque in bloques:
+                filas += len(bloque)
+                escritor.writerows([_valor_csv(valor) for valor in fila] for fila in bloque)
+                yield salida.getvalue()
+                salida.seek(0)
+                salida.truncate()
+            if salida.tell():
+                yield salida.getvalue()
+    finally:
+        bloques.close()
+        metricas.incrementar(f'exportaciones.{entidad}.filas', filas)
@@ -0,0 +1,564 @@
+"""
+Importación masiva de vacantes y candidatos desde CSV o XLSX.
+
+POST /api/importaciones/<entidad> guarda el archivo en el almacenamiento de
+documentos (carpeta importaciones/) y encola el trabajo 'importar_datos';
+`flask importar-datos` hace lo mismo desde la terminal. El archivo se lee en
+streaming (csv.reader, openpyxl en modo read_only) sin cargarlo completo en
+memoria:
+
+- clientes (por ccp) y usuarios (por email) se resuelven con diccionarios
+  cargados una sola vez, sin una consulta por fila;
+- las filas se validan por lotes de IMPORTACION_LOTE y cada lote se inserta
+  con un solo INSERT de varias filas (executemany) y un commit;
+- una fila con errores se omite y las demás se importan; los errores quedan en
+  el resultado con el número de fila del archivo (la cabecera es la fila 1),
+  como máximo IMPORTACION_MAX_ERRORES.
+
+Los INSERT no pasan por la unidad de trabajo del ORM, así que los listeners de
+la sesión no los ven: cada lote marca como obsoletos los snapshots del
+dashboard afectados y encola la indexación de talento de los candidatos nuevos.
+
+Las cabeceras se comparan sin mayúsculas ni acentos ('Cliente CCP' ->
+cliente_ccp) y aceptan los alias de ALIAS.
+"""
+import csv
+import io
+import itertools
+import os
+import re
+import shutil
+import tempfile
+import time
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from flask import current_app
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from extensions import db
+from models import Candidato, Cliente, Usuario, Vacante
+from services.contadores_service import crear_contadores
+from services.dashboard_snapshot_service import invalidar_alcances
+from services.talento_service import CAMPOS_CANDIDATO
+from services.trabajo_service import encolar
+from services.version_service import incrementar_version
+from utils.metrics import metricas
+from utils.texto_es import plegar
+
+EXTENSIONES = ('.csv', '.xlsx')
+
+# Roles que pueden importar cada entidad (los mismos que crean una por una)
+ROLES = {
+    'vacantes': ('ejecutivo', 'reclutador_lider'),
+    'candidatos': ('reclutador', 'reclutador_lider', 'administrador'),
+}
+
+# Cabecera normalizada -> campo
+ALIAS = {
+    'vacante': 'nombre',
+    'ccp': 'cliente_ccp',
+    'cliente': 'cliente_ccp',
+    'ejecutivo': 'ejecutivo_email',
+    'reclutador': 'reclutador_email',
+    'reclutador_lider': 'reclutador_lider_email',
+    'lider': 'reclutador_lider_email',
+    'posiciones': 'vacantes',
+    'correo': 'email',
+    'comentarios': 'comentarios_generales',
+    'comentarios_finales': 'comentarios_generales',
+    'ingles': 'nivel_ingles',
+    'experiencia': 'experiencia_anos',
+    'linkedin': 'linkedin_url',
+}
+
+class ImportacionInvalida(ValueError):
+    """El archivo no se puede importar (formato, codificación o columnas)"""
+
+class _FilaInvalida(ValueError):
+    pass
+
+# Lectura
+
+def _normalizar_cabecera(cabecera):
+    nombre = re.sub(r'[^a-z0-9]+', '_', plegar(str(cabecera or '')).strip()).strip('_')
+    return ALIAS.get(nombre, nombre)
+
+def _filas_csv(archivo, codificacion):
+    try:
+        texto = io.TextIOWrapper(archivo, encoding=codificacion, newline='')
+    except LookupError:
+        raise ImportacionInvalida(f'Codificación desconocida: {codificacion}')
+    try:
+        primera = texto.readline()
+        # Separador más frecuente en la cabecera (Excel en español exporta con ';')
+        separador = max(',;\t', key=primera.count)
+        yield from csv.reader(itertools.chain([primera], texto), delimiter=separador)
+    except UnicodeDecodeError:
+        raise ImportacionInvalida(f'El archivo no está en {codificacion}; indique la codificación (p. ej. latin-1)')
+
+def _filas_xlsx(archivo):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportacionInvalida('Para importar XLSX se requiere openpyxl')
+
+    # openpyxl necesita un archivo con seek (el body de S3 no lo tiene)
+    if not (hasattr(archivo, 'seekable') and archivo.seekable()):
+        copia = tempfile.TemporaryFile()
+        shutil.copyfileobj(archivo, copia, 1024 * 1024)
+        copia.seek(0)
+        archivo = copia
+
+    try:
+        libro = load_workbook(archivo, read_only=True, data_only=True)
+    except Exception as e:
+        raise ImportacionInvalida(f'XLSX inválido: {str(e)}')
+    try:
+        yield from libro.active.iter_rows(values_only=True)
+    finally:
+        libro.close()
+
+def leer_filas(archivo, nombre, codificacion='utf-8-sig'):
+    """
+    Genera (cabeceras, filas): las cabeceras normalizadas y un iterador de
+    (número de fila, dict campo -> valor). Omite las filas vacías.
+    """
+    extension = os.path.splitext(nombre or '')[1].lower()
+    if extension == '.csv':
+        crudas = _filas_csv(archivo, codificacion)
+    elif extension == '.xlsx':
+        crudas = _filas_xlsx(archivo)
+    else:
+        raise ImportacionInvalida(f'Formato no soportado; use {" o ".join(EXTENSIONES)}')
+
+    cabecera = next(crudas, None)
+    if not cabecera:
+        raise ImportacionInvalida('El archivo está vacío')
+    cabeceras = [_normalizar_cabecera(valor) for valor in cabecera]
+
+    def filas():
+        for numero, valores in enumerate(crudas, start=2):
+            fila = {
+                campo: valor.strip() if isinstance(valor, str) else valor
+                for campo, valor in zip(cabeceras, valores) if campo
+            }
+            if any(valor not in (None, '') for valor in fila.values()):
+                yield numero, fila
+
+    return cabeceras, filas()
+
+# Conversión de valores
+
+def _vacio(valor):
+    return valor is None or valor == ''
+
+def _texto(largo=None):
+    def convertir(valor):
+        if isinstance(valor, float) and valor.is_integer():
+            valor = int(valor)  # Teléfonos y claves numéricas leídos de XLSX
+        texto = str(valor).strip()
+        if largo and len(texto) > largo:
+            raise _FilaInvalida(f'máximo {largo} caracteres')
+        return texto
+    return convertir
+
+def _entero(valor):
+    if isinstance(valor, float) and valor.is_integer():
+        return int(valor)
+    try:
+        numero = int(str(valor).strip())
+    except ValueError:
+        raise _FilaInvalida('debe ser un número entero')
+    if numero < 0:
+        raise _FilaInvalida('no puede ser negativo')
+    return numero
+
+def _decimal(valor):
+    try:
+        numero = Decimal(str(valor).replace('$', '').replace(',', '').strip())
+    except InvalidOperation:
+        raise _FilaInvalida('debe ser un número')
+    if not numero.is_finite() or numero < 0:
+        raise _FilaInvalida('debe ser un número positivo')
+    return numero
+
+def _fecha(valor):
+    if isinstance(valor, datetime):
+        return valor
+    if isinstance(valor, date):
+        return datetime(valor.year, valor.month, valor.day)
+    texto = str(valor).strip()
+    try:
+        return datetime.fromisoformat(texto)
+    except ValueError:
+        pass
+    for formato in ('%d/%m/%Y', '%d/%m/%Y %H:%M', '%d-%m-%Y'):
+        try:
+            return datetime.strptime(texto, formato)
+        except ValueError:
+            pass
+    raise _FilaInvalida('fecha inválida (use AAAA-MM-DD o DD/MM/AAAA)')
+
+def _opcion(columna):
+    opciones = columna.type.enums
+
+    def convertir(valor):
+        texto = re.sub(r'\s+', '_', plegar(str(valor)).strip())
+        if texto not in opciones:
+            raise _FilaInvalida(f'debe ser uno de: {", ".join(opciones)}')
+        return texto
+    return convertir
+
+def _email(valor):
+    texto = str(valor).strip().lower()
+    if '@' not in texto or len(texto) > 120:
+        raise _FilaInvalida('email inválido')
+    return texto
+
+# Entidades
+
+class _Referencias:
+    """Clientes por ccp y usuarios por email, cargados una vez por importación"""
+
+    def __init__(self):
+        self.clientes = {
+            ccp.strip().lower(): (id_, activo)
+            for id_, ccp, activo in db.session.execute(db.select(Cliente.id, Cliente.ccp, Cliente.activo))
+        }
+        self.usuarios = {
+            email.strip().lower(): (id_, rol, activo)
+            for id_, email, rol, activo in db.session.execute(
+                db.select(Usuario.id, Usuario.email, Usuario.rol, Usuario.activo)
+            )
+        }
+
+    def cliente(self, ccp):
+        cliente = self.clientes.get(str(ccp).strip().lower())
+        if cliente is None:
+            raise _FilaInvalida(f'no existe el cliente {ccp}')
+        if cliente[1] is False:
+            raise _FilaInvalida(f'el cliente {ccp} está inactivo')
+        return cliente[0]
+
+    def usuario(self, email, roles):
+        usuario = self.usuarios.get(str(email).strip().lower())
+        if usuario is None or usuario[2] is False:
+            raise _FilaInvalida(f'no existe un usuario activo con email {email}')
+        if usuario[1] not in roles:
+            raise _FilaInvalida(f'{email} debe tener rol {" o ".join(roles)}')
+        return usuario[0]
+
+class _Entidad:
+    """Conversión de filas a valores de columnas de una entidad"""
+
+    modelo = None
+    requeridos = ('nombre',)
+
+    def __init__(self, referencias, usuario):
+        self.referencias = referencias
+        self.usuario = usuario
+        self.ahora = datetime.utcnow()
+
+    def campos(self):
+        """campo -> función de conversión (ValueError con el mensaje si el valor no sirve)"""
+        raise NotImplementedError
+
+    def completar(self, valores):
+        """Valores por defecto y validaciones entre columnas"""
+        return valores
+
+    def validar_lote(self, filas, errores):
+        """Validaciones contra la base de un lote ya convertido; retorna las filas válidas"""
+        return filas
+
+    def despues_del_lote(self, filas, antes):
+        """Mantener lo que los listeners de la sesión mantendrían (sin commit)"""
+
+    def convertir(self, fila):
+        """Fila del archivo -> (valores, errores)"""
+        valores, errores = {}, []
+        for campo, convertir in self.campos().items():
+            valor = fila.get(campo)
+            if _vacio(valor):
+                if campo in self.requeridos:
+                    errores.append(f'{campo}: es requerido')
+                continue
+            try:
+                valores[campo] = convertir(valor)
+            except _FilaInvalida as e:
+                errores.append(f'{campo}: {str(e)}')
+        if not errores:
+            try:
+                valores = self.completar(valores)
+            except _FilaInvalida as e:
+                errores.append(str(e))
+        return valores, errores
+
+class _Vacantes(_Entidad):
+    modelo = Vacante
+
+    def campos(self):
+        referencias = self.referencias
+        return {
+            'nombre': _texto(200),
+            'descripcion': _texto(),
+            'cliente_ccp': referencias.cliente,
+            'ejecutivo_email': lambda email: referencias.usuario(email, ('ejecutivo', 'reclutador_lider', 'administrador')),
+            'reclutador_email': lambda email: referencias.usuario(email, ('reclutador', 'reclutador_lider')),
+            'reclutador_lider_email': lambda email: referencias.usuario(email, ('reclutador_lider',)),
+            'vacantes': _entero,
+            'candidatos_requeridos': _entero,
+            'entrevistas_op': _entero,
+            'avance': _texto(100),
+            'estado': _opcion(Vacante.estado),
+            'status_final': _opcion(Vacante.status_final),
+            'prioridad': _opcion(Vacante.prioridad),
+            'salario_min': _decimal,
+            'salario_max': _decimal,
+            'ubicacion': _texto(100),
+            'modalidad': _opcion(Vacante.modalidad),
+            'fecha_solicitud': _fecha,
+            'envio_candidatos_rh': _fecha,
+            'fecha_limite': _fecha,
+            'comentarios': _texto(),
+        }
+
+    def completar(self, valores):
+        if 'reclutador_email' not in valores:
+            raise _FilaInvalida('reclutador_email: es requerido')
+        if valores.get('salario_min') and valores.get('salario_max') and valores['salario_min'] > valores['salario_max']:
+            raise _FilaInvalida('salario_min no puede ser mayor que salario_max')
+        # Un ejecutivo solo crea vacantes propias, como en POST /api/vacantes
+        if self.usuario.rol == 'ejecutivo' and valores.get('ejecutivo_email', self.usuario.id) != self.usuario.id:
+            raise _FilaInvalida('ejecutivo_email: un ejecutivo solo puede importar vacantes propias')
+        # Igual que POST /api/vacantes: el ejecutivo es quien crea y el líder, el usuario si es líder
+        lider_defecto = self.usuario.id if self.usuario.rol == 'reclutador_lider' else None
+        return {
+            'nombre': valores['nombre'],
+            'descripcion': valores.get('descripcion'),
+            'cliente_id': valores.get('cliente_ccp'),
+            'ejecutivo_id': valores.get('ejecutivo_email', self.usuario.id),
+            'reclutador_id': valores['reclutador_email'],
+            'reclutador_lider_id': valores.get('reclutador_lider_email', lider_defecto),
+            'vacantes': valores.get('vacantes', 1),
+            'candidatos_requeridos': valores.get('candidatos_requeridos', 3),
+            'entrevistas_op': valores.get('entrevistas_op', 3),
+            'avance': valores.get('avance', 'Creada'),
+            'estado': valores.get('estado', 'abierta'),
+            'status_final': valores.get('status_final', 'abierta'),
+            'prioridad': valores.get('prioridad', 'media'),
+            'salario_min': valores.get('salario_min'),
+            'salario_max': valores.get('salario_max'),
+            'ubicacion': valores.get('ubicacion'),
+            'modalidad': valores.get('modalidad'),
+            'fecha_solicitud': valores.get('fecha_solicitud', self.ahora),
+            'envio_candidatos_rh': valores.get('envio_candidatos_rh'),
+            'fecha_limite': valores.get('fecha_limite'),
+            'comentarios': valores.get('comentarios'),
+            'fecha_creacion': self.ahora,
+            'fecha_actualizacion': self.ahora,
+        }
+
+    def despues_del_lote(self, filas, antes):
+        # Fila de contadores de cada vacante nueva, como al insertarla con el ORM
+        crear_contadores(list(db.session.execute(
+            db.select(Vacante.id).where(Vacante.id > antes)
+        ).scalars()))
+        invalidar_alcances(
+            ejecutivos={fila['ejecutivo_id'] for fila in filas},
+            reclutadores={fila['reclutador_id'] for fila in filas}
+        )
+        incrementar_version('vacante')
+
+class _Candidatos(_Entidad):
+    modelo = Candidato
+
+    def __init__(self, referencias, usuario):
+        super().__init__(referencias, usuario)
+        self.emails = set()
+
+    def campos(self):
+        return {
+            'nombre': _texto(100),
+            'email': _email,
+            'telefono': _texto(20),
+            'reclutador_email': lambda email: self.referencias.usuario(email, ('reclutador', 'reclutador_lider')),
+            'estado': _opcion(Candidato.estado),
+            'salario_esperado': _decimal,
+            'experiencia_anos': _entero,
+            'ubicacion': _texto(100),
+            'disponibilidad': _opcion(Candidato.disponibilidad),
+            'nivel_ingles': _opcion(Candidato.nivel_ingles),
+            'linkedin_url': _texto(200),
+            'cv_url': _texto(500),
+            'comentarios_generales': _texto(),
+        }
+
+    def completar(self, valores):
+        # Un reclutador solo importa candidatos propios (como en POST /api/candidatos)
+        reclutador_id = valores.get('reclutador_email')
+        if self.usuario.rol == 'reclutador':
+            if reclutador_id not in (None, self.usuario.id):
+                raise _FilaInvalida('reclutador_email: solo puede importar candidatos propios')
+            reclutador_id = self.usuario.id
+        elif reclutador_id is None:
+            if self.usuario.rol != 'reclutador_lider':
+                raise _FilaInvalida('reclutador_email: es requerido')
+            reclutador_id = self.usuario.id
+
+        email = valores.get('email')
+        if email:
+            if email in self.emails:
+                raise _FilaInvalida(f'email: {email} está repetido en el archivo')
+            self.emails.add(email)
+
+        return {
+            'nombre': valores['nombre'],
+            'email': email,
+            'telefono': valores.get('telefono'),
+            'cv_url': valores.get('cv_url'),
+            'estado': valores.get('estado', 'activo'),
+            'reclutador_id': reclutador_id,
+            'salario_esperado': valores.get('salario_esperado'),
+            'experiencia_anos': valores.get('experiencia_anos'),
+            'ubicacion': valores.get('ubicacion'),
+            'disponibilidad': valores.get('disponibilidad'),
+            'nivel_ingles': valores.get('nivel_ingles'),
+            'linkedin_url': valores.get('linkedin_url'),
+            'comentarios_generales': valores.get('comentarios_generales'),
+            'fecha_creacion': self.ahora,
+        }
+
+    def validar_lote(self, filas, errores):
+        emails = [fila['email'] for _, fila in filas if fila['email']]
+        existentes = set()
+        if emails:
+            existentes = {
+                email.lower() for email in db.session.execute(
+                    db.select(Candidato.email).where(Candidato.email.in_(emails))
+                ).scalars()
+            }
+        validas = []
+        for numero, fila in filas:
+            if fila['email'] in existentes:
+                errores(numero, [f'email: ya existe un candidato con {fila["email"]}'])
+            else:
+                validas.append((numero, fila))
+        return validas
+
+    def despues_del_lote(self, filas, antes):
+        reclutadores = {fila['reclutador_id'] for fila in filas}
+        invalidar_alcances(reclutadores=reclutadores)
+        incrementar_version('candidato')
+
+        # Índice de talento de los candidatos nuevos con campos indexados. Los ids
+        # mayores que `antes` pueden incluir candidatos creados a la vez por otros
+        # usuarios; reindexarlos no cambia nada.
+        if any(fila[campo] for fila in filas for campo in CAMPOS_CANDIDATO):
+            candidato_ids = list(db.session.execute(
+                db.select(Candidato.id).where(Candidato.id > antes, Candidato.reclutador_id.in_(reclutadores))
+            ).scalars())
+            if candidato_ids:
+                encolar('indexar_talento', {'candidato_ids': candidato_ids})
+
+ENTIDADES = {
+    'vacantes': _Vacantes,
+    'candidatos': _Candidatos,
+}
+
+# Importación
+
+def _insertar(modelo, filas, errores):
+    """
+    Inserta el lote con un INSERT de varias filas. Si la base rechaza alguna
+    (p. ej. un email que otro usuario registró mientras tanto), las inserta una
+    por una para reportar solo esas. Retorna las filas insertadas.
+    """
+    tabla = modelo.__table__
+    try:
+        db.session.execute(tabla.insert(), [fila for _, fila in filas])
+        return filas
+    except IntegrityError:
+        # La transacción solo tiene el INSERT del lote
+        db.session.rollback()
+
+    insertadas = []
+    for numero, fila in filas:
+        try:
+            with db.session.begin_nested():
+                db.session.execute(tabla.insert(), [fila])
+            insertadas.append((numero, fila))
+        except IntegrityError as e:
+            errores(numero, [f'rechazada por la base de datos: {str(e.orig)}'])
+    return insertadas
+
+def importar(entidad, archivo, nombre, usuario_id, codificacion='utf-8-sig', progreso=None):
+    """
+    Importa las filas del archivo (CSV o XLSX) como `entidad` ('vacantes' o
+    'candidatos') en nombre del usuario. Hace commit por lote. progreso(totales)
+    se llama después de cada lote. Lanza ImportacionInvalida si el archivo no se
+    puede leer. Retorna los totales con los errores por fila.
+    """
+    if entidad not in ENTIDADES:
+        raise ImportacionInvalida(f'entidad debe ser una de: {", ".join(ENTIDADES)}')
+    usuario = db.session.get(Usuario, usuario_id)
+    if usuario is None:
+        raise ImportacionInvalida('Usuario no encontrado')
+
+    config = current_app.config
+    tamano_lote = config.get('IMPORTACION_LOTE', 1000)
+    max_errores = config.get('IMPORTACION_MAX_ERRORES', 1000)
+    inicio = time.perf_counter()
+
+    cabeceras, filas = leer_filas(archivo, nombre, codificacion)
+    procesador = ENTIDADES[entidad](_Referencias(), usuario)
+    conocidas = set(procesador.campos())
+    if 'nombre' not in cabeceras:
+        raise ImportacionInvalida('Falta la columna nombre')
+
+    totales = {
+        'entidad': entidad,
+        'filas': 0,
+        'importadas': 0,
+        'con_errores': 0,
+        'columnas_ignoradas': sorted({c for c in cabeceras if c and c not in conocidas}),
+        'errores': [],
+    }
+
+    def registrar_error(numero, mensajes):
+        totales['con_errores'] += 1
+        if len(totales['errores']) < max_errores:
+            totales['errores'].append({'fila': numero, 'errores': mensajes})
+
+    with metricas.medir(f'importacion.{entidad}'):
+        while True:
+            lote = list(itertools.islice(filas, tamano_lote))
+            if not lote:
+                break
+            totales['filas'] += len(lote)
+
+            convertidas = []
+            for numero, fila in lote:
+                valores, mensajes = procesador.convertir(fila)
+                if mensajes:
+                    registrar_error(numero, mensajes)
+                else:
+                    convertidas.append((numero, valores))
+            convertidas = procesador.validar_lote(convertidas, registrar_error)
+
+            if convertidas:
+                antes = db.session.execute(db.select(func.max(procesador.modelo.id))).scalar() or 0
+                insertadas = _insertar(procesador.modelo, convertidas, registrar_error)
+                if insertadas:
+                    procesador.despues_del_lote([fila for _, fila in insertadas], antes)
+                totales['importadas'] += len(insertadas)
+            db.session.commit()
+
+            totales['segundos'] = round(time.perf_counter() - inicio, 2)
+            if progreso:
+                progreso(totales)
+
+    totales['errores'].sort(key=lambda error: error['fila'])
+    totales['segundos'] = round(time.perf_counter() - inicio, 2)
+    metricas.incrementar(f'importacion.{entidad}.filas', totales['importadas'])
+    return totales
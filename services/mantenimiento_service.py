@@ -0,0 +1,51 @@
+"""
+Tareas de mantenimiento en lote (se ejecutan desde la CLI de Flask, ver commands.py)
+"""
+from sqlalchemy import func, cast, literal_column
+from extensions import db
+from models import Vacante
+
+def dias_transcurridos_expr(dialect_name=None):
+    """
+    Expresión SQL equivalente a Vacante.calcular_dias_transcurridos():
+    días completos desde fecha_solicitud hasta ahora (UTC), 0 si no hay fecha.
+    Retorna None si el dialecto no está soportado.
+    """
+    dialect_name = dialect_name or db.engine.dialect.name
+    
+    if dialect_name == 'mysql':
+        expr = func.timestampdiff(literal_column('DAY'), Vacante.fecha_solicitud, func.utc_timestamp())
+    elif dialect_name == 'sqlite':
+        expr = cast(func.julianday('now') - func.julianday(Vacante.fecha_solicitud), db.Integer)
+    else:
+        return None
+    
+    return func.coalesce(expr, 0)
+
+def actualizar_dias_transcurridos(batch_size=1000):
+    """
+    Persiste dias_transcurridos de todas las vacantes con un solo UPDATE.
+    Retorna el número de filas actualizadas.
+    """
+    expr = dias_transcurridos_expr()
+    
+    if expr is not None:
+        result = db.session.execute(
+            db.update(Vacante)
+            .where(Vacante.dias_transcurridos.is_distinct_from(expr))
+            # No tocar fecha_actualizacion (onupdate): es un dato derivado
+            .values(dias_transcurridos=expr, fecha_actualizacion=Vacante.fecha_actualizacion)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return result.rowcount
+    
+    # Dialecto sin expresión equivalente: recorrer en lotes
+    actualizadas = 0
+    for vacante in Vacante.query.yield_per(batch_size):
+        dias = vacante.calcular_dias_transcurridos()
+        if vacante.dias_transcurridos != dias:
+            vacante.dias_transcurridos = dias
+            actualizadas += 1
+    db.session.commit()
+    return actualizadas
@@ -0,0 +1,124 @@
+"""
+Revocación de tokens JWT por cuenta.
+
+Los access tokens llevan rol, nombre y `ver` (usuario.version_cuenta). Al
+cambiar rol, activo o contraseña de un usuario se incrementa version_cuenta
+en el mismo flush, y los tokens con una versión anterior dejan de valer.
+
+Cada worker guarda en memoria solo las excepciones: las cuentas inactivas
+y las cuentas con version_cuenta > 1. Todas las demás tienen versión 1. Ese
+conjunto se recarga cuando cambia la versión 'usuario' de version_datos. La
+versión se consulta como máximo cada AUTH_REVOCACION_INTERVALO segundos; el
+worker que hizo el commit la recarga al instante. Validar un token no
+consulta la base de datos; /api/metrics reporta qué fracción de las
+validaciones se resolvió solo con la memoria (tasa_aciertos).
+"""
+import threading
+import time
+from flask import current_app
+from sqlalchemy import event, inspect, or_
+from extensions import db
+from models import Usuario
+from services.version_service import obtener_version, suscribir
+from utils.metrics import metricas
+
+CLAVE_VERSION = 'usuario'
+
+# Cambios que invalidan los tokens ya emitidos
+CAMPOS_SENSIBLES = ('rol', 'activo', 'password_hash')
+
+class _Estado:
+    def __init__(self, origen, version, versiones, inactivos):
+        self.origen = origen
+        self.version = version
+        self.versiones = versiones  # usuario_id -> version_cuenta (solo > 1)
+        self.inactivos = inactivos  # ids de cuentas desactivadas
+
+class RevocacionesUsuarios:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._estado = None
+        self._verificado = 0.0
+        self._obsoleto = True
+        self._contadores = {'aciertos': 0, 'consultas': 0, 'recargas': 0}
+
+    def _contar(self, nombre):
+        with self._lock:
+            self._contadores[nombre] += 1
+
+    def invalidar(self, claves=None):
+        if claves is None or CLAVE_VERSION in claves:
+            self._obsoleto = True
+
+    def _vigente(self):
+        origen = str(db.engine.url)
+        estado = self._estado
+        intervalo = current_app.config.get('AUTH_REVOCACION_INTERVALO', 5)
+
+        if (estado is not None and estado.origen == origen and not self._obsoleto
+                and time.monotonic() - self._verificado < intervalo):
+            self._contar('aciertos')
+            return estado
+
+        self._contar('consultas')
+        version = obtener_version(CLAVE_VERSION)
+        with self._lock:
+            estado = self._estado
+            if estado is None or estado.origen != origen or estado.version != version:
+                self._contadores['recargas'] += 1
+                filas = db.session.query(Usuario.id, Usuario.version_cuenta, Usuario.activo).filter(
+                    or_(Usuario.version_cuenta > 1, Usuario.activo == False, Usuario.activo.is_(None))
+                ).all()
+                estado = _Estado(
+                    origen,
+                    version,
+                    {fila.id: fila.version_cuenta for fila in filas if fila.version_cuenta > 1},
+                    {fila.id for fila in filas if not fila.activo}
+                )
+                self._estado = estado
+            self._obsoleto = False
+            self._verificado = time.monotonic()
+            return estado
+
+    def token_vigente(self, usuario_id, version_token):
+        """True si la cuenta está activa y el token lleva su versión actual"""
+        estado = self._vigente()
+        if usuario_id in estado.inactivos:
+            return False
+        return version_token == estado.versiones.get(usuario_id, 1)
+
+    def estadisticas(self):
+        estado = self._estado
+        with self._lock:
+            contadores = dict(self._contadores)
+        validaciones = contadores['aciertos'] + contadores['consultas']
+        return {
+            'cuentas_con_version': len(estado.versiones) if estado else 0,
+            'cuentas_inactivas': len(estado.inactivos) if estado else 0,
+            'version': estado.version if estado else None,
+            **contadores,
+            'tasa_aciertos': round(contadores['aciertos'] / validaciones, 4) if validaciones else None
+        }
+
+def _cambio(history):
+    """Cambio real de valor (asignar el mismo valor no cuenta)"""
+    if not history.added:
+        return False
+    return not history.deleted or history.added[0] != history.deleted[0]
+
+def _before_flush(session, flush_context, instances):
+    for obj in session.dirty:
+        if not isinstance(obj, Usuario):
+            continue
+        state = inspect(obj)
+        if any(_cambio(state.attrs[campo].history) for campo in CAMPOS_SENSIBLES):
+            obj.version_cuenta = (obj.version_cuenta or 1) + 1
+
+def register_revocacion_events():
+    """Registra el listener de la sesión (idempotente)"""
+    if not event.contains(db.session, 'before_flush', _before_flush):
+        event.listen(db.session, 'before_flush', _before_flush)
+
+revocaciones = RevocacionesUsuarios()
+suscribir(revocaciones.invalidar)
+metricas.registrar_proveedor('auth_revocaciones', revocaciones.estadisticas)
@@ -1,8 +1,156 @@
 import boto3
+from botocore.config import Config as BotoConfig
 from botocore.exceptions import ClientError, NoCredentialsError
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+import hashlib
+import threading
+import time
 import uuid
 import os
 from flask import current_app
+from utils.metrics import metricas
+
+# Un cliente por proceso (y por configuración): los clientes de boto3 son
+# thread-safe y reutilizan credenciales, endpoint y conexiones del pool
+_clientes = {}
+_lock = threading.Lock()
+
+# Hilos compartidos por todas las subidas multipart del proceso
+_executor = None
+
+class _ArchivoDemasiadoGrande(Exception):
+    pass
+
+def _antes_de_llamada(context, **kwargs):
+    context['s3_inicio'] = time.perf_counter()
+
+def _registrar_llamada(model, context, nombre_metrica):
+    inicio = context.pop('s3_inicio', None)
+    if inicio is not None:
+        metricas.registrar_tiempo(f's3.{model.name}', time.perf_counter() - inicio)
+    if nombre_metrica:
+        metricas.incrementar(f's3.{model.name}.{nombre_metrica}')
+
+def _despues_de_llamada(model, context, **kwargs):
+    _registrar_llamada(model, context, None)
+
+def _despues_de_error(model, context, **kwargs):
+    _registrar_llamada(model, context, 'errores')
+
+def _crear_cliente(config):
+    session = boto3.session.Session(
+        aws_access_key_id=config['AWS_ACCESS_KEY_ID'],
+        aws_secret_access_key=config['AWS_SECRET_ACCESS_KEY'],
+        region_name=config['AWS_S3_REGION']
+    )
+    opciones = {
+        'max_pool_connections': config.get('AWS_S3_MAX_POOL_CONNECTIONS', 50),
+        'connect_timeout': config.get('AWS_S3_CONNECT_TIMEOUT', 5),
+        'read_timeout': config.get('AWS_S3_READ_TIMEOUT', 60),
+        'retries': {'max_attempts': config.get('AWS_S3_MAX_ATTEMPTS', 5), 'mode': 'standard'},
+        'tcp_keepalive': True,
+    }
+    if config.get('AWS_S3_ENDPOINT_URL'):
+        # MinIO / moto server no resuelven buckets como subdominio
+        opciones['s3'] = {'addressing_style': 'path'}
+
+    cliente = session.client(
+        's3',
+        endpoint_url=config.get('AWS_S3_ENDPOINT_URL') or None,
+        config=BotoConfig(**opciones)
+    )
+    # Tiempo de cada operación HTTP (PutObject, UploadPart, DeleteObject...) en /api/metrics
+    cliente.meta.events.register('before-call.s3', _antes_de_llamada)
+    cliente.meta.events.register('after-call.s3', _despues_de_llamada)
+    cliente.meta.events.register('after-call-error.s3', _despues_de_error)
+    return cliente
+
+def obtener_cliente_s3(config=None):
+    """Cliente S3 compartido del proceso, creado la primera vez que se usa"""
+    config = config or current_app.config
+    clave = tuple(config.get(nombre) for nombre in (
+        'AWS_ACCESS_KEY_ID', 'AWS_SECRET_ACCESS_KEY', 'AWS_S3_REGION', 'AWS_S3_ENDPOINT_URL',
+        'AWS_S3_MAX_POOL_CONNECTIONS', 'AWS_S3_CONNECT_TIMEOUT', 'AWS_S3_READ_TIMEOUT', 'AWS_S3_MAX_ATTEMPTS'
+    ))
+    cliente = _clientes.get(clave)
+    if cliente is None:
+        with _lock:
+            cliente = _clientes.get(clave)
+            if cliente is None:
+                with metricas.medir('s3.crear_cliente'):
+                    cliente = _crear_cliente(config)
+                _clientes[clave] = cliente
+    return cliente
+
+class CacheUrlsFirmadas:
+    """
+    URLs de descarga firmadas por worker, por (bucket, key). Cada URL se reutiliza
+    hasta S3_PRESIGN_MARGEN segundos antes de que venza su firma, así que quien la
+    recibe siempre tiene al menos ese margen para usarla.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._datos = OrderedDict()  # (bucket, key) -> (url, reutilizable_hasta)
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, bucket, key):
+        ahora = time.monotonic()
+        with self._lock:
+            entrada = self._datos.get((bucket, key))
+            if entrada is not None and ahora < entrada[1]:
+                self._datos.move_to_end((bucket, key))
+                self.aciertos += 1
+                return entrada[0]
+            self.fallos += 1
+            return None
+
+    def guardar(self, bucket, key, url, reutilizable_segundos, maximo):
+        with self._lock:
+            self._datos[(bucket, key)] = (url, time.monotonic() + reutilizable_segundos)
+            self._datos.move_to_end((bucket, key))
+            while len(self._datos) > maximo:
+                self._datos.popitem(last=False)
+
+    def descartar(self, bucket, key):
+        with self._lock:
+            self._datos.pop((bucket, key), None)
+
+    def estadisticas(self):
+        total = self.aciertos + self.fallos
+        return {
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'tasa_aciertos': round(self.aciertos / total, 4) if total else 0,
+            'tamano': len(self._datos)
+        }
+
+cache_urls_firmadas = CacheUrlsFirmadas()
+metricas.registrar_proveedor('s3_urls_firmadas', cache_urls_firmadas.estadisticas)
+
+def _obtener_executor(config):
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=config.get('S3_MULTIPART_HILOS', 16), thread_name_prefix='s3-multipart'
+                )
+    return _executor
+
+def leer_bloque(stream, tamano):
+    """Lee hasta `tamano` bytes (menos solo al final del stream)"""
+    partes = []
+    faltan = tamano
+    while faltan > 0:
+        datos = stream.read(faltan)
+        if not datos:
+            break
+        partes.append(datos)
+        faltan -= len(datos)
+    return b''.join(partes)
 
 class S3Service:
     def __init__(self):
@@ -12,26 +160,29 @@ class S3Service:
     
     def _initialize_client(self):
         try:
-            self.s3_client = boto3.client(
-                's3',
-                aws_access_key_id=current_app.config['AWS_ACCESS_KEY_ID'],
-                aws_secret_access_key=current_app.config['AWS_SECRET_ACCESS_KEY'],
-                region_name=current_app.config['AWS_S3_REGION']
-            )
+            self.s3_client = obtener_cliente_s3()
             self.bucket_name = current_app.config['AWS_S3_BUCKET']
         except Exception as e:
             current_app.logger.error(f"Error inicializando cliente S3: {str(e)}")
             raise
     
-    def upload_file(self, file_obj, file_name, content_type, folder='documents'):
+    def _nueva_key(self, file_name, folder):
+        # Generar nombre único para el archivo
+        file_extension = os.path.splitext(file_name)[1]
+        return f"{folder}/{uuid.uuid4()}{file_extension}"
+    
+    def url_objeto(self, key):
+        endpoint = current_app.config.get('AWS_S3_ENDPOINT_URL')
+        if endpoint:
+            return f"{endpoint.rstrip('/')}/{self.bucket_name}/{key}"
+        return f"https://{self.bucket_name}.s3.{current_app.config['AWS_S3_REGION']}.amazonaws.com/{key}"
+    
+    def upload_file(self, file_obj, file_name, content_type, folder='documents', key=None):
         """
-        Sube un archivo a S3 y retorna la URL y key
+        Sube un archivo a S3 y retorna la URL y key (nueva en `folder` si no se indica)
         """
         try:
-            # Generar nombre único para el archivo
-            file_extension = os.path.splitext(file_name)[1]
-            unique_filename = f"{uuid.uuid4()}{file_extension}"
-            key = f"{folder}/{unique_filename}"
+            key = key or self._nueva_key(file_name, folder)
             
             # Subir archivo
             self.s3_client.upload_fileobj(
@@ -45,7 +196,7 @@ class S3Service:
             )
             
             # Generar URL
-            url = f"https://{self.bucket_name}.s3.{current_app.config['AWS_S3_REGION']}.amazonaws.com/{key}"
+            url = self.url_objeto(key)
             
             return {
                 'success': True,
@@ -70,26 +221,157 @@ class S3Service:
                 'error': f'Error inesperado: {str(e)}'
             }
     
+    def upload_stream(self, stream, file_name, content_type, folder='documents', max_bytes=None):
+        """
+        Sube a S3 leyendo el stream una sola vez, en bloques de S3_MULTIPART_CHUNK
+        bytes, calculando tamaño y SHA-256 al vuelo. Si el primer bloque no se llena
+        se sube con un solo PutObject; si no, como multipart con hasta
+        S3_MULTIPART_CONCURRENCIA partes en vuelo. La memoria por subida queda
+        acotada a (S3_MULTIPART_CONCURRENCIA + 1) bloques.
+        """
+        config = current_app.config
+        tamano_bloque = config.get('S3_MULTIPART_CHUNK', 8 * 1024 * 1024)
+        en_vuelo = threading.BoundedSemaphore(config.get('S3_MULTIPART_CONCURRENCIA', 4))
+        key = self._nueva_key(file_name, folder)
+        sha256 = hashlib.sha256()
+        total = 0
+        upload_id = None
+        futuros = []
+        
+        def leer():
+            nonlocal total
+            bloque = leer_bloque(stream, tamano_bloque)
+            total += len(bloque)
+            if max_bytes is not None and total > max_bytes:
+                raise _ArchivoDemasiadoGrande()
+            sha256.update(bloque)
+            return bloque
+        
+        try:
+            bloque = leer()
+            if len(bloque) < tamano_bloque:
+                # Cabe en un bloque: una sola petición
+                self.s3_client.put_object(
+                    Bucket=self.bucket_name, Key=key, Body=bloque,
+                    ContentType=content_type, ACL='private'
+                )
+            else:
+                upload_id = self.s3_client.create_multipart_upload(
+                    Bucket=self.bucket_name, Key=key, ContentType=content_type, ACL='private'
+                )['UploadId']
+                executor = _obtener_executor(config)
+                numero = 0
+                while bloque:
+                    numero += 1
+                    en_vuelo.acquire()
+                    futuros.append(executor.submit(self._subir_parte, key, upload_id, numero, bloque, en_vuelo))
+                    # Dejar de leer en cuanto falle una parte
+                    for futuro in futuros:
+                        if futuro.done() and futuro.exception():
+                            raise futuro.exception()
+                    bloque = None  # soltar la referencia antes de leer el siguiente
+                    bloque = leer()
+                partes = [futuro.result() for futuro in futuros]
+                self.s3_client.complete_multipart_upload(
+                    Bucket=self.bucket_name, Key=key, UploadId=upload_id,
+                    MultipartUpload={'Parts': partes}
+                )
+            
+            metricas.incrementar('s3.bytes_subidos', total)
+            return {
+                'success': True,
+                'url': self.url_objeto(key),
+                'key': key,
+                'size': total,
+                'sha256': sha256.hexdigest(),
+                'message': 'Archivo subido exitosamente'
+            }
+            
+        except _ArchivoDemasiadoGrande:
+            self._abortar_multipart(key, upload_id, futuros)
+            return {'success': False, 'status': 413, 'error': 'El archivo es demasiado grande'}
+        except NoCredentialsError:
+            self._abortar_multipart(key, upload_id, futuros)
+            return {
+                'success': False,
+                'error': 'Credenciales de AWS no configuradas correctamente'
+            }
+        except ClientError as e:
+            self._abortar_multipart(key, upload_id, futuros)
+            return {
+                'success': False,
+                'error': f'Error del cliente S3: {str(e)}'
+            }
+        except Exception as e:
+            self._abortar_multipart(key, upload_id, futuros)
+            return {
+                'success': False,
+                'error': f'Error inesperado: {str(e)}'
+            }
+    
+    def _subir_parte(self, key, upload_id, numero, datos, en_vuelo):
+        try:
+            respuesta = self.s3_client.upload_part(
+                Bucket=self.bucket_name, Key=key, UploadId=upload_id, PartNumber=numero, Body=datos
+            )
+            return {'PartNumber': numero, 'ETag': respuesta['ETag']}
+        finally:
+            en_vuelo.release()
+    
+    def _abortar_multipart(self, key, upload_id, futuros):
+        if upload_id is None:
+            return
+        # Esperar las partes en vuelo: si terminan después del abort, S3 las conserva
+        wait(futuros)
+        try:
+            self.s3_client.abort_multipart_upload(Bucket=self.bucket_name, Key=key, UploadId=upload_id)
+        except Exception as e:
+            current_app.logger.error(f"Error abortando multipart {key}: {str(e)}")
+    
     def delete_file(self, key):
         """
         Elimina un archivo de S3
         """
         try:
             self.s3_client.delete_object(Bucket=self.bucket_name, Key=key)
+            cache_urls_firmadas.descartar(self.bucket_name, key)
             return {'success': True, 'message': 'Archivo eliminado exitosamente'}
         except ClientError as e:
             return {'success': False, 'error': f'Error eliminando archivo: {str(e)}'}
     
-    def generate_presigned_url(self, key, expiration=3600):
+    def abrir(self, key):
+        """Body del objeto (stream de solo lectura)"""
+        return self.s3_client.get_object(Bucket=self.bucket_name, Key=key)['Body']
+    
+    def generate_presigned_url(self, key, expiration=None, content_type=None):
         """
-        Genera una URL firmada para descargar un archivo privado
+        Genera una URL firmada para descargar un archivo privado. Con la
+        expiración por defecto (S3_PRESIGN_EXPIRACION) se reutiliza la URL de la
+        caché del worker mientras le quede margen. content_type no se usa: el
+        objeto ya guarda el suyo.
         """
         try:
-            url = self.s3_client.generate_presigned_url(
-                'get_object',
-                Params={'Bucket': self.bucket_name, 'Key': key},
-                ExpiresIn=expiration
-            )
+            config = current_app.config
+            usar_cache = expiration is None
+            expiration = expiration or config.get('S3_PRESIGN_EXPIRACION', 3600)
+            if usar_cache:
+                url = cache_urls_firmadas.obtener(self.bucket_name, key)
+                if url:
+                    return {'success': True, 'url': url}
+            
+            # Se firma localmente, sin llamada HTTP
+            with metricas.medir('s3.generate_presigned_url'):
+                url = self.s3_client.generate_presigned_url(
+                    'get_object',
+                    Params={'Bucket': self.bucket_name, 'Key': key},
+                    ExpiresIn=expiration
+                )
+            
+            reutilizable = expiration - config.get('S3_PRESIGN_MARGEN', 300)
+            if usar_cache and reutilizable > 0:
+                cache_urls_firmadas.guardar(
+                    self.bucket_name, key, url, reutilizable, config.get('S3_PRESIGN_CACHE_MAX', 4096)
+                )
             return {'success': True, 'url': url}
         except ClientError as e:
             return {'success': False, 'error': f'Error generando URL: {str(e)}'}
@@ -0,0 +1,134 @@
+"""
+Búsqueda de texto completo para candidatos, vacantes y clientes.
+
+En MySQL usa los índices FULLTEXT (MATCH ... AGAINST en modo booleano, con
+prefijos). La colación utf8mb4_unicode_ci ya ignora mayúsculas y acentos.
+En SQLite (pruebas) usa tablas virtuales FTS5 de contenido externo con
+tokenizer unicode61 sin diacríticos, mantenidas por triggers, y ordena por
+bm25. Si ninguna de las dos está disponible se usa LIKE '%term%' como antes.
+"""
+import re
+from sqlalchemy import event, DDL, or_
+from sqlalchemy.dialects.mysql import match
+from extensions import db
+from models import Candidato, Vacante, Cliente
+from utils.texto_es import plegar
+
+# Tamaño mínimo de token por defecto de InnoDB (innodb_ft_min_token_size)
+MYSQL_MIN_TOKEN = 3
+
+# Columnas indexadas por tabla: deben coincidir con los índices FULLTEXT del modelo
+INDICES = {
+    'candidato': (Candidato, ('nombre',)),
+    'vacante': (Vacante, ('nombre',)),
+    'cliente': (Cliente, ('nombre', 'ccp')),
+}
+
+def tokenizar(texto):
+    return re.findall(r'\w+', plegar(texto))
+
+# (url del engine, tabla) -> si existe la tabla FTS5
+_fts_disponible = {}
+
+def _fts_sqlite_disponible(tabla):
+    clave = (str(db.engine.url), tabla)
+    if clave not in _fts_disponible:
+        _fts_disponible[clave] = db.inspect(db.engine).has_table(f'{tabla}_fts')
+    return _fts_disponible[clave]
+
+def _filtro_like(modelo, columnas, termino):
+    return or_(*[getattr(modelo, columna).contains(termino) for columna in columnas])
+
+def aplicar_busqueda(query, tabla, termino, ordenar=True):
+    """
+    Filtra la consulta por el término en las columnas indexadas de la tabla.
+    Con ordenar=True agrega orden por relevancia (antes del orden que ya
+    tenga o se agregue después, que queda como desempate).
+    """
+    modelo, nombres = INDICES[tabla]
+    columnas = [getattr(modelo, nombre) for nombre in nombres]
+    tokens = tokenizar(termino)
+    dialecto = db.engine.dialect.name
+
+    if not tokens:
+        return query.filter(_filtro_like(modelo, nombres, termino))
+
+    if dialecto == 'mysql':
+        largos = [t for t in tokens if len(t) >= MYSQL_MIN_TOKEN]
+        cortos = [t for t in tokens if len(t) < MYSQL_MIN_TOKEN]
+        if not largos:
+            # Primeras teclas: tokens demasiado cortos para el índice FULLTEXT
+            return query.filter(_filtro_like(modelo, nombres, termino))
+
+        relevancia = match(*columnas, against=' '.join(f'+{t}*' for t in largos)).in_boolean_mode()
+        query = query.filter(relevancia)
+        for token in cortos:
+            query = query.filter(_filtro_like(modelo, nombres, token))
+        if ordenar:
+            query = query.order_by(relevancia.desc())
+        return query
+
+    if dialecto == 'sqlite' and _fts_sqlite_disponible(tabla):
+        fts = db.table(f'{tabla}_fts', db.column('rowid'), db.column('rank'))
+        consulta_fts = ' '.join(f'"{t}"*' for t in tokens)
+        query = query.join(fts, fts.c.rowid == modelo.id).filter(
+            db.literal_column(f'{tabla}_fts').op('MATCH')(consulta_fts)
+        )
+        if ordenar:
+            # rank = bm25(): menor es más relevante
+            query = query.order_by(fts.c.rank)
+        return query
+
+    return query.filter(_filtro_like(modelo, nombres, termino))
+
+def _ddl_fts_sqlite(tabla, columnas):
+    """Sentencias para crear la tabla FTS5 de contenido externo y sus triggers"""
+    cols = ', '.join(columnas)
+    new = ', '.join(f'new.{c}' for c in columnas)
+    old = ', '.join(f'old.{c}' for c in columnas)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {tabla}_fts USING fts5("
+        f"{cols}, content='{tabla}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS {tabla}_fts_ai AFTER INSERT ON {tabla} BEGIN "
+        f"INSERT INTO {tabla}_fts(rowid, {cols}) VALUES (new.id, {new}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {tabla}_fts_ad AFTER DELETE ON {tabla} BEGIN "
+        f"INSERT INTO {tabla}_fts({tabla}_fts, rowid, {cols}) VALUES ('delete', old.id, {old}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {tabla}_fts_au AFTER UPDATE ON {tabla} BEGIN "
+        f"INSERT INTO {tabla}_fts({tabla}_fts, rowid, {cols}) VALUES ('delete', old.id, {old}); "
+        f"INSERT INTO {tabla}_fts(rowid, {cols}) VALUES (new.id, {new}); END",
+    ]
+
+def reconstruir_indices():
+    """
+    Crea (si faltan) y reconstruye los índices de búsqueda. En SQLite
+    repuebla las tablas FTS5 desde las tablas base; en MySQL los índices
+    FULLTEXT se mantienen solos y solo se optimizan.
+    """
+    dialecto = db.engine.dialect.name
+    tablas = []
+
+    with db.engine.begin() as connection:
+        for tabla, (modelo, columnas) in INDICES.items():
+            if dialecto == 'sqlite':
+                for sentencia in _ddl_fts_sqlite(tabla, columnas):
+                    connection.exec_driver_sql(sentencia)
+                connection.exec_driver_sql(f"INSERT INTO {tabla}_fts({tabla}_fts) VALUES ('rebuild')")
+                tablas.append(tabla)
+            elif dialecto == 'mysql':
+                connection.exec_driver_sql(f'OPTIMIZE TABLE {tabla}')
+                tablas.append(tabla)
+
+    _fts_disponible.clear()
+    return tablas
+
+def register_search_ddl():
+    """Crea/elimina las tablas FTS5 junto con las tablas base en SQLite (idempotente)"""
+    for tabla, (modelo, columnas) in INDICES.items():
+        table = modelo.__table__
+        if table.info.get('fts_registrado'):
+            continue
+        for sentencia in _ddl_fts_sqlite(tabla, columnas):
+            event.listen(table, 'after_create', DDL(sentencia).execute_if(dialect='sqlite'))
+        event.listen(table, 'before_drop', DDL(f'DROP TABLE IF EXISTS {tabla}_fts').execute_if(dialect='sqlite'))
+        table.info['fts_registrado'] = True
@@ -0,0 +1,73 @@
+"""
+Capa de serialización para respuestas de listas y detalle.
+
+Vacante.to_dict() por sí solo carga de forma perezosa cliente, ejecutivo,
+reclutador, reclutador_lider y los contadores. Aquí se arma una sola consulta
+por página que trae todo eso con JOIN (los contadores vienen de la tabla
+vacante_contadores, sin tocar candidatos_posiciones) y se emite exactamente
+el mismo JSON.
+"""
+from sqlalchemy.orm import joinedload, selectinload, undefer
+from models import Vacante, Candidato, CandidatosPositions, Entrevista, Cliente
+
+def vacante_eager_options():
+    """Relaciones muchos-a-uno que to_dict() necesita, cargadas con JOIN"""
+    return (
+        joinedload(Vacante.cliente),
+        joinedload(Vacante.ejecutivo),
+        joinedload(Vacante.reclutador),
+        joinedload(Vacante.reclutador_lider),
+        joinedload(Vacante.contadores),
+    )
+
+def con_opciones_vacante(query):
+    """Recibe una consulta de Vacante ya filtrada/ordenada y le agrega la carga ansiosa"""
+    return query.options(*vacante_eager_options())
+
+def serialize_vacantes(vacantes):
+    return [vacante.to_dict() for vacante in vacantes]
+
+def get_vacante_con_relaciones(vacante_id):
+    """Una vacante con usuarios, cliente y contadores en una sola consulta, o None"""
+    return con_opciones_vacante(
+        Vacante.query.filter(Vacante.id == vacante_id)
+    ).first()
+
+def load_candidatos_posiciones(vacante_id):
+    """
+    Asignaciones de una vacante con el candidato completo (incluyendo lo que
+    Candidato.to_dict() necesita) cargado en un número fijo de consultas
+    """
+    return CandidatosPositions.query.options(
+        joinedload(CandidatosPositions.candidato).joinedload(Candidato.reclutador_asignado),
+        joinedload(CandidatosPositions.candidato)
+            .selectinload(Candidato.candidatos_posiciones)
+            .joinedload(CandidatosPositions.vacante),
+        joinedload(CandidatosPositions.vacante)
+    ).filter(CandidatosPositions.vacante_id == vacante_id).all()
+
+# Opciones de carga para el resto de listados
+
+def candidato_eager_options():
+    return (
+        joinedload(Candidato.reclutador_asignado),
+        selectinload(Candidato.candidatos_posiciones).joinedload(CandidatosPositions.vacante),
+    )
+
+def entrevista_eager_options():
+    return (
+        joinedload(Entrevista.candidato_rel),
+        joinedload(Entrevista.vacante_rel),
+        joinedload(Entrevista.entrevistador),
+    )
+
+def candidato_posicion_eager_options():
+    return (
+        joinedload(CandidatosPositions.candidato),
+        joinedload(CandidatosPositions.vacante),
+    )
+
+def cliente_eager_options():
+    return (
+        undefer(Cliente.total_vacantes),
+    )
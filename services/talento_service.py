@@ -0,0 +1,412 @@
+"""
+Búsqueda de talento (/api/candidatos/talent-search).
+
+Índice invertido persistente sobre el texto de los CV (documento_texto) y
+comentarios_generales, ubicacion y nivel_ingles del candidato, con ranking
+BM25 y análisis en español (utils/texto_es.py):
+
+- talento_termino: término y df (candidatos que lo contienen)
+- talento_posting: término, candidato, tf y peso
+- talento_documento: largo (términos) y firma del contenido indexado
+
+El peso es la parte de BM25 que depende del candidato,
+tf * (k1 + 1) / (tf + k1 * (1 - b + b * largo / largo_promedio)), con el
+largo promedio del momento en que se indexó; el idf se calcula al buscar con
+el df actual. `flask reconstruir-indice-talento` recalcula todo con el
+promedio vigente.
+
+Actualización incremental: cada flush que agrega o elimina un candidato, un
+CV o su texto, o que cambia un campo indexado, encola el trabajo
+'indexar_talento' en la misma transacción. El worker reindexa solo los
+candidatos cuyo contenido cambió (firma) y ajusta df y postings.
+
+Consulta: de cada término se leen sus postings en orden de peso (índice
+termino_id, peso), como máximo TALENTO_POSTINGS_POR_TERMINO, y los
+candidatos encontrados se completan con sus postings de los demás términos.
+Solo se completan los TALENTO_MAX_RESULTADOS mejores. La latencia no depende
+de cuántos candidatos contengan un término común; un candidato que no está
+entre los más relevantes de ningún término puede quedar fuera.
+"""
+import hashlib
+import heapq
+import math
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import event, func, inspect
+from extensions import db
+from models import Candidato, Documento, DocumentoTexto, TalentoDocumento, TalentoPosting, TalentoTermino
+from services.trabajo_service import encolar
+from utils.metrics import metricas
+from utils.texto_es import analizar
+
+K1 = 1.2
+B = 0.75
+
+# Campos del candidato que se indexan junto con el texto de sus CV
+CAMPOS_CANDIDATO = ('comentarios_generales', 'ubicacion', 'nivel_ingles')
+
+# Ids por sentencia IN (...)
+LOTE_IDS = 500
+
+def _en_lotes(valores, tamano=LOTE_IDS):
+    valores = list(valores)
+    for inicio in range(0, len(valores), tamano):
+        yield valores[inicio:inicio + tamano]
+
+class EstadisticasIndice:
+    """Candidatos indexados y largo promedio, por worker (se releen cada TALENTO_ESTADISTICAS_INTERVALO segundos)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._origen = None
+        self._valores = (0, 0.0)
+        self._leido = 0.0
+
+    def obtener(self, forzar=False):
+        """(candidatos con contenido, largo promedio)"""
+        origen = str(db.engine.url)
+        intervalo = current_app.config.get('TALENTO_ESTADISTICAS_INTERVALO', 60)
+        # Un índice vacío se vuelve a consultar siempre (es barato y evita esperar el intervalo)
+        if (not forzar and self._origen == origen and self._valores[0]
+                and time.monotonic() - self._leido < intervalo):
+            return self._valores
+
+        total, promedio = db.session.query(
+            func.count(TalentoDocumento.candidato_id), func.avg(TalentoDocumento.longitud)
+        ).filter(TalentoDocumento.longitud > 0).one()
+        with self._lock:
+            self._origen = origen
+            self._valores = (total or 0, float(promedio or 0))
+            self._leido = time.monotonic()
+        return self._valores
+
+    def reporte(self):
+        total, promedio = self._valores
+        return {'candidatos': total, 'largo_promedio': round(promedio, 2)}
+
+estadisticas_indice = EstadisticasIndice()
+metricas.registrar_proveedor('indice_talento', estadisticas_indice.reporte)
+
+def peso_bm25(tf, longitud, promedio):
+    normalizacion = 1 - B + B * (longitud / promedio if promedio else 1)
+    return tf * (K1 + 1) / (tf + K1 * normalizacion)
+
+def _contenidos(candidato_ids):
+    """candidato_id -> texto a indexar, solo de los candidatos que existen"""
+    contenidos = {}
+    for id_, comentarios, ubicacion, nivel_ingles in db.session.query(
+        Candidato.id, Candidato.comentarios_generales, Candidato.ubicacion, Candidato.nivel_ingles
+    ).filter(Candidato.id.in_(candidato_ids)):
+        contenidos[id_] = [comentarios or '', ubicacion or '', f'inglés {nivel_ingles}' if nivel_ingles else '']
+
+    # Texto de los CV; un mismo archivo subido dos veces cuenta una sola vez
+    vistos = set()
+    for candidato_id, sha256, texto in db.session.query(
+        Documento.candidato_id, DocumentoTexto.sha256, DocumentoTexto.texto
+    ).join(DocumentoTexto, DocumentoTexto.documento_id == Documento.id).filter(
+        Documento.candidato_id.in_(candidato_ids),
+        Documento.tipo == 'cv',
+        DocumentoTexto.estado == 'completado'
+    ).order_by(Documento.id):
+        if candidato_id in contenidos and (candidato_id, sha256) not in vistos:
+            vistos.add((candidato_id, sha256))
+            contenidos[candidato_id].append(texto or '')
+
+    return {id_: '\n'.join(partes) for id_, partes in contenidos.items()}
+
+def _ids_terminos(terminos):
+    """termino -> id, creando los que faltan"""
+    tabla = TalentoTermino.__table__
+    ids = {}
+    for lote in _en_lotes(terminos):
+        ids.update(db.session.execute(
+            db.select(tabla.c.termino, tabla.c.id).where(tabla.c.termino.in_(lote))
+        ).all())
+    nuevos = [termino for termino in terminos if termino not in ids]
+    if nuevos:
+        db.session.execute(tabla.insert(), [{'termino': termino, 'df': 0} for termino in nuevos])
+        for lote in _en_lotes(nuevos):
+            ids.update(db.session.execute(
+                db.select(tabla.c.termino, tabla.c.id).where(tabla.c.termino.in_(lote))
+            ).all())
+    return ids
+
+def _indexar_lote(candidato_ids, promedio):
+    contenidos = _contenidos(candidato_ids)
+    firmas = dict(db.session.execute(
+        db.select(TalentoDocumento.candidato_id, TalentoDocumento.firma).where(
+            TalentoDocumento.candidato_id.in_(candidato_ids)
+        )
+    ).all())
+
+    # candidato_id -> (firma, Counter de términos), o None si sale del índice
+    cambios = {}
+    for candidato_id in candidato_ids:
+        contenido = contenidos.get(candidato_id)
+        if contenido is None:
+            if candidato_id in firmas:
+                cambios[candidato_id] = None
+            continue
+        firma = hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+        if firmas.get(candidato_id) != firma:
+            cambios[candidato_id] = (firma, Counter(analizar(contenido)))
+    if not cambios:
+        return 0
+
+    posting = TalentoPosting.__table__
+    documento = TalentoDocumento.__table__
+    termino = TalentoTermino.__table__
+    ids_cambiados = list(cambios)
+
+    # df: -1 por cada término que tenía el candidato, +1 por cada término nuevo
+    deltas = Counter(termino_id for (termino_id,) in db.session.execute(
+        db.select(posting.c.termino_id).where(posting.c.candidato_id.in_(ids_cambiados))
+    ))
+    for termino_id in deltas:
+        deltas[termino_id] = -deltas[termino_id]
+    db.session.execute(posting.delete().where(posting.c.candidato_id.in_(ids_cambiados)))
+    db.session.execute(documento.delete().where(documento.c.candidato_id.in_(ids_cambiados)))
+
+    nuevos = {candidato_id: cambio for candidato_id, cambio in cambios.items() if cambio is not None}
+    ids = _ids_terminos(sorted({t for _, terminos in nuevos.values() for t in terminos}))
+    filas_posting = []
+    filas_documento = []
+    ahora = datetime.utcnow()
+    for candidato_id, (firma, terminos) in nuevos.items():
+        longitud = sum(terminos.values())
+        for texto, tf in terminos.items():
+            termino_id = ids[texto]
+            deltas[termino_id] += 1
+            filas_posting.append({
+                'termino_id': termino_id, 'candidato_id': candidato_id, 'tf': tf,
+                'peso': peso_bm25(tf, longitud, promedio or longitud)
+            })
+        filas_documento.append({'candidato_id': candidato_id, 'longitud': longitud, 'firma': firma, 'fecha_indexado': ahora})
+
+    for lote in _en_lotes(filas_posting, 5000):
+        db.session.execute(posting.insert(), lote)
+    if filas_documento:
+        db.session.execute(documento.insert(), filas_documento)
+
+    # Un UPDATE por valor de delta (casi siempre +1 / -1)
+    por_delta = defaultdict(list)
+    for termino_id, delta in deltas.items():
+        if delta:
+            por_delta[delta].append(termino_id)
+    for delta, termino_ids in por_delta.items():
+        for lote in _en_lotes(termino_ids):
+            db.session.execute(termino.update().where(termino.c.id.in_(lote)).values(df=termino.c.df + delta))
+
+    return len(cambios)
+
+def indexar_candidatos(candidato_ids):
+    """
+    Actualiza el índice de los candidatos (los que ya no existen salen del
+    índice). No hace commit. Retorna cuántos cambiaron.
+    """
+    _, promedio = estadisticas_indice.obtener()
+    actualizados = 0
+    with metricas.medir('talento.indexar'):
+        for lote in _en_lotes(sorted(set(candidato_ids))):
+            actualizados += _indexar_lote(lote, promedio)
+    metricas.incrementar('talento.candidatos_indexados', actualizados)
+    return actualizados
+
+def recalcular_pesos(lote=5000):
+    """Recalcula el peso de todos los postings con el largo promedio actual. Hace commit por lote."""
+    _, promedio = estadisticas_indice.obtener(forzar=True)
+    if not promedio:
+        return 0
+    posting = TalentoPosting.__table__
+    documento = TalentoDocumento.__table__
+    longitud = db.select(documento.c.longitud).where(
+        documento.c.candidato_id == posting.c.candidato_id
+    ).scalar_subquery()
+    peso = posting.c.tf * (K1 + 1) / (posting.c.tf + K1 * (1 - B + B * longitud / promedio))
+
+    ultimo = 0
+    while True:
+        limite = db.session.execute(
+            db.select(documento.c.candidato_id).where(documento.c.candidato_id > ultimo)
+            .order_by(documento.c.candidato_id).offset(lote - 1).limit(1)
+        ).scalar()
+        condicion = posting.c.candidato_id > ultimo
+        if limite is not None:
+            condicion &= posting.c.candidato_id <= limite
+        db.session.execute(posting.update().where(condicion).values(peso=peso))
+        db.session.commit()
+        if limite is None:
+            return promedio
+        ultimo = limite
+
+def reconstruir_indice(lote=500, progreso=None):
+    """
+    Vacía el índice y lo vuelve a crear con todos los candidatos, y al final
+    recalcula los pesos con el largo promedio definitivo. Hace commit por
+    lote. progreso(candidatos, segundos) se llama después de cada lote.
+    Retorna el número de candidatos indexados.
+    """
+    for modelo in (TalentoPosting, TalentoDocumento, TalentoTermino):
+        db.session.execute(modelo.__table__.delete())
+    db.session.commit()
+
+    inicio = time.perf_counter()
+    ultimo = 0
+    total = 0
+    while True:
+        ids = [id_ for (id_,) in db.session.query(Candidato.id).filter(Candidato.id > ultimo)
+               .order_by(Candidato.id).limit(lote)]
+        if not ids:
+            break
+        ultimo = ids[-1]
+        _, promedio = estadisticas_indice.obtener(forzar=True)
+        total += _indexar_lote(ids, promedio)
+        db.session.commit()
+        db.session.expunge_all()
+        if progreso:
+            progreso(total, time.perf_counter() - inicio)
+
+    recalcular_pesos()
+    return total
+
+def buscar_talento(consulta, reclutador_id=None, estado=None):
+    """
+    Candidatos para la consulta en orden de relevancia, como lista de
+    (candidato_id, puntuacion, terminos_coincidentes), y los términos
+    buscados. Con reclutador_id solo sus candidatos; con estado, solo los
+    candidatos en ese estado.
+    """
+    terminos = list(dict.fromkeys(analizar(consulta)))
+    if not terminos:
+        return [], terminos
+
+    config = current_app.config
+    maximo = config.get('TALENTO_POSTINGS_POR_TERMINO', 2000)
+    limite = config.get('TALENTO_MAX_RESULTADOS', 1000)
+    total, _ = estadisticas_indice.obtener()
+    filas = db.session.execute(
+        db.select(TalentoTermino.id, TalentoTermino.df).where(
+            TalentoTermino.termino.in_(terminos), TalentoTermino.df > 0
+        )
+    ).all()
+    if not filas:
+        return [], terminos
+
+    # total puede estar desactualizado (se relee cada TALENTO_ESTADISTICAS_INTERVALO segundos)
+    idf = {termino_id: math.log(1 + (max(total, df) - df + 0.5) / (df + 0.5)) for termino_id, df in filas}
+    posting = TalentoPosting.__table__
+
+    # Con alcance, IN (subconsulta): la base puede partir de los candidatos del
+    # reclutador y buscar sus postings por la llave primaria (termino_id, candidato_id)
+    alcance = None
+    if reclutador_id is not None or estado:
+        alcance = db.select(Candidato.id)
+        if reclutador_id is not None:
+            alcance = alcance.where(Candidato.reclutador_id == reclutador_id)
+        if estado:
+            alcance = alcance.where(Candidato.estado == estado)
+
+    def postings(condicion):
+        query = db.select(posting.c.termino_id, posting.c.candidato_id, posting.c.peso).where(condicion)
+        if alcance is not None:
+            query = query.where(posting.c.candidato_id.in_(alcance))
+        return query
+
+    puntuaciones = defaultdict(float)
+    coincidencias = Counter()
+    # termino_id -> candidatos ya sumados, de los términos que se leyeron recortados
+    leidos = {}
+
+    with metricas.medir('talento.buscar'):
+        for termino_id, peso_termino in idf.items():
+            resultado = db.session.execute(
+                postings(posting.c.termino_id == termino_id).order_by(posting.c.peso.desc()).limit(maximo)
+            ).all()
+            if len(resultado) == maximo:
+                leidos[termino_id] = {candidato_id for _, candidato_id, _ in resultado}
+            for _, candidato_id, peso in resultado:
+                puntuaciones[candidato_id] += peso_termino * peso
+                coincidencias[candidato_id] += 1
+
+        # Completar la puntuación con los términos que se leyeron recortados. Basta
+        # con los mejores `limite`: completar solo sube puntuaciones, así que
+        # ninguno de los demás puede quedar por encima de ellos.
+        if leidos and len(idf) > 1:
+            mejores = heapq.nlargest(limite, puntuaciones, key=puntuaciones.get)
+            for lote in _en_lotes(mejores, 1000):
+                for termino_id, candidato_id, peso in db.session.execute(postings(
+                    posting.c.termino_id.in_(list(leidos)) & posting.c.candidato_id.in_(lote)
+                )).all():
+                    if candidato_id not in leidos[termino_id]:
+                        puntuaciones[candidato_id] += idf[termino_id] * peso
+                        coincidencias[candidato_id] += 1
+
+    resultados = heapq.nsmallest(
+        limite,
+        ((candidato_id, puntuacion, coincidencias[candidato_id]) for candidato_id, puntuacion in puntuaciones.items()),
+        key=lambda resultado: (-resultado[1], resultado[0])
+    )
+    return resultados, terminos
+
+def _anteriores(obj, campo):
+    """Valores del atributo antes y después del flush"""
+    history = inspect(obj).attrs[campo].history
+    return set(history.deleted) | set(history.added) | set(history.unchanged)
+
+def _candidatos_afectados(session):
+    candidato_ids = set()
+    documento_ids = set()
+
+    for obj in session.new | session.deleted:
+        if isinstance(obj, Candidato):
+            candidato_ids.add(obj.id)
+        elif isinstance(obj, DocumentoTexto):
+            documento_ids.add(obj.documento_id)
+        elif isinstance(obj, Documento) and obj.tipo == 'cv' and obj in session.deleted:
+            # Un CV nuevo todavía no tiene texto: se indexa cuando se extrae
+            candidato_ids.add(obj.candidato_id)
+
+    for obj in session.dirty:
+        if isinstance(obj, Candidato):
+            state = inspect(obj)
+            if any(state.attrs[campo].history.has_changes() for campo in CAMPOS_CANDIDATO):
+                candidato_ids.add(obj.id)
+        elif isinstance(obj, Documento):
+            state = inspect(obj)
+            if state.attrs.tipo.history.has_changes() or state.attrs.candidato_id.history.has_changes():
+                candidato_ids.update(_anteriores(obj, 'candidato_id'))
+        elif isinstance(obj, DocumentoTexto) and session.is_modified(obj):
+            documento_ids.add(obj.documento_id)
+
+    if documento_ids:
+        tabla = Documento.__table__
+        candidato_ids.update(session.connection().execute(
+            db.select(tabla.c.candidato_id).where(tabla.c.id.in_(documento_ids))
+        ).scalars())
+
+    candidato_ids.discard(None)
+    return candidato_ids
+
+def _after_flush(session, flush_context):
+    candidato_ids = _candidatos_afectados(session)
+    if candidato_ids:
+        session.info.setdefault('talento_pendientes', set()).update(candidato_ids)
+
+def _after_flush_postexec(session, flush_context):
+    # El trabajo se agrega después del flush; el commit lo guarda en la misma transacción
+    candidato_ids = session.info.pop('talento_pendientes', None)
+    if candidato_ids:
+        encolar('indexar_talento', {'candidato_ids': sorted(candidato_ids)})
+
+def _after_rollback(session):
+    session.info.pop('talento_pendientes', None)
+
+def register_talento_events():
+    """Registra los listeners de la sesión (idempotente)"""
+    if not event.contains(db.session, 'after_flush', _after_flush):
+        event.listen(db.session, 'after_flush', _after_flush)
+        event.listen(db.session, 'after_flush_postexec', _after_flush_postexec)
+        event.listen(db.session, 'after_rollback', _after_rollback)
@@ -0,0 +1,111 @@
+"""
+Tareas que procesa `flask worker` (ver services/trabajo_service.py).
+
+Cada función recibe los parámetros con que se encoló y retorna un dict
+serializable a JSON, que queda como resultado del trabajo.
+"""
+from extensions import db
+from models import Vacante
+from services.trabajo_service import tarea, reportar_progreso
+
+@tarea('actualizar_dias_transcurridos', manual=True)
+def actualizar_dias_transcurridos():
+    from services.mantenimiento_service import actualizar_dias_transcurridos as actualizar
+    return {'vacantes_actualizadas': actualizar()}
+
+@tarea('reconciliar_contadores', manual=True)
+def reconciliar_contadores(vacante_ids=None):
+    from services.contadores_service import reconciliar_contadores as reconciliar
+    return {'vacantes': reconciliar(vacante_ids or None)}
+
+@tarea('reconstruir_dashboard', manual=True)
+def reconstruir_dashboard(solo_obsoletos=False, alcance=None, usuario_id=None):
+    """Todos los alcances (o los obsoletos), o solo `alcance` cuando lo encola /api/reports/dashboard"""
+    from services.dashboard_snapshot_service import reconstruir_snapshots, recalcular_si_corresponde
+    if alcance:
+        return {'alcances_recalculados': int(recalcular_si_corresponde((alcance, usuario_id)))}
+    return {'alcances_recalculados': reconstruir_snapshots(solo_obsoletos=solo_obsoletos)}
+
+@tarea('reconstruir_indices_busqueda', manual=True, tiempo_maximo=1800)
+def reconstruir_indices_busqueda():
+    from services.search_service import reconstruir_indices
+    return {'tablas': reconstruir_indices()}
+
+@tarea('transicion_candidatos', max_concurrencia=4)
+def transicion_candidatos(vacante_id, candidatos_ids, cambios):
+    """Transición masiva encolada desde POST /api/vacantes/<id>/candidatos/transicion"""
+    from services.transicion_service import transicion_masiva, valores_transicion
+    
+    valores = valores_transicion(cambios)
+    resultado = transicion_masiva(vacante_id, candidatos_ids, valores)
+    if 'contratado_status' in valores:
+        db.session.get(Vacante, vacante_id).actualizar_status_final()
+    return resultado
+
+@tarea('extraer_texto_cv', max_concurrencia=2, tiempo_maximo=1800)
+def extraer_texto_cv(documento_ids):
+    """Texto de los CV recién subidos (ver services/cv_texto_service.py)"""
+    from services.cv_texto_service import extraer_documentos
+    
+    estadisticas = extraer_documentos(documento_ids)
+    errores = estadisticas['errores']
+    if errores:
+        # Los demás ya se guardaron; el reintento solo descarga los que fallaron
+        raise RuntimeError(f'{len(errores)} documento(s) sin descargar: {errores[0]["error"]}')
+    return estadisticas
+
+@tarea('extraer_texto_cv_pendientes', manual=True, tiempo_maximo=600)
+def extraer_texto_cv_pendientes(reprocesar=False):
+    """Backfill de todos los CV sin texto (equivale a `flask extraer-texto-cv`)"""
+    from services.cv_texto_service import extraer_pendientes
+    
+    return extraer_pendientes(
+        reprocesar=reprocesar,
+        progreso=lambda totales, segundos: reportar_progreso(**totales, segundos=round(segundos, 2))
+    )
+
+@tarea('indexar_talento', tiempo_maximo=1800)
+def indexar_talento(candidato_ids):
+    """Actualización incremental del índice de talento (encolada por services/talento_service.py)"""
+    from services.talento_service import indexar_candidatos
+    return {'candidatos_actualizados': indexar_candidatos(candidato_ids)}
+
+@tarea('reconstruir_indice_talento', manual=True, tiempo_maximo=600)
+def reconstruir_indice_talento():
+    from services.talento_service import reconstruir_indice
+    
+    candidatos = reconstruir_indice(
+        progreso=lambda candidatos, segundos: reportar_progreso(candidatos=candidatos, segundos=round(segundos, 2))
+    )
+    return {'candidatos': candidatos}
+
+@tarea('importar_datos', max_concurrencia=2, max_intentos=1, tiempo_maximo=600)
+def importar_datos(entidad, key, nombre, usuario_id, codificacion='utf-8-sig'):
+    """
+    Importación CSV/XLSX encolada desde POST /api/importaciones/<entidad>. Un
+    solo intento: los lotes ya confirmados se duplicarían al reintentar.
+    """
+    from contextlib import closing
+    from services.almacenamiento_service import obtener_almacenamiento
+    from services.importacion_service import importar
+    
+    almacenamiento = obtener_almacenamiento()
+    try:
+        with closing(almacenamiento.abrir(key)) as archivo:
+            return importar(
+                entidad, archivo, nombre, usuario_id, codificacion,
+                progreso=lambda totales: reportar_progreso(
+                    filas=totales['filas'], importadas=totales['importadas'], con_errores=totales['con_errores']
+                )
+            )
+    finally:
+        almacenamiento.delete_file(key)
+
+@tarea('exportar_tracker', max_concurrencia=2, max_intentos=2, tiempo_maximo=600)
+def exportar_tracker(alcance, usuario_id, version):
+    """Tracker XLSX de un alcance encolado desde GET /api/exports/tracker"""
+    from services.tracker_service import generar_tracker
+    return generar_tracker(
+        (alcance, usuario_id), version,
+        progreso=lambda filas: reportar_progreso(filas=filas)
+    )
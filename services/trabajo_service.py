@@ -0,0 +1,235 @@
+"""
+Trabajos en segundo plano con la cola en la tabla trabajo.
+
+Las rutas lentas encolan con encolar(tipo, parametros) y responden 202 con el
+id; el cliente consulta GET /api/trabajos/<id> hasta que termina. `flask
+worker` toma los trabajos pendientes y ejecuta la función registrada para su
+tipo con @tarea (services/tareas_service.py).
+
+- Si la función lanza una excepción, el trabajo vuelve a la cola con espera
+  exponencial (TRABAJOS_ESPERA_BASE * 2^(intento - 1), con variación
+  aleatoria) hasta agotar max_intentos; después queda 'fallido'.
+- Cada tipo tiene un máximo de trabajos en proceso a la vez, contando todos
+  los workers. Se verifica al tomar cada trabajo, así que con varios workers
+  puede excederse momentáneamente por uno.
+- Un trabajo tomado queda bloqueado hasta bloqueado_hasta (tiempo_maximo de
+  su tipo; reportar_progreso() lo renueva). Si vence, el worker murió y el
+  trabajo vuelve a la cola.
+"""
+import json
+import os
+import random
+import socket
+import threading
+from collections import namedtuple
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import func
+from extensions import db
+from models import Trabajo
+from utils.metrics import metricas
+
+Tarea = namedtuple('Tarea', ['funcion', 'max_concurrencia', 'max_intentos', 'tiempo_maximo', 'manual'])
+
+# tipo -> Tarea
+TAREAS = {}
+
+_actual = threading.local()
+
+class TipoTrabajoDesconocido(ValueError):
+    pass
+
+def tarea(tipo, max_concurrencia=1, max_intentos=3, tiempo_maximo=600, manual=False):
+    """
+    Registra funcion(**parametros) -> dict como el trabajo `tipo`. La función
+    corre dentro de un app context y su sesión se confirma al terminar.
+    manual=True permite que un administrador la encole con POST /api/trabajos.
+    """
+    def decorador(funcion):
+        TAREAS[tipo] = Tarea(funcion, max_concurrencia, max_intentos, tiempo_maximo, manual)
+        return funcion
+    return decorador
+
+def cargar_tareas():
+    """Importa los módulos que registran tareas"""
+    import services.tareas_service  # noqa: F401
+    return TAREAS
+
+def encolar(tipo, parametros=None, usuario_id=None, disponible_en=None):
+    """Agrega un trabajo a la cola. No hace commit."""
+    cargar_tareas()
+    if tipo not in TAREAS:
+        raise TipoTrabajoDesconocido(f'Tipo de trabajo desconocido: {tipo}')
+
+    trabajo = Trabajo(
+        tipo=tipo,
+        parametros=json.dumps(parametros or {}),
+        usuario_id=usuario_id,
+        max_intentos=TAREAS[tipo].max_intentos,
+        disponible_en=disponible_en or datetime.utcnow()
+    )
+    db.session.add(trabajo)
+    metricas.incrementar(f'trabajos.{tipo}.encolados')
+    return trabajo
+
+def reportar_progreso(**datos):
+    """
+    Guarda un resultado parcial del trabajo en curso (visible al consultar su
+    estado) y renueva su bloqueo. Usa una conexión aparte: no toca la
+    transacción de la tarea.
+    """
+    trabajo_id = getattr(_actual, 'trabajo_id', None)
+    if trabajo_id is None:
+        return
+    tabla = Trabajo.__table__
+    with db.engine.begin() as connection:
+        connection.execute(tabla.update().where(tabla.c.id == trabajo_id).values(
+            resultado=json.dumps(datos),
+            bloqueado_hasta=datetime.utcnow() + timedelta(seconds=_actual.tiempo_maximo)
+        ))
+
+def _liberar_vencidos(ahora):
+    """Trabajos en proceso cuyo worker dejó de renovar el bloqueo"""
+    tabla = Trabajo.__table__
+    vencidos = (tabla.c.estado == 'en_proceso') & (tabla.c.bloqueado_hasta < ahora)
+    error = 'El worker dejó de responder'
+    db.session.execute(tabla.update().where(vencidos & (tabla.c.intentos < tabla.c.max_intentos)).values(
+        estado='pendiente', bloqueado_por=None, bloqueado_hasta=None, disponible_en=ahora, error=error
+    ))
+    db.session.execute(tabla.update().where(vencidos).values(
+        estado='fallido', bloqueado_por=None, bloqueado_hasta=None, fecha_fin=ahora, error=error
+    ))
+    db.session.commit()
+
+def _tomar(worker_id, tipos):
+    """Marca como en proceso el siguiente trabajo disponible. Retorna su id o None."""
+    ahora = datetime.utcnow()
+    tabla = Trabajo.__table__
+
+    en_proceso = dict(db.session.execute(
+        db.select(tabla.c.tipo, func.count()).where(
+            tabla.c.estado == 'en_proceso', tabla.c.tipo.in_(tipos)
+        ).group_by(tabla.c.tipo)
+    ).all())
+    libres = [tipo for tipo in tipos if en_proceso.get(tipo, 0) < TAREAS[tipo].max_concurrencia]
+    if not libres:
+        db.session.rollback()
+        return None
+
+    candidatos = db.session.execute(
+        db.select(tabla.c.id, tabla.c.tipo).where(
+            tabla.c.estado == 'pendiente', tabla.c.disponible_en <= ahora, tabla.c.tipo.in_(libres)
+        ).order_by(tabla.c.disponible_en, tabla.c.id).limit(10)
+    ).all()
+
+    for trabajo_id, tipo in candidatos:
+        # Otro worker pudo tomarlo entre el SELECT y el UPDATE: solo gana uno
+        result = db.session.execute(
+            tabla.update().where((tabla.c.id == trabajo_id) & (tabla.c.estado == 'pendiente')).values(
+                estado='en_proceso',
+                bloqueado_por=worker_id,
+                bloqueado_hasta=ahora + timedelta(seconds=TAREAS[tipo].tiempo_maximo),
+                intentos=tabla.c.intentos + 1,
+                fecha_inicio=ahora
+            )
+        )
+        if result.rowcount:
+            db.session.commit()
+            return trabajo_id
+
+    db.session.rollback()
+    return None
+
+def _finalizar(trabajo_id, worker_id, **valores):
+    tabla = Trabajo.__table__
+    db.session.execute(
+        tabla.update().where((tabla.c.id == trabajo_id) & (tabla.c.bloqueado_por == worker_id)).values(
+            bloqueado_por=None, bloqueado_hasta=None, **valores
+        )
+    )
+    db.session.commit()
+
+def _ejecutar(trabajo_id, worker_id):
+    config = current_app.config
+    trabajo = db.session.get(Trabajo, trabajo_id)
+    tipo, intentos, max_intentos = trabajo.tipo, trabajo.intentos, trabajo.max_intentos
+    parametros = json.loads(trabajo.parametros or '{}')
+    tarea_registrada = TAREAS[tipo]
+    db.session.commit()
+
+    _actual.trabajo_id = trabajo_id
+    _actual.tiempo_maximo = tarea_registrada.tiempo_maximo
+    try:
+        with metricas.medir(f'trabajos.{tipo}'):
+            resultado = tarea_registrada.funcion(**parametros)
+            db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.exception(f'Trabajo {trabajo_id} ({tipo}) falló en el intento {intentos}')
+        ahora = datetime.utcnow()
+        if intentos < max_intentos:
+            espera = min(
+                config.get('TRABAJOS_ESPERA_BASE', 5) * 2 ** (intentos - 1),
+                config.get('TRABAJOS_ESPERA_MAXIMA', 600)
+            ) * random.uniform(0.75, 1.25)
+            _finalizar(trabajo_id, worker_id, estado='pendiente', error=str(e),
+                       disponible_en=ahora + timedelta(seconds=espera))
+            metricas.incrementar(f'trabajos.{tipo}.reintentos')
+        else:
+            _finalizar(trabajo_id, worker_id, estado='fallido', error=str(e), fecha_fin=ahora)
+            metricas.incrementar(f'trabajos.{tipo}.fallidos')
+        return
+    finally:
+        _actual.trabajo_id = None
+
+    _finalizar(trabajo_id, worker_id, estado='completado', error=None, fecha_fin=datetime.utcnow(),
+               resultado=json.dumps(resultado if resultado is not None else {}, default=str))
+    metricas.incrementar(f'trabajos.{tipo}.completados')
+
+def procesar_siguiente(worker_id, tipos=None):
+    """Toma y ejecuta un trabajo. Retorna False si no había ninguno disponible."""
+    cargar_tareas()
+    tipos = [tipo for tipo in (tipos or TAREAS) if tipo in TAREAS]
+    _liberar_vencidos(datetime.utcnow())
+    trabajo_id = _tomar(worker_id, tipos)
+    if trabajo_id is None:
+        return False
+    _ejecutar(trabajo_id, worker_id)
+    return True
+
+def ejecutar_worker(app, hilos=1, tipos=None, una_vez=False, detener=None):
+    """
+    Procesa la cola con `hilos` hilos hasta que se active `detener` (o, con
+    una_vez, hasta que no queden trabajos disponibles). Cada hilo usa su propio
+    app context y sesión.
+    """
+    detener = detener or threading.Event()
+    intervalo = app.config.get('TRABAJOS_INTERVALO', 1)
+    base = f'{socket.gethostname()}:{os.getpid()}'
+
+    def bucle(numero):
+        worker_id = f'{base}:{numero}'
+        while not detener.is_set():
+            with app.app_context():
+                try:
+                    procesado = procesar_siguiente(worker_id, tipos)
+                except Exception:
+                    app.logger.exception('Error en el worker de trabajos')
+                    db.session.rollback()
+                    procesado = False
+            if not procesado:
+                if una_vez:
+                    return
+                detener.wait(intervalo)
+
+    threads = [threading.Thread(target=bucle, args=(numero,), name=f'worker-{numero}') for numero in range(hilos)]
+    for thread in threads:
+        thread.start()
+    try:
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(0.5)
+    except KeyboardInterrupt:
+        detener.set()
+        for thread in threads:
+            thread.join()
@@ -0,0 +1,248 @@
+"""
+Tracker de vacantes en Excel (GET /api/exports/tracker).
+
+El libro tiene tres hojas (Vacantes, Por reclutador y Por cliente); cada una
+es una sola consulta agregada (los contadores del pipeline salen de
+vacante_contadores) que se lee con cursor del lado del servidor y se escribe
+con openpyxl en modo write_only, así que la memoria no depende del número de
+vacantes. Lo genera el trabajo 'exportar_tracker' y queda en el
+almacenamiento con la versión de los datos en el key: mientras no cambie, la
+misma descarga se sirve sin volver a calcular nada.
+
+La versión combina la del snapshot del dashboard del alcance (se incrementa
+con cada cambio en vacantes, candidatos, asignaciones o entrevistas que el
+alcance ve), las de clientes y usuarios (nombres en las hojas) y la fecha
+(días transcurridos).
+"""
+import json
+import tempfile
+import time
+from datetime import datetime
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+from sqlalchemy import case, func
+from sqlalchemy.orm import aliased
+from extensions import db
+from models import Cliente, DashboardSnapshot, Trabajo, Usuario, Vacante, VacanteContadores
+from services.almacenamiento_service import obtener_almacenamiento
+from services.dashboard_snapshot_service import recalcular
+from services.exportacion_service import leer_filas
+from services.mantenimiento_service import dias_transcurridos_expr
+from services.version_service import obtener_version
+
+TIPO_TRABAJO = 'exportar_tracker'
+CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+def _contador(campo):
+    return func.coalesce(getattr(VacanteContadores, campo), 0)
+
+def _suma(expr):
+    return func.coalesce(func.sum(expr), 0)
+
+def _contar_si(condicion):
+    return _suma(case((condicion, 1), else_=0))
+
+def _con_alcance(query, alcance):
+    """Mismo filtro por rol que el dashboard"""
+    tipo, usuario_id = alcance
+    if tipo == 'reclutador':
+        return query.where(Vacante.reclutador_id == usuario_id)
+    if tipo == 'ejecutivo':
+        return query.where(Vacante.ejecutivo_id == usuario_id)
+    return query
+
+def _hoja_vacantes(alcance):
+    ejecutivo = aliased(Usuario)
+    reclutador = aliased(Usuario)
+    lider = aliased(Usuario)
+    dias = dias_transcurridos_expr()
+    if dias is None:
+        # Dialecto sin expresión: el valor persistido por el job nocturno
+        dias = Vacante.dias_transcurridos
+    restantes = Vacante.candidatos_requeridos - _contador('total_candidatos')
+
+    columnas = [
+        ('ID', Vacante.id),
+        ('Vacante', Vacante.nombre),
+        ('Cliente', Cliente.nombre),
+        ('CCP', Cliente.ccp),
+        ('Ejecutivo', ejecutivo.nombre),
+        ('Reclutador', reclutador.nombre),
+        ('Reclutador líder', lider.nombre),
+        ('Estado', Vacante.estado),
+        ('Status final', Vacante.status_final),
+        ('Avance', Vacante.avance),
+        ('Prioridad', Vacante.prioridad),
+        ('Posiciones', Vacante.vacantes),
+        ('Candidatos requeridos', Vacante.candidatos_requeridos),
+        ('Fecha solicitud', Vacante.fecha_solicitud),
+        ('Días transcurridos', dias),
+        ('Candidatos', _contador('total_candidatos')),
+        ('Aceptados', _contador('candidatos_aceptados')),
+        ('Contratados', _contador('candidatos_contratados')),
+        ('Rechazados', _contador('candidatos_rechazados')),
+        ('No contratables', _contador('candidatos_no_contratables')),
+        ('Restantes', case((restantes > 0, restantes), else_=0)),
+        ('Fecha cierre', Vacante.fecha_cierre),
+    ]
+    query = db.select(*[expr for _, expr in columnas]).select_from(Vacante) \
+        .outerjoin(Cliente, Cliente.id == Vacante.cliente_id) \
+        .outerjoin(ejecutivo, ejecutivo.id == Vacante.ejecutivo_id) \
+        .outerjoin(reclutador, reclutador.id == Vacante.reclutador_id) \
+        .outerjoin(lider, lider.id == Vacante.reclutador_lider_id) \
+        .outerjoin(VacanteContadores, VacanteContadores.vacante_id == Vacante.id)
+    return [titulo for titulo, _ in columnas], _con_alcance(query, alcance).order_by(Vacante.id)
+
+def _agregados():
+    """Columnas por grupo de vacantes (sumables en la fila de totales)"""
+    return [
+        ('Vacantes', func.count(Vacante.id)),
+        ('Abiertas', _contar_si(Vacante.estado == 'abierta')),
+        ('Pausadas', _contar_si(Vacante.estado == 'pausada')),
+        ('Cerradas', _contar_si(Vacante.estado == 'cerrada')),
+        ('Canceladas', _contar_si(Vacante.estado == 'cancelada')),
+        ('Cubiertas', _contar_si(Vacante.status_final == 'cubierta')),
+        ('Posiciones', _suma(Vacante.vacantes)),
+        ('Candidatos', _suma(_contador('total_candidatos'))),
+        ('Aceptados', _suma(_contador('candidatos_aceptados'))),
+        ('Contratados', _suma(_contador('candidatos_contratados'))),
+        ('Rechazados', _suma(_contador('candidatos_rechazados'))),
+    ]
+
+def _hoja_por_reclutador(alcance):
+    agregados = _agregados()
+    query = db.select(
+        func.coalesce(Usuario.nombre, 'Sin asignar'), Usuario.email, *[expr for _, expr in agregados]
+    ).select_from(Vacante) \
+        .outerjoin(Usuario, Usuario.id == Vacante.reclutador_id) \
+        .outerjoin(VacanteContadores, VacanteContadores.vacante_id == Vacante.id) \
+        .group_by(Vacante.reclutador_id, Usuario.nombre, Usuario.email)
+    query = _con_alcance(query, alcance).order_by(func.count(Vacante.id).desc(), Usuario.nombre)
+    return ['Reclutador', 'Email'] + [titulo for titulo, _ in agregados], query
+
+def _hoja_por_cliente(alcance):
+    agregados = _agregados()
+    query = db.select(
+        func.coalesce(Cliente.nombre, 'Sin cliente'), Cliente.ccp, *[expr for _, expr in agregados]
+    ).select_from(Vacante) \
+        .outerjoin(Cliente, Cliente.id == Vacante.cliente_id) \
+        .outerjoin(VacanteContadores, VacanteContadores.vacante_id == Vacante.id) \
+        .group_by(Vacante.cliente_id, Cliente.nombre, Cliente.ccp)
+    query = _con_alcance(query, alcance).order_by(func.count(Vacante.id).desc(), Cliente.nombre)
+    return ['Cliente', 'CCP'] + [titulo for titulo, _ in agregados], query
+
+# (título, función (alcance) -> (encabezados, SELECT), columnas de texto antes de las sumables o None)
+HOJAS = [
+    ('Vacantes', _hoja_vacantes, None),
+    ('Por reclutador', _hoja_por_reclutador, 2),
+    ('Por cliente', _hoja_por_cliente, 2),
+]
+
+def _en_negrita(hoja, valores):
+    celdas = []
+    for valor in valores:
+        celda = WriteOnlyCell(hoja, value=valor)
+        celda.font = Font(bold=True)
+        celdas.append(celda)
+    return celdas
+
+def _escribir_hoja(libro, titulo, encabezados, query, columnas_texto):
+    """Vuelca la consulta en una hoja nueva. Retorna el número de filas."""
+    hoja = libro.create_sheet(titulo)
+    hoja.freeze_panes = 'A2'
+    for indice, encabezado in enumerate(encabezados, start=1):
+        hoja.column_dimensions[get_column_letter(indice)].width = max(12, len(encabezado) + 2)
+
+    hoja.append(_en_negrita(hoja, encabezados))
+
+    filas = 0
+    totales = [0] * len(encabezados)
+    bloques = leer_filas(query)
+    next(bloques)
+    for bloque in bloques:
+        for fila in bloque:
+            hoja.append(list(fila))
+            if columnas_texto is not None:
+                for indice in range(columnas_texto, len(fila)):
+                    totales[indice] += fila[indice] or 0
+        filas += len(bloque)
+
+    if columnas_texto is not None and filas:
+        hoja.append(_en_negrita(hoja, ['Total'] + [None] * (columnas_texto - 1) + totales[columnas_texto:]))
+    return filas
+
+def escribir_tracker(alcance, destino, progreso=None):
+    """Escribe el libro del alcance en el archivo binario destino. Retorna {hoja: filas}."""
+    libro = Workbook(write_only=True)
+    filas = {}
+    for titulo, consulta, columnas_texto in HOJAS:
+        encabezados, query = consulta(alcance)
+        filas[titulo] = _escribir_hoja(libro, titulo, encabezados, query, columnas_texto)
+        if progreso:
+            progreso(filas)
+    libro.save(destino)
+    return filas
+
+def version_tracker(alcance):
+    """Versión de los datos del tracker del alcance ('snapshot.clientes.usuarios.AAAAMMDD')"""
+    clave = (alcance[0], alcance[1] or 0)
+    snapshot = db.session.get(DashboardSnapshot, clave)
+    if snapshot is None:
+        # Sin fila los cambios no incrementan ninguna versión: se crea calculando el snapshot
+        recalcular(alcance)
+        snapshot = db.session.get(DashboardSnapshot, clave)
+    return '.'.join([
+        str(snapshot.version), str(obtener_version('cliente')), str(obtener_version('usuario')),
+        datetime.utcnow().strftime('%Y%m%d')
+    ])
+
+def parametros_tracker(alcance, version):
+    """Parámetros del trabajo; el mismo dict (y el mismo JSON) para el mismo alcance y versión"""
+    tipo, usuario_id = alcance
+    return {'alcance': tipo, 'usuario_id': usuario_id, 'version': version}
+
+def buscar_trabajo(parametros):
+    """Último trabajo no fallido que genera (o generó) ese tracker, o None"""
+    return Trabajo.query.filter(
+        Trabajo.tipo == TIPO_TRABAJO,
+        Trabajo.estado != 'fallido',
+        Trabajo.parametros == json.dumps(parametros)
+    ).order_by(Trabajo.id.desc()).first()
+
+def _anterior(alcance, version):
+    """Último tracker completado del alcance con otra versión (el que este reemplaza)"""
+    prefijo = json.dumps(parametros_tracker(alcance, None)).rsplit(' null}', 1)[0]
+    return Trabajo.query.filter(
+        Trabajo.tipo == TIPO_TRABAJO,
+        Trabajo.estado == 'completado',
+        Trabajo.parametros.like(prefijo + '%'),
+        Trabajo.parametros != json.dumps(parametros_tracker(alcance, version))
+    ).order_by(Trabajo.id.desc()).first()
+
+def generar_tracker(alcance, version, progreso=None):
+    """
+    Genera el libro, lo guarda con la versión en el key y elimina el del
+    tracker anterior del alcance. Retorna el resultado del trabajo.
+    """
+    inicio = time.time()
+    tipo, usuario_id = alcance
+    key = f'exportaciones/tracker-{tipo}-{usuario_id or 0}-{version}.xlsx'
+    almacenamiento = obtener_almacenamiento()
+
+    with tempfile.TemporaryFile() as archivo:
+        filas = escribir_tracker(alcance, archivo, progreso)
+        tamano = archivo.tell()
+        archivo.seek(0)
+        upload_result = almacenamiento.upload_file(archivo, key, CONTENT_TYPE, key=key)
+    if not upload_result['success']:
+        raise RuntimeError(upload_result['error'])
+
+    anterior = _anterior(alcance, version)
+    if anterior is not None and anterior.resultado:
+        clave_anterior = json.loads(anterior.resultado).get('key')
+        if clave_anterior and clave_anterior != key:
+            almacenamiento.delete_file(clave_anterior)
+
+    return {'key': key, 'version': version, 'bytes': tamano, 'filas': filas, 'segundos': round(time.time() - inicio, 2)}
@@ -0,0 +1,120 @@
+"""
+Transiciones masivas de candidatos dentro de una vacante.
+
+Aplica los mismos cambios a varias asignaciones con un solo
+UPDATE candidatos_posiciones ... WHERE vacante_id = ? AND candidato_id IN (...)
+y reporta qué candidatos se actualizaron y cuáles no están asignados a la
+vacante. Como el UPDATE no pasa por el ORM, aquí se reconcilian los
+contadores de la vacante y se invalidan los snapshots del dashboard.
+"""
+from datetime import datetime
+from extensions import db
+from models import CandidatosPositions, VacanteContadores
+from services.contadores_service import reconciliar_contadores
+from services.dashboard_snapshot_service import invalidar_alcances
+from services.version_service import incrementar_version
+
+# Máximo de candidatos por transición (tamaño de la lista IN)
+MAX_CANDIDATOS = 500
+
+CONTRATADO_STATUS = tuple(CandidatosPositions.contratado_status.type.enums)
+
+# Cambios que acepta valores_transicion
+CAMPOS_TRANSICION = ('status', 'aceptado', 'contratado_status', 'comentarios_finales')
+
+# Campos que afectan a vacante_contadores
+CAMPOS_CONTADOS = ('aceptado', 'contratado_status')
+
+class TransicionInvalida(ValueError):
+    pass
+
+def normalizar_ids(candidatos_ids):
+    if not isinstance(candidatos_ids, list) or not candidatos_ids:
+        raise TransicionInvalida('Se requiere al menos un candidato')
+    try:
+        ids = list(dict.fromkeys(int(candidato_id) for candidato_id in candidatos_ids))
+    except (TypeError, ValueError):
+        raise TransicionInvalida('candidatos_ids debe ser una lista de enteros')
+    if len(ids) > MAX_CANDIDATOS:
+        raise TransicionInvalida(f'Máximo {MAX_CANDIDATOS} candidatos por operación')
+    return ids
+
+def valores_transicion(cambios, ahora=None):
+    """
+    Columnas a actualizar a partir de los cambios pedidos, con las mismas
+    reglas derivadas que las rutas individuales de candidatos-posiciones
+    """
+    ahora = ahora or datetime.utcnow()
+    valores = {}
+
+    if 'status' in cambios:
+        status = cambios['status']
+        if not isinstance(status, str) or not status.strip() or len(status) > 50:
+            raise TransicionInvalida('status inválido')
+        valores['status'] = status.strip()
+        if valores['status'] == 'enviado_rh':
+            valores['fecha_envio_candidato'] = ahora
+
+    if 'aceptado' in cambios:
+        if not isinstance(cambios['aceptado'], bool):
+            raise TransicionInvalida('aceptado debe ser booleano')
+        valores['aceptado'] = cambios['aceptado']
+
+    if 'contratado_status' in cambios:
+        contratado_status = cambios['contratado_status']
+        if contratado_status not in CONTRATADO_STATUS:
+            raise TransicionInvalida(f'contratado_status debe ser uno de: {", ".join(CONTRATADO_STATUS)}')
+        valores['contratado_status'] = contratado_status
+        if contratado_status != 'pendiente':
+            valores['fecha_decision_final'] = ahora
+        # El status general sigue al de contratación
+        if contratado_status == 'contratado':
+            valores['status'] = 'contratado'
+        elif contratado_status in ('rechazado', 'no_contratable'):
+            valores['status'] = 'rechazado'
+
+    if 'comentarios_finales' in cambios:
+        valores['comentarios_finales'] = cambios['comentarios_finales']
+
+    if not valores:
+        raise TransicionInvalida('No se indicó ningún cambio')
+
+    valores['fecha_actualizacion'] = ahora
+    return valores
+
+def transicion_masiva(vacante_id, candidatos_ids, valores):
+    """
+    Actualiza las asignaciones de los candidatos en la vacante. No hace commit.
+    Retorna {'actualizados', 'no_encontrados', 'contadores'}.
+    """
+    ids = normalizar_ids(candidatos_ids)
+    tabla = CandidatosPositions.__table__
+    condicion = (tabla.c.vacante_id == vacante_id) & tabla.c.candidato_id.in_(ids)
+    update = tabla.update().where(condicion).values(**valores)
+
+    if db.engine.dialect.update_returning:
+        actualizados = set(db.session.execute(update.returning(tabla.c.candidato_id)).scalars())
+    else:
+        # MySQL no tiene UPDATE ... RETURNING: bloquear y leer las filas, luego actualizar
+        actualizados = set(db.session.execute(
+            db.select(tabla.c.candidato_id).where(condicion).with_for_update()
+        ).scalars())
+        if actualizados:
+            db.session.execute(update)
+
+    if actualizados:
+        if any(campo in valores for campo in CAMPOS_CONTADOS):
+            reconciliar_contadores([vacante_id])
+        invalidar_alcances(vacante_ids=[vacante_id], candidato_ids=actualizados)
+        incrementar_version('candidatos_posiciones')
+        # Asignaciones ya cargadas en la sesión quedarían con valores viejos
+        for obj in list(db.session.identity_map.values()):
+            if isinstance(obj, CandidatosPositions):
+                db.session.expire(obj)
+
+    contadores = db.session.get(VacanteContadores, vacante_id)
+    return {
+        'actualizados': sorted(actualizados),
+        'no_encontrados': [candidato_id for candidato_id in ids if candidato_id not in actualizados],
+        'contadores': contadores.to_dict() if contadores else VacanteContadores.vacios(),
+    }
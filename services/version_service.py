@@ -0,0 +1,114 @@
+"""
+Versiones de datos (tabla version_datos).
+
+Cada flush que inserta, modifica o elimina filas de una tabla versionada
+anota su clave, y después del commit los contadores se incrementan en una
+transacción corta propia, en orden de clave: las filas de version_datos no
+quedan bloqueadas mientras dura la transacción que escribe (todas las
+escrituras pasan por ellas) y dos transacciones no pueden bloquearse
+mutuamente tomándolas en distinto orden. Entre el commit y el incremento hay
+una ventana breve en la que la versión todavía es la anterior. Las cachés en memoria
+de cada worker guardan la versión con la que se construyeron y la comparan
+con la de la base de datos para saber si deben recargarse; así todos los
+workers convergen sin comunicarse entre sí. Los ETag de las rutas de lectura
+(services/etag_service.py) se calculan con estas versiones. Las
+actualizaciones masivas que no pasan por el ORM deben llamar a
+incrementar_version().
+"""
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import event
+from extensions import db
+from models import Candidato, CandidatosPositions, Cliente, Documento, Entrevista, Usuario, Vacante, VersionDatos
+
+# Modelo -> clave en version_datos
+TABLAS_VERSIONADAS = {
+    Cliente: 'cliente',
+    Usuario: 'usuario',
+    Vacante: 'vacante',
+    Candidato: 'candidato',
+    CandidatosPositions: 'candidatos_posiciones',
+    Entrevista: 'entrevista',
+    Documento: 'documento',
+}
+
+# Funciones a llamar con las claves modificadas después de cada commit
+_suscriptores = []
+
+def obtener_version(clave):
+    """Versión actual de la clave (0 si todavía no tiene fila)"""
+    tabla = VersionDatos.__table__
+    version = db.session.execute(
+        db.select(tabla.c.version).where(tabla.c.clave == clave)
+    ).scalar()
+    return version or 0
+
+def obtener_versiones(claves):
+    """{clave: versión} de varias claves en una sola consulta"""
+    tabla = VersionDatos.__table__
+    versiones = dict(db.session.execute(
+        db.select(tabla.c.clave, tabla.c.version).where(tabla.c.clave.in_(list(claves)))
+    ).all())
+    return {clave: versiones.get(clave) or 0 for clave in claves}
+
+def incrementar_version(clave):
+    """Incrementa la versión de la clave cuando la transacción actual haga commit"""
+    db.session.info.setdefault('versiones_modificadas', set()).add(clave)
+
+def _incrementar(connection, clave):
+    tabla = VersionDatos.__table__
+    ahora = datetime.utcnow()
+
+    result = connection.execute(
+        tabla.update().where(tabla.c.clave == clave).values(
+            version=tabla.c.version + 1, fecha_actualizacion=ahora
+        )
+    )
+    if result.rowcount == 0:
+        connection.execute(tabla.insert().values(clave=clave, version=1, fecha_actualizacion=ahora))
+
+def suscribir(funcion):
+    """Registra funcion(claves) para invalidar cachés locales al confirmar cambios"""
+    if funcion not in _suscriptores:
+        _suscriptores.append(funcion)
+
+def _claves_modificadas(session):
+    claves = set()
+    for obj in session.new | session.deleted:
+        clave = TABLAS_VERSIONADAS.get(type(obj))
+        if clave:
+            claves.add(clave)
+    for obj in session.dirty:
+        clave = TABLAS_VERSIONADAS.get(type(obj))
+        if clave and session.is_modified(obj):
+            claves.add(clave)
+    return claves
+
+def _after_flush(session, flush_context):
+    claves = _claves_modificadas(session)
+    if claves:
+        session.info.setdefault('versiones_modificadas', set()).update(claves)
+
+def _after_commit(session):
+    claves = session.info.pop('versiones_modificadas', None)
+    if not claves:
+        return
+    try:
+        with db.engine.begin() as connection:
+            for clave in sorted(claves):
+                _incrementar(connection, clave)
+    except Exception:
+        # Los datos ya se confirmaron; las cachés se recargan con el siguiente cambio de la clave
+        current_app.logger.exception('No se pudieron incrementar las versiones %s', sorted(claves))
+    for funcion in _suscriptores:
+        funcion(claves)
+
+def _after_rollback(session):
+    session.info.pop('versiones_modificadas', None)
+
+def register_version_events():
+    """Registra los listeners de la sesión (idempotente)"""
+    if not event.contains(db.session, 'after_flush', _after_flush):
+        event.listen(db.session, 'after_flush', _after_flush)
+        event.listen(db.session, 'after_commit', _after_commit)
+        event.listen(db.session, 'after_rollback', _after_rollback)
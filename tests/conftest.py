@@ -0,0 +1,85 @@
+"""
+Fixtures de las pruebas: la app con una base SQLite en un archivo por prueba
+(los listeners confirman en conexiones propias después del commit, así que
+no sirve :memory:), datos mínimos y login por rol.
+"""
+from datetime import datetime
+import pytest
+from app import create_app
+from config import Config
+from extensions import db as _db
+
+CLAVE = 'pw'
+
+@pytest.fixture
+def app(tmp_path):
+    class TestConfig(Config):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path / "test.db"}'
+        SQLALCHEMY_ENGINE_OPTIONS = {}
+        JWT_SECRET_KEY = 'clave-de-pruebas-de-al-menos-32-bytes'
+        STORAGE_BACKEND = 'local'
+        STORAGE_LOCAL_DIR = str(tmp_path / 'almacenamiento')
+
+    app = create_app(TestConfig)
+    with app.app_context():
+        _db.create_all()
+        _sembrar()
+        yield app
+        _db.session.remove()
+
+@pytest.fixture
+def db(app):
+    return _db
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def login(client):
+    """login(rol) -> headers con el JWT de ese usuario de prueba"""
+    def _login(rol='administrador'):
+        respuesta = client.post('/api/auth/login', json={'email': f'{rol}@x.com', 'password': CLAVE})
+        assert respuesta.status_code == 200, respuesta.get_json()
+        return {'Authorization': f'Bearer {respuesta.get_json()["access_token"]}'}
+    return _login
+
+def _sembrar():
+    """4 usuarios (uno por rol), 1 cliente, 10 vacantes, 20 candidatos con asignación y entrevista"""
+    from models import Usuario, Cliente, Vacante, Candidato, CandidatosPositions, Entrevista
+
+    usuarios = {}
+    for rol in ('administrador', 'ejecutivo', 'reclutador', 'reclutador_lider'):
+        usuario = Usuario(nombre=f'Usuario {rol}', email=f'{rol}@x.com', rol=rol)
+        usuario.set_password(CLAVE)
+        _db.session.add(usuario)
+        usuarios[rol] = usuario
+    cliente = Cliente(nombre='Acción Cancún', ccp='ACC01')
+    _db.session.add(cliente)
+    _db.session.commit()
+
+    vacantes = [
+        Vacante(
+            nombre=f'Vacante {i}', cliente_id=cliente.id if i % 2 else None,
+            ejecutivo_id=usuarios['ejecutivo'].id, reclutador_id=usuarios['reclutador'].id,
+            reclutador_lider_id=usuarios['reclutador_lider'].id
+        )
+        for i in range(10)
+    ]
+    candidatos = [
+        Candidato(nombre=f'José Pérez {i}', email=f'c{i}@x.com', reclutador_id=usuarios['reclutador'].id)
+        for i in range(20)
+    ]
+    _db.session.add_all(vacantes + candidatos)
+    _db.session.commit()
+
+    estados = ('pendiente', 'contratado', 'rechazado', 'no_contratable')
+    for i, candidato in enumerate(candidatos):
+        vacante = vacantes[i % len(vacantes)]
+        _db.session.add(CandidatosPositions(
+            candidato_id=candidato.id, vacante_id=vacante.id,
+            contratado_status=estados[i % len(estados)], aceptado=bool(i % 3)
+        ))
+        _db.session.add(Entrevista(fecha=datetime.utcnow(), tipo='video', candidato_id=candidato.id, vacante_id=vacante.id))
+    _db.session.commit()
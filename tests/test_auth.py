@@ -0,0 +1,30 @@
+from flask_jwt_extended import create_access_token
+from models import Usuario
+from services.revocacion_service import revocaciones
+
+def test_principal_en_memoria_reporta_aciertos(client, login):
+    headers = login()
+    client.get('/api/metrics', headers=headers)
+    antes = revocaciones.estadisticas()
+
+    for _ in range(5):
+        assert client.get('/api/metrics', headers=headers).status_code == 200
+
+    despues = client.get('/api/metrics', headers=headers).get_json()['auth_revocaciones']
+    assert despues['aciertos'] >= antes['aciertos'] + 5
+    assert 0 < despues['tasa_aciertos'] <= 1
+
+def test_usuario_desactivado_pierde_sus_tokens(client, login, db):
+    headers = login('reclutador')
+    assert client.get('/api/vacantes', headers=headers).status_code == 200
+
+    usuario = Usuario.query.filter_by(email='reclutador@x.com').one()
+    usuario.activo = False
+    db.session.commit()
+
+    assert client.get('/api/vacantes', headers=headers).status_code == 401
+
+def test_token_sin_version_se_rechaza(app, client):
+    with app.app_context():
+        token = create_access_token(identity='1', additional_claims={'rol': 'administrador'})
+    assert client.get('/api/vacantes', headers={'Authorization': f'Bearer {token}'}).status_code == 401
@@ -0,0 +1,82 @@
+import io
+from models import CandidatosPositions, Candidato, Vacante, VacanteContadores
+from services.contadores_service import _select_agregado, reconciliar_contadores
+from services.importacion_service import importar
+from services.transicion_service import transicion_masiva, valores_transicion
+
+def _guardados(db):
+    return {
+        fila.vacante_id: [getattr(fila, campo) for campo in VacanteContadores.CAMPOS]
+        for fila in VacanteContadores.query.all()
+    }
+
+def _reales(db):
+    campos = len(VacanteContadores.CAMPOS)
+    return {fila[0]: list(fila[1:campos + 1]) for fila in db.session.execute(_select_agregado())}
+
+def test_cada_vacante_tiene_fila_y_coincide_con_las_asignaciones(db):
+    assert Vacante.query.count() == VacanteContadores.query.count()
+    assert _guardados(db) == _reales(db)
+
+def test_cambios_por_el_orm(db):
+    vacante = db.session.get(Vacante, 1)
+    antes = vacante.get_contadores()
+
+    candidato = Candidato(nombre='Nueva', email='nueva@x.com', reclutador_id=vacante.reclutador_id)
+    db.session.add(candidato)
+    db.session.flush()
+    db.session.add(CandidatosPositions(candidato_id=candidato.id, vacante_id=1, contratado_status='contratado', aceptado=True))
+    db.session.commit()
+
+    despues = db.session.get(Vacante, 1).get_contadores()
+    assert despues['total_candidatos'] == antes['total_candidatos'] + 1
+    assert despues['candidatos_contratados'] == antes['candidatos_contratados'] + 1
+
+    asignacion = CandidatosPositions.query.filter_by(vacante_id=2).first()
+    asignacion.vacante_id = 3
+    db.session.commit()
+    db.session.delete(CandidatosPositions.query.filter_by(vacante_id=4).first())
+    db.session.commit()
+
+    assert _guardados(db) == _reales(db)
+
+def test_vacante_nueva_tiene_fila_en_cero(db):
+    vacante = Vacante(nombre='Sin candidatos', ejecutivo_id=2, reclutador_id=3)
+    db.session.add(vacante)
+    db.session.commit()
+
+    fila = db.session.get(VacanteContadores, vacante.id)
+    assert fila is not None
+    assert fila.to_dict() == VacanteContadores.vacios()
+
+def test_fila_faltante_se_crea_con_el_agregado(db):
+    db.session.query(VacanteContadores).filter_by(vacante_id=5).delete()
+    db.session.commit()
+
+    db.session.add(CandidatosPositions(candidato_id=1, vacante_id=5, contratado_status='pendiente'))
+    db.session.commit()
+
+    assert _guardados(db)[5] == _reales(db)[5]
+
+def test_transicion_masiva_y_reconciliacion(db):
+    asignaciones = CandidatosPositions.query.filter_by(vacante_id=1).all()
+    resultado = transicion_masiva(
+        1, [asignacion.candidato_id for asignacion in asignaciones],
+        valores_transicion({'contratado_status': 'contratado', 'aceptado': True})
+    )
+    db.session.commit()
+
+    assert resultado['contadores']['candidatos_contratados'] == len(asignaciones)
+    guardados = _guardados(db)
+    assert guardados == _reales(db)
+
+    reconciliar_contadores()
+    db.session.commit()
+    assert _guardados(db) == guardados
+
+def test_vacantes_importadas_tienen_fila(db):
+    contenido = 'nombre,reclutador_email\nImportada A,reclutador@x.com\nImportada B,reclutador@x.com\n'.encode()
+    resultado = importar('vacantes', io.BytesIO(contenido), 'vacantes.csv', 2)
+
+    assert resultado['importadas'] == 2
+    assert Vacante.query.count() == VacanteContadores.query.count()
@@ -0,0 +1,64 @@
+import io
+import os
+from models import Documento, DocumentoBlob
+
+def _subir(client, headers, contenido, nombre='cv.pdf', tipo='application/pdf', candidato_id=1):
+    return client.post('/api/documentos/upload', headers=headers, content_type='multipart/form-data', data={
+        'candidato_id': str(candidato_id), 'tipo': 'otro', 'file': (io.BytesIO(contenido), nombre, tipo)
+    })
+
+def test_mismo_contenido_un_solo_blob_con_referencias(app, client, login, db):
+    headers = login('reclutador')
+    primero = _subir(client, headers, b'mismo contenido', candidato_id=1)
+    segundo = _subir(client, headers, b'mismo contenido', candidato_id=2)
+    assert primero.status_code == segundo.status_code == 201
+
+    blob = DocumentoBlob.query.one()
+    assert blob.referencias == 2
+    assert Documento.query.count() == 2
+    ruta = os.path.join(app.config['STORAGE_LOCAL_DIR'], blob.key_s3)
+    assert os.path.isfile(ruta)
+
+    assert client.delete(f'/api/documentos/{primero.get_json()["documento"]["id"]}', headers=headers).status_code == 200
+    db.session.expire_all()
+    assert DocumentoBlob.query.one().referencias == 1
+    assert os.path.isfile(ruta)
+
+    assert client.delete(f'/api/documentos/{segundo.get_json()["documento"]["id"]}', headers=headers).status_code == 200
+    db.session.expire_all()
+    assert DocumentoBlob.query.count() == 0
+    assert not os.path.exists(ruta)
+
+def test_lote_con_errores_por_archivo(client, login):
+    respuesta = client.post('/api/documentos/upload/lote', headers=login('reclutador'), content_type='multipart/form-data', data={
+        'files': [(io.BytesIO(b'a'), 'a.pdf', 'application/pdf'), (io.BytesIO(b'b'), 'b.exe', 'application/octet-stream')],
+        'candidato_id': '1'
+    })
+    assert respuesta.status_code == 207
+    assert [resultado['success'] for resultado in respuesta.get_json()['resultados']] == [True, False]
+
+def _descargar(client, headers, contenido, tipo):
+    documento = _subir(client, headers, contenido, tipo=tipo).get_json()['documento']
+    url = client.get(f'/api/documentos/{documento["id"]}', headers=headers).get_json()['download_url']
+    return client.get(url.replace('http://localhost', ''))
+
+def test_descarga_firmada_como_adjunto(client, login):
+    headers = login('reclutador')
+    respuesta = _descargar(client, headers, b'%PDF-1.4', 'application/pdf')
+    assert respuesta.status_code == 200
+    assert respuesta.data == b'%PDF-1.4'
+    assert respuesta.headers['Content-Type'] == 'application/pdf'
+    assert respuesta.headers['Content-Disposition'].startswith('attachment;')
+    assert respuesta.headers['X-Content-Type-Options'] == 'nosniff'
+    assert respuesta.headers['Cache-Control'] == 'private, no-store'
+
+def test_descarga_de_tipo_no_permitido_como_octet_stream(client, login):
+    respuesta = _descargar(client, login('reclutador'), b'<script>alert(1)</script>', 'text/html')
+    assert respuesta.headers['Content-Type'] == 'application/octet-stream'
+    assert respuesta.headers['Content-Disposition'].startswith('attachment;')
+
+def test_descarga_con_firma_alterada(client, login):
+    headers = login('reclutador')
+    documento = _subir(client, headers, b'x').get_json()['documento']
+    url = client.get(f'/api/documentos/{documento["id"]}', headers=headers).get_json()['download_url']
+    assert client.get(url.replace('http://localhost', '').replace('firma=', 'firma=0')).status_code == 403
@@ -0,0 +1,68 @@
+import csv
+import io
+import json
+from models import Candidato, Vacante
+from services.trabajo_service import procesar_siguiente
+
+def _importar(client, headers, entidad, contenido):
+    respuesta = client.post(f'/api/importaciones/{entidad}', headers=headers, content_type='multipart/form-data', data={
+        'file': (io.BytesIO(contenido.encode()), f'{entidad}.csv')
+    })
+    assert respuesta.status_code == 202, respuesta.get_json()
+    while procesar_siguiente('prueba'):
+        pass
+    return client.get(respuesta.headers['Location'], headers=headers).get_json()
+
+def test_importar_vacantes_con_errores_por_fila(client, login):
+    trabajo = _importar(client, login('ejecutivo'), 'vacantes', (
+        'Vacante;Cliente CCP;Reclutador;Posiciones\n'
+        'Importada 1;acc01;reclutador@x.com;2\n'
+        'Importada 2;NOEXISTE;reclutador@x.com;1\n'
+        'Importada 3;;reclutador@x.com;dos\n'
+    ))
+
+    assert trabajo['estado'] == 'completado'
+    assert trabajo['resultado']['importadas'] == 1
+    assert [error['fila'] for error in trabajo['resultado']['errores']] == [3, 4]
+    vacante = Vacante.query.filter_by(nombre='Importada 1').one()
+    assert (vacante.vacantes, vacante.cliente.ccp, vacante.ejecutivo.email) == (2, 'ACC01', 'ejecutivo@x.com')
+
+def test_ejecutivo_solo_importa_vacantes_propias(client, login):
+    trabajo = _importar(client, login('ejecutivo'), 'vacantes', (
+        'nombre,reclutador_email,ejecutivo_email\n'
+        'Propia,reclutador@x.com,ejecutivo@x.com\n'
+        'Ajena,reclutador@x.com,administrador@x.com\n'
+    ))
+
+    assert trabajo['resultado']['importadas'] == 1
+    assert Vacante.query.filter_by(nombre='Ajena').count() == 0
+
+def test_reclutador_solo_importa_candidatos_propios(client, login):
+    trabajo = _importar(client, login('reclutador'), 'candidatos', (
+        'nombre,email,reclutador_email\n'
+        'Propio,propio@x.com,\n'
+        'Ajeno,ajeno@x.com,reclutador_lider@x.com\n'
+    ))
+
+    assert trabajo['resultado']['importadas'] == 1
+    assert Candidato.query.filter_by(email='propio@x.com').one().reclutador_asignado.email == 'reclutador@x.com'
+
+def test_exportar_csv_con_alcance_del_usuario(client, login, db):
+    otra = Vacante(nombre='De otro reclutador', ejecutivo_id=1, reclutador_id=4)
+    db.session.add(otra)
+    db.session.commit()
+
+    respuesta = client.get('/api/exports/vacantes?formato=csv', headers=login('reclutador'))
+    assert respuesta.status_code == 200
+    assert respuesta.headers['Content-Disposition'].startswith('attachment;')
+    filas = list(csv.DictReader(io.StringIO(respuesta.get_data(as_text=True))))
+    assert len(filas) == Vacante.query.filter_by(reclutador_id=3).count()
+    assert otra.nombre not in {fila['nombre'] for fila in filas}
+
+    todas = client.get('/api/exports/vacantes?formato=ndjson', headers=login())
+    assert len([json.loads(linea) for linea in todas.get_data(as_text=True).splitlines()]) == Vacante.query.count()
+
+def test_exportar_entidad_o_formato_invalidos(client, login):
+    headers = login()
+    assert client.get('/api/exports/usuarios', headers=headers).status_code == 404
+    assert client.get('/api/exports/vacantes?formato=xml', headers=headers).status_code == 400
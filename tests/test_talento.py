@@ -0,0 +1,47 @@
+from models import Candidato
+from services.talento_service import reconstruir_indice
+from services.trabajo_service import procesar_siguiente
+
+def _candidato(db, nombre, comentarios, reclutador_id=3):
+    candidato = Candidato(nombre=nombre, email=f'{nombre.lower()}@x.com', reclutador_id=reclutador_id,
+                          comentarios_generales=comentarios)
+    db.session.add(candidato)
+    db.session.commit()
+    return candidato
+
+def _buscar(client, headers, q):
+    respuesta = client.get(f'/api/candidatos/talent-search?q={q}', headers=headers)
+    assert respuesta.status_code == 200, respuesta.get_json()
+    return [candidato['nombre'] for candidato in respuesta.get_json()['candidatos']]
+
+def test_busqueda_por_relevancia_sin_acentos_ni_plurales(client, login, db):
+    _candidato(db, 'Ana', 'Ingeniera de software con Python y Django; Python en producción')
+    _candidato(db, 'Luis', 'Ingeniero en ventas, algo de Python')
+    _candidato(db, 'Eva', 'Contadora')
+    reconstruir_indice()
+
+    assert _buscar(client, login(), 'python') == ['Ana', 'Luis']
+    assert sorted(_buscar(client, login(), 'ingenieros')) == ['Ana', 'Luis']
+    assert _buscar(client, login(), 'produccion') == ['Ana']
+
+def test_indice_incremental_por_la_cola(client, login, db):
+    reconstruir_indice()
+    candidato = _candidato(db, 'Nuevo', 'Experto en Kubernetes')
+    while procesar_siguiente('prueba'):
+        pass
+    assert _buscar(client, login(), 'kubernetes') == ['Nuevo']
+
+    candidato.comentarios_generales = 'Experto en Terraform'
+    db.session.commit()
+    while procesar_siguiente('prueba'):
+        pass
+    assert _buscar(client, login(), 'kubernetes') == []
+    assert _buscar(client, login(), 'terraform') == ['Nuevo']
+
+def test_reclutador_solo_ve_sus_candidatos(client, login, db):
+    _candidato(db, 'Propio', 'Especialista en SAP')
+    _candidato(db, 'Ajeno', 'Especialista en SAP', reclutador_id=4)
+    reconstruir_indice()
+
+    assert _buscar(client, login('reclutador'), 'sap') == ['Propio']
+    assert sorted(_buscar(client, login(), 'sap')) == ['Ajeno', 'Propio']
@@ -0,0 +1,69 @@
+from models import CandidatosPositions, DashboardSnapshot, Trabajo
+from services.dashboard_snapshot_service import GLOBAL, encolar_recalculo, obtener_dashboard
+from services.trabajo_service import encolar, procesar_siguiente, tarea
+
+@tarea('prueba_siempre_falla', max_intentos=2)
+def siempre_falla():
+    raise RuntimeError('falla de prueba')
+
+def _procesar_todo():
+    while procesar_siguiente('prueba'):
+        pass
+
+def test_transicion_asincrona_por_la_cola(client, login, db):
+    headers = login('reclutador')
+    ids = [asignacion.candidato_id for asignacion in CandidatosPositions.query.filter_by(vacante_id=1)]
+
+    respuesta = client.post('/api/vacantes/1/candidatos/transicion', headers=headers, json={
+        'candidatos_ids': ids, 'status': 'entrevista', 'asincrono': True
+    })
+    assert respuesta.status_code == 202
+    estado_url = respuesta.headers['Location']
+    assert client.get(estado_url, headers=headers).get_json()['estado'] == 'pendiente'
+
+    _procesar_todo()
+
+    trabajo = client.get(estado_url, headers=headers).get_json()
+    assert trabajo['estado'] == 'completado'
+    assert sorted(trabajo['resultado']['actualizados']) == sorted(ids)
+    db.session.expire_all()
+    assert {asignacion.status for asignacion in CandidatosPositions.query.filter_by(vacante_id=1)} == {'entrevista'}
+
+def test_reintentos_y_fallido(app, db):
+    app.config['TRABAJOS_ESPERA_BASE'] = 0
+    trabajo = encolar('prueba_siempre_falla')
+    db.session.commit()
+
+    _procesar_todo()
+
+    db.session.expire_all()
+    trabajo = db.session.get(Trabajo, trabajo.id)
+    assert trabajo.estado == 'fallido'
+    assert trabajo.intentos == 2
+    assert trabajo.error == 'falla de prueba'
+
+def test_recalculo_del_dashboard_encolado_una_sola_vez(app, db):
+    obtener_dashboard(GLOBAL)
+    encolar_recalculo(GLOBAL)
+    encolar_recalculo(GLOBAL)
+    assert Trabajo.query.filter_by(tipo='reconstruir_dashboard').count() == 1
+
+def test_dashboard_obsoleto_se_sirve_y_se_recalcula_en_segundo_plano(app, db):
+    app.config['DASHBOARD_SNAPSHOT_INTERVALO'] = 0
+    datos, _, obsoleto = obtener_dashboard(GLOBAL)
+    assert not obsoleto
+
+    db.session.delete(CandidatosPositions.query.first())
+    db.session.commit()
+
+    nuevos, _, obsoleto = obtener_dashboard(GLOBAL)
+    assert obsoleto
+    assert nuevos == datos
+    assert Trabajo.query.filter_by(tipo='reconstruir_dashboard', estado='pendiente').count() == 1
+
+    _procesar_todo()
+
+    db.session.expire_all()
+    snapshot = db.session.get(DashboardSnapshot, ('global', 0))
+    assert snapshot.version_calculada == snapshot.version
+    assert obtener_dashboard(GLOBAL)[2] is False
@@ -0,0 +1,53 @@
+from models import Vacante
+from utils.query_counter import assert_max_queries, count_queries
+
+def test_listado_con_numero_fijo_de_consultas(client, login):
+    headers = login()
+    client.get('/api/vacantes', headers=headers)  # cachés de revocación y versiones ya cargadas
+
+    with count_queries() as pocas:
+        assert client.get('/api/vacantes?per_page=2', headers=headers).status_code == 200
+    with assert_max_queries(pocas.count):
+        respuesta = client.get('/api/vacantes?per_page=10', headers=headers)
+
+    vacantes = respuesta.get_json()['vacantes']
+    assert len(vacantes) == 10
+    assert all('total_candidatos' in vacante and vacante['reclutador'] for vacante in vacantes)
+
+def test_paginacion_por_cursor_recorre_todo_sin_repetir(client, login):
+    headers = login()
+    ids, cursor = [], ''
+    while cursor is not None:
+        respuesta = client.get(f'/api/vacantes?per_page=3&cursor={cursor}', headers=headers).get_json()
+        assert 'total' not in respuesta
+        ids.extend(vacante['id'] for vacante in respuesta['vacantes'])
+        cursor = respuesta['next_cursor']
+
+    assert ids == sorted((vacante.id for vacante in Vacante.query.all()), reverse=True)
+
+def test_cursor_invalido(client, login):
+    respuesta = client.get('/api/vacantes?cursor=no-es-un-cursor', headers=login())
+    assert respuesta.status_code == 400
+
+def test_etag_304_hasta_que_cambian_los_datos(client, login, db):
+    headers = login()
+    primera = client.get('/api/vacantes', headers=headers)
+    etag = primera.headers['ETag']
+    assert etag.startswith('W/')
+
+    repetida = client.get('/api/vacantes', headers={**headers, 'If-None-Match': etag})
+    assert repetida.status_code == 304
+    assert repetida.data == b''
+
+    vacante = db.session.get(Vacante, 1)
+    vacante.nombre = 'Renombrada'
+    db.session.commit()
+
+    tras_cambio = client.get('/api/vacantes', headers={**headers, 'If-None-Match': etag})
+    assert tras_cambio.status_code == 200
+    assert tras_cambio.headers['ETag'] != etag
+
+def test_etag_distinto_por_usuario(client, login):
+    admin = client.get('/api/vacantes', headers=login()).headers['ETag']
+    reclutador = client.get('/api/vacantes', headers=login('reclutador')).headers['ETag']
+    assert admin != reclutador
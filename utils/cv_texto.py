@@ -0,0 +1,130 @@
+"""
+Extracción de texto de CVs (PDF, DOCX, TXT) y detección de datos de contacto.
+
+Solo depende de la biblioteca estándar y de pypdf: las funciones corren en
+los procesos del pool de services/cv_texto_service.py, que no cargan la app.
+"""
+import io
+import re
+import unicodedata
+import zipfile
+from xml.etree import ElementTree
+from utils.texto_es import plegar
+
+# Máximo de emails / teléfonos que se guardan por documento
+MAX_DETECTADOS = 10
+
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+_EMAIL = re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)*\.[a-z]{2,}', re.IGNORECASE)
+_TELEFONO = re.compile(r'(?<![\w+])(\+?\d[\d \t().-]{7,}\d)(?!\w)')
+_EXPERIENCIA = (
+    re.compile(r'(\d{1,2})\s*\+?\s*(?:anos|years?)\s+(?:de\s+|of\s+)?(?:experiencia|experience)'),
+    re.compile(r'(?:experiencia|experience)\s*(?:de|of|:)?\s*(?:mas\s+de\s+|more\s+than\s+)?(\d{1,2})\s*\+?\s*(?:anos|years?)'),
+)
+
+def _extension(nombre):
+    return nombre.rsplit('.', 1)[-1].lower() if '.' in (nombre or '') else ''
+
+def _texto_pdf(contenido):
+    from pypdf import PdfReader
+
+    reader = PdfReader(io.BytesIO(contenido))
+    if reader.is_encrypted:
+        reader.decrypt('')
+    return '\n'.join(pagina.extract_text() or '' for pagina in reader.pages), len(reader.pages)
+
+def _texto_docx(contenido):
+    with zipfile.ZipFile(io.BytesIO(contenido)) as archivo:
+        xml = archivo.read('word/document.xml')
+
+    partes = []
+    for _, elemento in ElementTree.iterparse(io.BytesIO(xml), events=('end',)):
+        if elemento.tag == f'{_W}t':
+            partes.append(elemento.text or '')
+        elif elemento.tag == f'{_W}tab':
+            partes.append('\t')
+        elif elemento.tag in (f'{_W}br', f'{_W}p'):
+            partes.append('\n')
+    return ''.join(partes), None
+
+def _texto_txt(contenido):
+    for codificacion in ('utf-8-sig', 'cp1252'):
+        try:
+            return contenido.decode(codificacion), None
+        except UnicodeDecodeError:
+            continue
+    return contenido.decode('latin-1'), None
+
+EXTRACTORES = {
+    'pdf': _texto_pdf,
+    'docx': _texto_docx,
+    'txt': _texto_txt,
+}
+
+CONTENT_TYPES = {
+    'application/pdf': 'pdf',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document': 'docx',
+    'text/plain': 'txt',
+}
+
+def normalizar_texto(texto):
+    """NFKC, sin caracteres de control, espacios colapsados y como máximo una línea en blanco seguida"""
+    texto = unicodedata.normalize('NFKC', texto)
+    texto = ''.join(c if c in '\n\t' or unicodedata.category(c)[0] != 'C' else ' ' for c in texto)
+    lineas = [' '.join(linea.split()) for linea in texto.split('\n')]
+    return re.sub(r'\n{3,}', '\n\n', '\n'.join(lineas)).strip()
+
+def _unicos(valores):
+    return list(dict.fromkeys(valores))[:MAX_DETECTADOS]
+
+def detectar_emails(texto):
+    return _unicos(email.lower().strip('.') for email in _EMAIL.findall(texto))
+
+def detectar_telefonos(texto):
+    """Números de 10 a 13 dígitos; los de 10 se guardan tal cual, los demás con +"""
+    telefonos = []
+    for coincidencia in _TELEFONO.findall(texto):
+        digitos = re.sub(r'\D', '', coincidencia)
+        if 10 <= len(digitos) <= 13:
+            telefonos.append(digitos if len(digitos) == 10 else f'+{digitos}')
+    return _unicos(telefonos)
+
+def detectar_anios_experiencia(texto):
+    """Mayor número de años mencionado como experiencia ("5 años de experiencia", "experience: 3 years")"""
+    texto = plegar(texto)
+    anios = [int(valor) for patron in _EXPERIENCIA for valor in patron.findall(texto)]
+    anios = [valor for valor in anios if 0 < valor <= 60]
+    return max(anios) if anios else None
+
+def extraer(contenido, nombre, content_type=None, max_caracteres=None):
+    """
+    Texto normalizado y datos detectados del archivo. Retorna un dict con
+    estado ('completado', 'sin_texto', 'no_soportado' o 'error'), texto,
+    emails, telefonos, anios_experiencia, paginas y caracteres.
+    """
+    formato = CONTENT_TYPES.get((content_type or '').split(';')[0].strip()) or _extension(nombre)
+    extractor = EXTRACTORES.get(formato)
+    if extractor is None:
+        return {'estado': 'no_soportado', 'error': f'Formato no soportado: {formato or "desconocido"}'}
+
+    try:
+        texto, paginas = extractor(contenido)
+    except Exception as e:
+        return {'estado': 'error', 'error': f'{type(e).__name__}: {str(e)}'[:500]}
+
+    texto = normalizar_texto(texto)
+    if max_caracteres:
+        texto = texto[:max_caracteres]
+    if not texto:
+        return {'estado': 'sin_texto', 'paginas': paginas, 'caracteres': 0}
+
+    return {
+        'estado': 'completado',
+        'texto': texto,
+        'emails': detectar_emails(texto),
+        'telefonos': detectar_telefonos(texto),
+        'anios_experiencia': detectar_anios_experiencia(texto),
+        'paginas': paginas,
+        'caracteres': len(texto)
+    }
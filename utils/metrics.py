@@ -0,0 +1,56 @@
+import threading
+import time
+from contextlib import contextmanager
+
+class Metricas:
+    """
+    Contadores y tiempos en memoria del worker (se reinician al reiniciar el
+    proceso). Cada worker reporta los suyos en /api/metrics.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._contadores = {}
+        self._tiempos = {}
+        self._proveedores = {}
+
+    def incrementar(self, nombre, cantidad=1):
+        with self._lock:
+            self._contadores[nombre] = self._contadores.get(nombre, 0) + cantidad
+
+    def registrar_tiempo(self, nombre, segundos):
+        with self._lock:
+            t = self._tiempos.setdefault(nombre, {'llamadas': 0, 'total': 0.0, 'maximo': 0.0})
+            t['llamadas'] += 1
+            t['total'] += segundos
+            t['maximo'] = max(t['maximo'], segundos)
+
+    @contextmanager
+    def medir(self, nombre):
+        """Registra la duración del bloque (también si lanza excepción)"""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar_tiempo(nombre, time.perf_counter() - inicio)
+
+    def registrar_proveedor(self, nombre, funcion):
+        """funcion() -> dict con métricas calculadas al momento de reportar"""
+        self._proveedores[nombre] = funcion
+
+    def reporte(self):
+        with self._lock:
+            contadores = dict(self._contadores)
+            tiempos = {
+                nombre: {
+                    'llamadas': t['llamadas'],
+                    'promedio_ms': round(t['total'] / t['llamadas'] * 1000, 3) if t['llamadas'] else 0,
+                    'maximo_ms': round(t['maximo'] * 1000, 3)
+                } for nombre, t in self._tiempos.items()
+            }
+        reporte = {'contadores': contadores, 'tiempos': tiempos}
+        for nombre, funcion in self._proveedores.items():
+            reporte[nombre] = funcion()
+        return reporte
+
+metricas = Metricas()
@@ -0,0 +1,88 @@
+import base64
+import json
+from datetime import datetime
+from flask import request
+from sqlalchemy import and_, or_
+
+class CursorInvalido(ValueError):
+    pass
+
+def encode_cursor(valor, id_valor):
+    """Cursor opaco con el valor de orden y el id de la última fila entregada"""
+    if isinstance(valor, datetime):
+        valor = {'dt': valor.isoformat()}
+    data = json.dumps([valor, id_valor], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    try:
+        padding = '=' * (-len(cursor) % 4)
+        valor, id_valor = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        if isinstance(valor, dict):
+            valor = datetime.fromisoformat(valor['dt'])
+        return valor, int(id_valor)
+    except Exception:
+        raise CursorInvalido('Cursor inválido')
+
+def _despues_de(columna, id_columna, valor, id_valor, descendente=True):
+    """
+    Filas que van después de (valor, id_valor) en orden (columna, id).
+    Los NULL de la columna de orden se tratan como el menor valor, igual que
+    en MySQL y SQLite: al final en orden descendente, al inicio en ascendente.
+    """
+    if descendente:
+        if valor is None:
+            return and_(columna.is_(None), id_columna < id_valor)
+        return or_(
+            columna < valor,
+            and_(columna == valor, id_columna < id_valor),
+            columna.is_(None)
+        )
+
+    if valor is None:
+        return or_(and_(columna.is_(None), id_columna > id_valor), columna.isnot(None))
+    return or_(columna > valor, and_(columna == valor, id_columna > id_valor))
+
+def paginate_query(query, columna, id_columna, page=1, per_page=10, descendente=True):
+    """
+    Pagina una consulta ordenada por (columna, id), descendente por defecto.
+
+    Por defecto usa paginate() (OFFSET + COUNT) y retorna los metadatos de
+    siempre: total, pages, current_page. Con ?cursor= (vacío para la primera
+    página) usa paginación por llave: WHERE (columna, id) < cursor LIMIT n,
+    sin OFFSET ni COUNT salvo que se pida ?with_total=1. Retorna
+    (items, metadatos) con next_cursor=None en la última página.
+    """
+    if descendente:
+        query = query.order_by(columna.desc(), id_columna.desc())
+    else:
+        query = query.order_by(columna.asc(), id_columna.asc())
+    cursor = request.args.get('cursor')
+
+    if cursor is None:
+        pagina = query.paginate(page=page, per_page=per_page, error_out=False)
+        return pagina.items, {
+            'total': pagina.total,
+            'pages': pagina.pages,
+            'current_page': page
+        }
+
+    per_page = max(1, per_page)
+    meta = {'per_page': per_page}
+
+    if request.args.get('with_total') in ('1', 'true'):
+        meta['total'] = query.order_by(None).count()
+
+    if cursor:
+        valor, id_valor = decode_cursor(cursor)
+        query = query.filter(_despues_de(columna, id_columna, valor, id_valor, descendente))
+
+    items = query.limit(per_page + 1).all()
+    siguiente = None
+    if len(items) > per_page:
+        items = items[:per_page]
+        ultimo = items[-1]
+        siguiente = encode_cursor(getattr(ultimo, columna.key), getattr(ultimo, id_columna.key))
+
+    meta['next_cursor'] = siguiente
+    return items, meta
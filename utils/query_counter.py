@@ -0,0 +1,48 @@
+from contextlib import contextmanager
+from sqlalchemy import event
+from extensions import db
+
+class QueryCounter:
+    """Cuenta las sentencias SQL ejecutadas sobre un engine"""
+    
+    def __init__(self):
+        self.statements = []
+    
+    @property
+    def count(self):
+        return len(self.statements)
+    
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+@contextmanager
+def count_queries(engine=None):
+    """
+    Context manager que registra las consultas ejecutadas dentro del bloque.
+    
+        with count_queries() as counter:
+            client.get('/api/vacantes')
+        print(counter.count)
+    """
+    engine = engine or db.engine
+    counter = QueryCounter()
+    event.listen(engine, 'before_cursor_execute', counter)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, 'before_cursor_execute', counter)
+
+@contextmanager
+def assert_max_queries(max_queries, engine=None):
+    """
+    Falla si el bloque ejecuta más de max_queries consultas. Sirve para
+    comprobar que un endpoint de listado es O(1) en consultas por página.
+    """
+    with count_queries(engine) as counter:
+        yield counter
+    
+    if counter.count > max_queries:
+        detalle = '\n'.join(f'  {i + 1}. {sql}' for i, sql in enumerate(counter.statements))
+        raise AssertionError(
+            f'Se esperaban como máximo {max_queries} consultas, se ejecutaron {counter.count}:\n{detalle}'
+        )
@@ -0,0 +1,59 @@
+"""
+Análisis de texto en español para el índice de talento.
+
+analizar(texto) -> términos: minúsculas, sin acentos, sin palabras vacías
+(español e inglés) y con un stemmer ligero que quita plurales y género
+('ingenieras' y 'ingeniero' -> 'ingenier'). Los nombres de tecnologías
+conservan + y # ('c++', 'c#').
+"""
+import re
+import unicodedata
+
+# Largo máximo de un término (columna talento_termino.termino)
+MAX_TERMINO = 64
+
+_TOKEN = re.compile(r'\w+[+#]*')
+
+PALABRAS_VACIAS = frozenset('''
+a al algo algun alguna algunas alguno algunos ante antes aqui asi aun bajo bien cada como con contra cual
+cuales cuando de del desde donde dos durante e el ella ellas ello ellos en entre era eran es esa esas ese
+eso esos esta estaba estado estan estar estas este esto estos fue fueron ha hace hacia han hasta hay la
+las le les lo los mas me mi mis mucho muy nada ni no nos nosotros o otra otras otro otros para pero poco
+por porque que quien se sea ser si sin sino sobre son su sus tambien tan tanto te tiene tienen todo
+todos tu tus u un una unas uno unos usted y ya yo
+an and are as at be by for from has have in is it its of on or that the this to was were will with
+'''.split())
+
+def plegar(texto):
+    """Minúsculas y sin acentos: 'Diseñó' -> 'diseno'"""
+    texto = unicodedata.normalize('NFKD', texto or '')
+    return ''.join(c for c in texto if not unicodedata.combining(c)).lower()
+
+def raiz(palabra):
+    """
+    Stemmer ligero (plural y género, al estilo de Savoy): 'ventas' -> 'vent',
+    'vendedores' -> 'vendedor', 'capacidades' -> 'capacidad', 'luces' -> 'luz'.
+    """
+    if len(palabra) < 4 or not palabra.isalpha():
+        return palabra
+    if len(palabra) >= 5:
+        if palabra.endswith('eses'):
+            return palabra[:-2]
+        if palabra.endswith('ces'):
+            return palabra[:-3] + 'z'
+        if palabra.endswith(('os', 'as', 'es')):
+            return palabra[:-2]
+    if palabra.endswith(('o', 'a', 'e')):
+        return palabra[:-1]
+    if palabra.endswith('s') and not palabra.endswith('ss'):
+        return palabra[:-1]
+    return palabra
+
+def analizar(texto):
+    """Términos del texto, en orden y con repeticiones"""
+    terminos = []
+    for token in _TOKEN.findall(plegar(texto)):
+        if len(token) < 2 or token in PALABRAS_VACIAS or token.isdigit():
+            continue
+        terminos.append(raiz(token)[:MAX_TERMINO])
+    return terminos
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Script para verificar con EXPLAIN que las consultas frecuentes usan los
+índices creados por la migración 0003.
+
+Uso:
+    python verify_indexes.py
+
+Se conecta a la base de datos configurada en .env. En tablas casi vacías el
+optimizador de MySQL puede preferir un full scan; ejecutar contra una base
+con datos reales (o una copia) para que el resultado sea representativo.
+"""
+
+import sys
+from sqlalchemy.dialects import mysql, sqlite
+
+from app import create_app
+from extensions import db
+from models import Vacante, Candidato, CandidatosPositions, Entrevista, Cliente
+
+def consultas():
+    """(descripción, consulta, índices aceptados) de cada ruta caliente"""
+    return [
+        (
+            'GET /api/vacantes (administrador)',
+            Vacante.query.order_by(Vacante.fecha_creacion.desc()).limit(10),
+            {'ix_vacante_fecha_creacion'}
+        ),
+        (
+            'GET /api/vacantes?estado=abierta',
+            Vacante.query.filter(Vacante.estado == 'abierta').order_by(Vacante.fecha_creacion.desc()).limit(10),
+            {'ix_vacante_estado_fecha_creacion'}
+        ),
+        (
+            'GET /api/vacantes (reclutador)',
+            Vacante.query.filter(Vacante.reclutador_id == 1).order_by(Vacante.fecha_creacion.desc()).limit(10),
+            {'ix_vacante_reclutador_fecha_creacion'}
+        ),
+        (
+            'GET /api/vacantes (ejecutivo)',
+            Vacante.query.filter(Vacante.ejecutivo_id == 1).order_by(Vacante.fecha_creacion.desc()).limit(10),
+            {'ix_vacante_ejecutivo_fecha_creacion'}
+        ),
+        (
+            'Estadísticas por cliente',
+            Vacante.query.filter(Vacante.cliente_id == 1, Vacante.estado == 'abierta'),
+            {'ix_vacante_cliente_estado'}
+        ),
+        (
+            'GET /api/candidatos (reclutador)',
+            Candidato.query.filter(Candidato.reclutador_id == 1).order_by(Candidato.fecha_creacion.desc()).limit(10),
+            {'ix_candidato_reclutador_fecha_creacion'}
+        ),
+        (
+            'GET /api/candidatos?estado=activo',
+            Candidato.query.filter(Candidato.estado == 'activo').order_by(Candidato.fecha_creacion.desc()).limit(10),
+            {'ix_candidato_estado_fecha_creacion'}
+        ),
+        (
+            'POST /api/candidatos-posiciones (duplicado)',
+            CandidatosPositions.query.filter_by(candidato_id=1, vacante_id=1).limit(1),
+            {'uq_candidato_vacante'}
+        ),
+        (
+            'GET /api/candidatos-posiciones?vacante_id=',
+            CandidatosPositions.query.filter_by(vacante_id=1).order_by(CandidatosPositions.fecha_asignacion.desc()).limit(10),
+            {'ix_cp_vacante_fecha_asignacion'}
+        ),
+        (
+            'GET /api/candidatos-posiciones?status=',
+            CandidatosPositions.query.filter_by(status='postulado').order_by(CandidatosPositions.fecha_asignacion.desc()).limit(10),
+            {'ix_cp_status_fecha_asignacion'}
+        ),
+        (
+            'GET /api/candidatos-posiciones?contratado_status=',
+            CandidatosPositions.query.filter_by(contratado_status='contratado').order_by(CandidatosPositions.fecha_asignacion.desc()).limit(10),
+            {'ix_cp_contratado_status_fecha_asignacion'}
+        ),
+        (
+            'GET /api/entrevistas?fecha_desde=',
+            Entrevista.query.filter(Entrevista.fecha >= '2024-01-01').order_by(Entrevista.fecha.desc()).limit(10),
+            {'ix_entrevista_fecha'}
+        ),
+        (
+            'Entrevistas pendientes',
+            Entrevista.query.filter(Entrevista.resultado == 'pendiente'),
+            {'ix_entrevista_resultado_fecha'}
+        ),
+        (
+            'GET /api/clientes/active',
+            Cliente.query.filter(Cliente.activo == True).order_by(Cliente.nombre),
+            {'ix_cliente_activo_nombre'}
+        ),
+    ]
+
+def compilar(query, dialect_name):
+    dialect = mysql.dialect() if dialect_name == 'mysql' else sqlite.dialect()
+    return str(query.statement.compile(dialect=dialect, compile_kwargs={'literal_binds': True}))
+
+def indices_usados(sql, dialect_name):
+    """Retorna (índices usados, plan legible)"""
+    if dialect_name == 'mysql':
+        result = db.session.execute(db.text(f'EXPLAIN {sql}'))
+        columnas = list(result.keys())
+        filas = [dict(zip(columnas, fila)) for fila in result]
+        usados = {fila['key'] for fila in filas if fila.get('key')}
+        plan = '; '.join(f"{fila['table']}: type={fila['type']} key={fila['key']} rows={fila['rows']}" for fila in filas)
+        return usados, plan
+
+    filas = db.session.execute(db.text(f'EXPLAIN QUERY PLAN {sql}')).fetchall()
+    detalle = [fila[-1] for fila in filas]
+    usados = set()
+    for linea in detalle:
+        if ' INDEX ' in linea:
+            usados.add(linea.split(' INDEX ', 1)[1].split()[0])
+    return usados, '; '.join(detalle)
+
+def main():
+    print("🔍 Verificando planes de ejecución de consultas frecuentes")
+    print("=" * 60)
+
+    app = create_app()
+    fallos = 0
+
+    with app.app_context():
+        dialect_name = db.engine.dialect.name
+        if dialect_name not in ('mysql', 'sqlite'):
+            print(f"❌ Dialecto no soportado: {dialect_name}")
+            return 1
+
+        for descripcion, query, esperados in consultas():
+            usados, plan = indices_usados(compilar(query, dialect_name), dialect_name)
+            if usados & esperados:
+                print(f"✅ {descripcion}: {', '.join(sorted(usados & esperados))}")
+            else:
+                fallos += 1
+                print(f"❌ {descripcion}: se esperaba {', '.join(sorted(esperados))}")
+                print(f"   Plan: {plan}")
+
+    print("=" * 60)
+    if fallos:
+        print(f"⚠️ {fallos} consultas no usan el índice esperado")
+        return 1
+
+    print("🎉 Todas las consultas usan sus índices")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())